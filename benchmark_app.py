@@ -0,0 +1,263 @@
+"""
+Headless rerun benchmark for the Streamlit app
+==============================================
+Drives ``streamlit_app.py`` with Streamlit's testing harness (``AppTest``) and
+reports how long each user-visible step takes, without a browser or network:
+
+* cold start: first run of the script in a fresh process (imports included)
+* rerun: an idle rerun (any widget interaction) before and after combining
+* each button step: Fetch Google Calendar, Scrape Eventbrite, Scrape GroupX,
+  Combine, Find plans
+* peak RSS of the process after each step
+
+The three sources are stubbed with recorded fixtures: GroupX replays
+``cmu_groupx_classes.csv`` (or ``--fixture-dir``), calendar and Eventbrite
+fixtures use the scrapers' output layout. Fixtures are replicated ``scale``
+times, and each scale runs in its own process so cold start and peak memory
+are not skewed by earlier runs. Each worker gets ``SCHEDULE_SNAPSHOT_DIR`` and
+``SCHEDULE_HISTORY_DB`` pointing into a temporary directory, so snapshots and the
+schedule history never touch ``.cache``.
+
+    python benchmark_app.py --scales 1 5 20
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(HERE, 'streamlit_app.py')
+GROUPX_FIXTURE = os.path.join(HERE, 'cmu_groupx_classes.csv')
+DEFAULT_SCALES = [1, 5, 20]
+DEFAULT_RERUNS = 5
+APP_TIMEOUT_SECONDS = 300
+
+CALENDAR_EVENTS_PER_SCALE = 14      # one lecture a day for the 14-day fetch
+EVENTBRITE_EVENTS_PER_SCALE = 10
+
+# ===========================
+# FIXTURES
+# ===========================
+
+def load_fixtures(scale: int, fixture_dir: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """Calendar / Eventbrite / GroupX frames in each source's recorded layout, replicated scale times"""
+    now = pd.Timestamp.now(tz='UTC').floor('D') + pd.Timedelta(days=1)
+
+    recorded = {}
+    for name in ('calendar', 'eventbrite', 'groupx'):
+        path = os.path.join(fixture_dir, f"{name}.csv") if fixture_dir else None
+        if path and os.path.exists(path):
+            recorded[name] = pd.read_csv(path)
+
+    calendar = recorded.get('calendar')
+    if calendar is None:
+        calendar = pd.DataFrame([{
+            'Calendar': 'primary', 'Summary': f"Lecture {i}",
+            'Start': (now + pd.Timedelta(hours=13 + 24 * (i % 14))).isoformat(),
+            'End': (now + pd.Timedelta(hours=14 + 24 * (i % 14), minutes=20)).isoformat(),
+            'Location': 'GHC', 'Description': '',
+        } for i in range(CALENDAR_EVENTS_PER_SCALE)])
+
+    eventbrite = recorded.get('eventbrite')
+    if eventbrite is None:
+        eventbrite = pd.DataFrame([{
+            'title': f"Community Yoga {i}",
+            'link': f"https://www.eventbrite.com/e/community-yoga-{i}-tickets-10{i}",
+            'date_time': f"{(now + pd.Timedelta(hours=12 + 24 * i)).isoformat()} → "
+                         f"{(now + pd.Timedelta(hours=13 + 24 * i)).isoformat()}",
+            'venue': 'Studio', 'address': 'Pittsburgh, PA',
+        } for i in range(EVENTBRITE_EVENTS_PER_SCALE)])
+
+    groupx = recorded.get('groupx')
+    if groupx is None:
+        groupx = pd.read_csv(GROUPX_FIXTURE)
+        # Keep the recorded term around today so classes land in the 14-day window
+        groupx['term_start_date'] = str((now - pd.Timedelta(days=3)).date())
+        groupx['term_end_date'] = str((now + pd.Timedelta(days=60)).date())
+
+    return {
+        'calendar': _replicate(calendar, scale, {'Summary': None}),
+        'eventbrite': _replicate(eventbrite, scale, {'title': None, 'link': 'link'}),
+        'groupx': _replicate(groupx, scale, {'class_name': None}),
+    }
+
+def _replicate(df: pd.DataFrame, scale: int, suffixed: Dict[str, Optional[str]]) -> pd.DataFrame:
+    """scale copies of df; copies get a suffix on the given columns so they stay distinct rows"""
+    copies = [df]
+    for j in range(1, scale):
+        copy = df.copy()
+        for column, kind in suffixed.items():
+            if column in copy.columns:
+                copy[column] = copy[column].astype(str) + (f"-{j}" if kind == 'link' else f" #{j}")
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+# ===========================
+# SOURCE STUBS
+# ===========================
+
+class _FixtureGroupXScraper:
+    """Stands in for CMUGroupXSeleniumScraper, replaying recorded classes"""
+
+    records: List[Dict] = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def iter_schedule_data(self, status=None, **kwargs):
+        yield from self.records
+
+class _NoDriverPool:
+    @contextmanager
+    def lease(self):
+        yield None
+
+def install_stubs(fixtures: Dict[str, pd.DataFrame]) -> None:
+    """Point the app's sources at the fixtures"""
+    import browser_pool
+    import cmu_scraper
+    import eventbrite_scraper
+    import google_calendar
+
+    google_calendar.get_google_credentials = lambda: object()
+    google_calendar.get_calendar_events_cached = lambda creds, **kwargs: fixtures['calendar'].copy()
+
+    event_records = fixtures['eventbrite'].to_dict('records')
+
+    async def stream_events(status=None, **kwargs):
+        for record in event_records:
+            yield dict(record)
+
+    eventbrite_scraper.stream_events = stream_events
+
+    _FixtureGroupXScraper.records = fixtures['groupx'].to_dict('records')
+    cmu_scraper.CMUGroupXSeleniumScraper = _FixtureGroupXScraper
+    browser_pool.get_selenium_pool = lambda headless=True: _NoDriverPool()
+
+def state_env(state_dir: str) -> Dict[str, str]:
+    """Environment for a worker whose snapshots and schedule history live in state_dir"""
+    return dict(os.environ,
+                SCHEDULE_SNAPSHOT_DIR=os.path.join(state_dir, 'snapshots'),
+                SCHEDULE_HISTORY_DB=os.path.join(state_dir, 'history.sqlite3'))
+
+# ===========================
+# WORKER (one scale per process)
+# ===========================
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def _timed(results: List[Dict], step: str, action) -> None:
+    started = time.perf_counter()
+    at = action()
+    elapsed = time.perf_counter() - started
+    errors = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+    results.append({'step': step, 'seconds': elapsed, 'peak_rss_mb': _peak_rss_mb(),
+                    'error': '; '.join(errors)[:200]})
+
+def _click(at, label: str):
+    for button in at.button:
+        if button.label == label:
+            return button.click().run()
+    raise LookupError(f"No button labelled '{label}' (is that step available?)")
+
+def _reruns(results: List[Dict], step: str, at, count: int) -> None:
+    """Median of count idle reruns"""
+    samples = []
+    for _ in range(count):
+        _timed(samples, step, at.run)
+    samples.sort(key=lambda s: s['seconds'])
+    median = dict(samples[len(samples) // 2])
+    median['error'] = '; '.join(sorted({s['error'] for s in samples if s['error']}))
+    results.append(median)
+
+def run_scale(scale: int, reruns: int = DEFAULT_RERUNS, fixture_dir: Optional[str] = None) -> Dict:
+    """Benchmark one data size in this process"""
+    sys.path.insert(0, HERE)
+    fixtures = load_fixtures(scale, fixture_dir)
+    results = []
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    install_stubs(fixtures)
+    at = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT_SECONDS)
+    at.run()
+    results.append({'step': 'cold start', 'seconds': time.perf_counter() - started,
+                    'peak_rss_mb': _peak_rss_mb(),
+                    'error': '; '.join(str(e.value) for e in at.exception)[:200]})
+
+    _reruns(results, 'rerun (empty session)', at, reruns)
+    _timed(results, 'fetch calendar', lambda: _click(at, "Fetch Google Calendar (next 14 days)"))
+    _timed(results, 'scrape eventbrite', lambda: _click(at, "Scrape Eventbrite"))
+    _timed(results, 'scrape groupx', lambda: _click(at, "Scrape GroupX"))
+    _timed(results, 'combine', lambda: _click(at, "Combine"))
+    _reruns(results, 'rerun (combined)', at, reruns)
+    _timed(results, 'find plans', lambda: _click(at, "Find plans"))
+
+    combined = at.session_state['combined_df'] if 'combined_df' in at.session_state else None
+    return {
+        'scale': scale,
+        'rows': {name: len(df) for name, df in fixtures.items()},
+        'combined_rows': 0 if combined is None else len(combined),
+        'steps': results,
+    }
+
+# ===========================
+# REPORT
+# ===========================
+
+def print_report(runs: List[Dict]) -> None:
+    for run in runs:
+        rows = ', '.join(f"{name} {count}" for name, count in run['rows'].items())
+        print(f"\nScale {run['scale']}: {rows} -> {run['combined_rows']} combined rows")
+        print(f"  {'step':<24}{'seconds':>10}{'peak RSS MB':>14}")
+        for step in run['steps']:
+            note = f"  ! {step['error']}" if step['error'] else ''
+            print(f"  {step['step']:<24}{step['seconds']:>10.3f}{step['peak_rss_mb']:>14.1f}{note}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure Streamlit rerun latency with fixture data")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="fixture replication factors to benchmark")
+    parser.add_argument('--reruns', type=int, default=DEFAULT_RERUNS, help="idle reruns per median")
+    parser.add_argument('--fixture-dir', help="directory with recorded calendar/eventbrite/groupx.csv")
+    parser.add_argument('--json', help="also write the raw results to this file")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_scale(args.worker, args.reruns, args.fixture_dir)))
+        return
+
+    runs = []
+    for scale in args.scales:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', str(scale), '--reruns', str(args.reruns)]
+        if args.fixture_dir:
+            command += ['--fixture-dir', args.fixture_dir]
+        print(f"Benchmarking scale {scale}...")
+        # Run from a neutral directory, with shared state in a throwaway one, so nothing touches the repo
+        with tempfile.TemporaryDirectory() as state_dir:
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=tempfile.gettempdir(),
+                                       env=state_env(state_dir))
+        if completed.returncode != 0:
+            print(f"Scale {scale} failed:\n{completed.stderr[-2000:]}")
+            continue
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print_report(runs)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(runs, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Warm browser pools for the scrapers
+===================================
+Launching Chromium (Playwright) or Chrome (Selenium) is a large share of every
+refresh, and several users clicking at once used to start several browsers.
+This module keeps a small number of warm browsers per process and hands them
+out per scrape:
+
+* ``PlaywrightPool`` owns Playwright on a dedicated background event loop, so
+  browsers survive across Streamlit reruns (each rerun makes its own loop).
+  Every lease gets a fresh, isolated ``BrowserContext`` on a warm browser.
+* ``SeleniumDriverPool`` keeps warm ``webdriver.Chrome`` instances and leases
+  them out with a context manager.
+
+Both pools recycle a browser after ``max_uses`` leases or when it has crashed,
+and cap the number of live browsers to bound memory. ``get_selenium_pool`` keeps
+one pool per ``headless`` setting, so a headed caller never gets headless drivers.
+"""
+
+import asyncio
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional
+
+MAX_PLAYWRIGHT_BROWSERS = 2
+MAX_SELENIUM_DRIVERS = 2
+MAX_USES_PER_BROWSER = 50
+
+# ===========================
+# PLAYWRIGHT
+# ===========================
+
+class _PooledBrowser:
+    __slots__ = ('browser', 'uses')
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.uses = 0
+
+class PlaywrightPool:
+    """Warm Chromium browsers on a background event loop; leases hand out fresh contexts"""
+
+    def __init__(self, max_browsers: int = MAX_PLAYWRIGHT_BROWSERS,
+                 max_uses: int = MAX_USES_PER_BROWSER, headless: bool = True):
+        self.max_browsers = max_browsers
+        self.max_uses = max_uses
+        self.headless = headless
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='playwright-pool', daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._idle: List[_PooledBrowser] = []
+        self._live = 0
+        self._slots = None
+        self._closed = False
+
+    # ---------------------------
+    # Pool-loop internals
+    # ---------------------------
+
+    async def _ensure_started(self) -> None:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            self._slots = asyncio.Semaphore(self.max_browsers)
+
+    async def _acquire(self) -> _PooledBrowser:
+        await self._ensure_started()
+        await self._slots.acquire()
+        while self._idle:
+            entry = self._idle.pop()
+            if entry.browser.is_connected():
+                return entry
+            self._live -= 1
+        try:
+            browser = await self._playwright.chromium.launch(headless=self.headless)
+        except Exception:
+            self._slots.release()
+            raise
+        self._live += 1
+        print(f"Browser pool: launched Chromium ({self._live} live)")
+        return _PooledBrowser(browser)
+
+    async def _release(self, entry: _PooledBrowser) -> None:
+        entry.uses += 1
+        try:
+            if self._closed or not entry.browser.is_connected() or entry.uses >= self.max_uses:
+                self._live -= 1
+                await entry.browser.close()
+            else:
+                self._idle.append(entry)
+        except Exception:
+            pass
+        finally:
+            self._slots.release()
+
+    async def _run_leased(self, work: Callable[..., Awaitable]):
+        entry = await self._acquire()
+        try:
+            context = await entry.browser.new_context()
+            try:
+                return await work(context)
+            finally:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+        finally:
+            await self._release(entry)
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+
+    def submit(self, work: Callable[..., Awaitable]):
+        """Schedule work(context) on the pool loop; returns a concurrent.futures.Future"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        return asyncio.run_coroutine_threadsafe(self._run_leased(work), self._loop)
+
+    async def run(self, work: Callable[..., Awaitable]):
+        """Await work(context) from any event loop; the context is closed afterwards"""
+        future = self.submit(work)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Close all browsers and stop the pool loop"""
+        if self._closed:
+            return
+        self._closed = True
+
+        async def shutdown():
+            for entry in self._idle:
+                try:
+                    await entry.browser.close()
+                except Exception:
+                    pass
+            self._idle.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=30)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+# ===========================
+# SELENIUM
+# ===========================
+
+class SeleniumDriverPool:
+    """Warm Selenium drivers leased out one scrape at a time"""
+
+    def __init__(self, factory: Callable[[], object], max_drivers: int = MAX_SELENIUM_DRIVERS,
+                 max_uses: int = MAX_USES_PER_BROWSER):
+        self.factory = factory
+        self.max_uses = max_uses
+        self._slots = threading.BoundedSemaphore(max_drivers)
+        self._idle: List[list] = []           # [driver, uses]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self):
+        """Context manager yielding a warm driver; crashed or worn-out drivers are replaced"""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        self._slots.acquire()
+        entry = None
+        try:
+            with self._lock:
+                while self._idle and entry is None:
+                    candidate = self._idle.pop()
+                    if self._alive(candidate[0]):
+                        entry = candidate
+                    else:
+                        self._quit(candidate[0])
+            if entry is None:
+                entry = [self.factory(), 0]
+                print("Driver pool: started Chrome")
+
+            broken = False
+            try:
+                yield entry[0]
+            except Exception:
+                broken = not self._alive(entry[0])
+                raise
+            finally:
+                entry[1] += 1
+                if self._closed or broken or entry[1] >= self.max_uses:
+                    self._quit(entry[0])
+                else:
+                    try:
+                        entry[0].get('about:blank')
+                    except Exception:
+                        self._quit(entry[0])
+                    else:
+                        with self._lock:
+                            self._idle.append(entry)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Quit all idle drivers"""
+        self._closed = True
+        with self._lock:
+            for driver, _ in self._idle:
+                self._quit(driver)
+            self._idle.clear()
+
+# ===========================
+# PROCESS-WIDE POOLS
+# ===========================
+
+_playwright_pool: Optional[PlaywrightPool] = None
+_selenium_pools: Dict[bool, SeleniumDriverPool] = {}
+_pools_lock = threading.Lock()
+
+def get_playwright_pool() -> PlaywrightPool:
+    """Process-wide Playwright pool"""
+    global _playwright_pool
+    with _pools_lock:
+        if _playwright_pool is None:
+            _playwright_pool = PlaywrightPool()
+            atexit.register(_playwright_pool.close)
+        return _playwright_pool
+
+def get_selenium_pool(headless: bool = True) -> SeleniumDriverPool:
+    """Process-wide Selenium pool for this headless setting (drivers built with cmu_scraper.create_chrome_driver)"""
+    headless = bool(headless)
+    with _pools_lock:
+        pool = _selenium_pools.get(headless)
+        if pool is None:
+            from cmu_scraper import create_chrome_driver
+            pool = SeleniumDriverPool(lambda: create_chrome_driver(headless, low_footprint=headless))
+            _selenium_pools[headless] = pool
+            atexit.register(pool.close)
+        return pool
@@ -0,0 +1,163 @@
+"""
+Minute-resolution busy bitmap
+=============================
+Compact occupancy structure built from the cleaned Google Calendar frame
+(the output of ``combiner.clean_google_calendar_df``).
+
+Every minute of the scheduling horizon is one slot in a NumPy boolean array,
+and a prefix-sum array over it answers "how many busy minutes fall inside
+[start, end)" in O(1). That gives constant-time partial-overlap counts,
+buffered fit checks and free-gap listings without re-comparing every scraped
+event against every calendar event.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+EPOCH = pd.Timestamp('1970-01-01', tz='UTC')
+ONE_MINUTE = pd.Timedelta(minutes=1)
+DEFAULT_EVENT_LENGTH = timedelta(hours=1)
+
+# ===========================
+# HELPER FUNCTIONS
+# ===========================
+
+def to_epoch_minutes(values, round_up: bool = False) -> np.ndarray:
+    """Convert timestamps to integer minutes since the Unix epoch (floor, or ceil for ends)"""
+    ts = pd.to_datetime(pd.Series(values), utc=True)
+    if round_up:
+        return (-((EPOCH - ts) // ONE_MINUTE)).to_numpy(dtype='int64')
+    return ((ts - EPOCH) // ONE_MINUTE).to_numpy(dtype='int64')
+
+def fill_missing_ends(starts: pd.Series, ends: pd.Series) -> pd.Series:
+    """Default missing end times to one hour after start, like the pairwise overlap check"""
+    starts = pd.to_datetime(starts, utc=True)
+    ends = pd.to_datetime(ends, utc=True)
+    return ends.fillna(starts + DEFAULT_EVENT_LENGTH)
+
+# ===========================
+# BUSY BITMAP
+# ===========================
+
+class BusyBitmap:
+    """Per-minute busy flags with prefix sums over a fixed horizon"""
+
+    def __init__(self, origin_minute: int, busy: np.ndarray):
+        self.origin_minute = int(origin_minute)
+        self.busy = busy.astype(bool, copy=False)
+        # prefix[i] = number of busy minutes in busy[:i]
+        self.prefix = np.zeros(len(self.busy) + 1, dtype=np.int64)
+        np.cumsum(self.busy, out=self.prefix[1:])
+
+    @classmethod
+    def from_calendar_df(cls, calendar_df: pd.DataFrame,
+                         horizon_start: Optional[pd.Timestamp] = None,
+                         horizon_end: Optional[pd.Timestamp] = None) -> 'BusyBitmap':
+        """Build the bitmap from a cleaned calendar frame with UTC 'start'/'end' columns"""
+        if calendar_df is None or calendar_df.empty:
+            starts = np.empty(0, dtype='int64')
+            ends = np.empty(0, dtype='int64')
+        else:
+            valid = calendar_df.dropna(subset=['start'])
+            filled_ends = fill_missing_ends(valid['start'], valid['end'])
+            # Zero-length events (reminders, deadlines) block no time, whatever minute they fall in
+            positive = (filled_ends > pd.to_datetime(valid['start'], utc=True)).to_numpy()
+            starts = to_epoch_minutes(valid['start'])[positive]
+            ends = to_epoch_minutes(filled_ends, round_up=True)[positive]
+
+        lo_candidates = [starts.min()] if len(starts) else []
+        hi_candidates = [ends.max()] if len(ends) else []
+        if horizon_start is not None:
+            lo_candidates = [to_epoch_minutes([horizon_start])[0]]
+        if horizon_end is not None:
+            hi_candidates = [to_epoch_minutes([horizon_end], round_up=True)[0]]
+
+        if not lo_candidates or not hi_candidates:
+            return cls(0, np.zeros(0, dtype=bool))
+
+        origin = int(lo_candidates[0])
+        size = max(int(hi_candidates[0]) - origin, 0)
+
+        # Difference array: +1 at each start, -1 at each end, busy where the running count > 0
+        diff = np.zeros(size + 1, dtype=np.int32)
+        s = np.clip(starts - origin, 0, size)
+        e = np.clip(ends - origin, 0, size)
+        keep = e > s
+        np.add.at(diff, s[keep], 1)
+        np.add.at(diff, e[keep], -1)
+        busy = np.cumsum(diff[:-1]) > 0
+
+        return cls(origin, busy)
+
+    def __len__(self) -> int:
+        return len(self.busy)
+
+    @property
+    def horizon(self) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """First and last (exclusive) minute covered by the bitmap"""
+        return (self.minute_to_timestamp(self.origin_minute),
+                self.minute_to_timestamp(self.origin_minute + len(self.busy)))
+
+    def minute_to_timestamp(self, minute: int) -> pd.Timestamp:
+        """Convert an epoch minute back to a UTC timestamp"""
+        return EPOCH + int(minute) * ONE_MINUTE
+
+    def _busy_between(self, start_minutes: np.ndarray, end_minutes: np.ndarray) -> np.ndarray:
+        """Busy minute counts for arrays of [start, end) epoch-minute ranges"""
+        size = len(self.busy)
+        s = np.clip(np.asarray(start_minutes, dtype=np.int64) - self.origin_minute, 0, size)
+        e = np.clip(np.asarray(end_minutes, dtype=np.int64) - self.origin_minute, 0, size)
+        e = np.maximum(e, s)
+        return self.prefix[e] - self.prefix[s]
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+
+    def conflict_minutes(self, start: pd.Timestamp, end: Optional[pd.Timestamp] = None,
+                         buffer_before: int = 0, buffer_after: int = 0) -> int:
+        """Number of busy minutes overlapping [start - buffer_before, end + buffer_after)"""
+        return int(self.conflict_minutes_many([start], [end], buffer_before, buffer_after)[0])
+
+    def conflict_minutes_many(self, starts, ends,
+                              buffer_before: int = 0, buffer_after: int = 0) -> np.ndarray:
+        """Vectorized conflict_minutes for whole columns of start/end times"""
+        starts = pd.to_datetime(pd.Series(starts), utc=True).reset_index(drop=True)
+        ends = pd.to_datetime(pd.Series(ends), utc=True).reset_index(drop=True)
+        ends = fill_missing_ends(starts, ends)
+        s = to_epoch_minutes(starts) - int(buffer_before)
+        e = to_epoch_minutes(ends, round_up=True) + int(buffer_after)
+        if not buffer_before and not buffer_after:
+            # Zero-length events take no time, whatever minute they fall in
+            e = np.where((ends > starts).to_numpy(), e, s)
+        return self._busy_between(s, e)
+
+    def is_free(self, start: pd.Timestamp, end: Optional[pd.Timestamp] = None,
+                buffer_before: int = 0, buffer_after: int = 0) -> bool:
+        """True if no calendar minute falls inside the (buffered) interval"""
+        return self.conflict_minutes(start, end, buffer_before, buffer_after) == 0
+
+    def free_gaps(self, min_minutes: int,
+                  window_start: Optional[pd.Timestamp] = None,
+                  window_end: Optional[pd.Timestamp] = None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """List free (start, end) gaps of at least min_minutes inside the horizon or a sub-window"""
+        size = len(self.busy)
+        lo = 0 if window_start is None else int(np.clip(to_epoch_minutes([window_start])[0] - self.origin_minute, 0, size))
+        hi = size if window_end is None else int(np.clip(to_epoch_minutes([window_end], round_up=True)[0] - self.origin_minute, 0, size))
+        if hi <= lo:
+            return []
+
+        free = ~self.busy[lo:hi]
+        # Edges of free runs: +1 where a run starts, -1 where it ends
+        edges = np.diff(np.concatenate(([0], free.astype(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        long_enough = (run_ends - run_starts) >= int(min_minutes)
+
+        base = self.origin_minute + lo
+        return [
+            (self.minute_to_timestamp(base + s), self.minute_to_timestamp(base + e))
+            for s, e in zip(run_starts[long_enough], run_ends[long_enough])
+        ]
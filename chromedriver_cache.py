@@ -0,0 +1,78 @@
+"""
+Cached, pinned ChromeDriver resolution
+======================================
+``ChromeDriverManager().install()`` checks the network for the latest driver
+version on every call, which made every scraper construction slow and failed
+offline. The resolved driver path is pinned in ``.cache/chromedriver.json``
+and reused while the file still exists; the network is only consulted when the
+pin is missing or older than PIN_TTL_SECONDS.
+
+Resolution order:
+1. ``CHROMEDRIVER_PATH`` environment variable
+2. pinned path from the cache file (while fresh)
+3. ``ChromeDriverManager().install()`` (network), which re-pins
+4. offline fallback: pinned path even if stale, then the newest driver already
+   in webdriver-manager's cache, then ``chromedriver`` on PATH
+5. ``None`` - let Selenium Manager locate a driver itself
+"""
+
+import glob
+import json
+import os
+import shutil
+import time
+from typing import Optional
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'chromedriver.json')
+PIN_TTL_SECONDS = 7 * 24 * 60 * 60
+WDM_CACHE_GLOB = os.path.join(os.path.expanduser('~'), '.wdm', 'drivers', 'chromedriver', '**', 'chromedriver*')
+
+def _usable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+def read_pin(cache_file: str = CACHE_FILE) -> Optional[dict]:
+    """Pinned {path, pinned_at} entry, or None"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_pin(path: str, cache_file: str = CACHE_FILE) -> None:
+    """Pin a resolved driver path"""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_path = f"{cache_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'path': path, 'pinned_at': time.time()}, f)
+    os.replace(tmp_path, cache_file)
+
+def newest_downloaded_driver() -> Optional[str]:
+    """Most recently modified driver binary in webdriver-manager's cache"""
+    candidates = [p for p in glob.glob(WDM_CACHE_GLOB, recursive=True)
+                  if _usable(p) and not p.endswith(('.zip', '.json', '.txt'))]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+def resolve_chromedriver_path(cache_file: str = CACHE_FILE, ttl: float = PIN_TTL_SECONDS) -> Optional[str]:
+    """Path to a chromedriver binary, touching the network only when the pin is stale"""
+    env_path = os.environ.get('CHROMEDRIVER_PATH')
+    if _usable(env_path):
+        return env_path
+
+    pin = read_pin(cache_file)
+    pinned_path = pin.get('path') if pin else None
+    if _usable(pinned_path) and time.time() - pin.get('pinned_at', 0) < ttl:
+        return pinned_path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        if _usable(path):
+            write_pin(path, cache_file)
+            return path
+    except Exception as e:
+        print(f"ChromeDriverManager unavailable ({e}); using offline fallback")
+
+    for fallback in (pinned_path, newest_downloaded_driver(), shutil.which('chromedriver')):
+        if _usable(fallback):
+            return fallback
+    return None
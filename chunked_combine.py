@@ -0,0 +1,214 @@
+"""
+Out-of-core chunked combine
+===========================
+``standardize_and_combine`` needs every input in memory at once and copies it
+several times. This module combines inputs that arrive as iterables of record
+batches (pandas DataFrame chunks or pyarrow RecordBatches/Tables) with bounded
+memory:
+
+1. every chunk is cleaned on its own with the regular combiner cleaners,
+   sorted by start time and spilled to a temporary run file in small blocks;
+2. the runs are k-way merged lazily in start-time order (one block per run in
+   memory);
+3. a streaming sweep drops scraped events that overlap calendar events, using
+   a running max of calendar end times plus a pending set of scraped events
+   that are decided once the sweep passes their end;
+4. output is emitted in start order, block by block, so it can be written
+   incrementally (see ``write_combined_csv``).
+
+The result matches the in-memory pairwise combine (same rows, same overlap
+rule) except that cross-source deduplication is not applied.
+"""
+
+import heapq
+import itertools
+import os
+import pickle
+import tempfile
+from datetime import timedelta
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from combiner import (clean_cmu_scraper_df, clean_google_calendar_df, clean_webscraping_df,
+                      create_time_range_display)
+
+OUTPUT_COLUMNS = ['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']
+ROW_FIELDS = ['start', 'end', 'time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']
+DEFAULT_BLOCK_ROWS = 2048
+DEFAULT_EVENT_LENGTH = timedelta(hours=1)
+
+CALENDAR, SCRAPED = 0, 1
+
+# ===========================
+# INPUT NORMALIZATION
+# ===========================
+
+def iter_frames(chunks) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames from DataFrames, pyarrow RecordBatches/Tables, or a single frame"""
+    if chunks is None:
+        return
+    if isinstance(chunks, pd.DataFrame) or hasattr(chunks, 'to_pandas'):
+        chunks = [chunks]
+    for chunk in chunks:
+        frame = chunk.to_pandas() if hasattr(chunk, 'to_pandas') else chunk
+        if frame is not None and not frame.empty:
+            yield frame
+
+# ===========================
+# SPILL / MERGE
+# ===========================
+
+class _RunFile:
+    """A sorted run of cleaned rows spilled to disk as pickled blocks"""
+
+    def __init__(self, directory: str, rows: List[tuple], block_rows: int):
+        fd, self.path = tempfile.mkstemp(suffix='.run', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            for i in range(0, len(rows), block_rows):
+                pickle.dump(rows[i:i + block_rows], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __iter__(self) -> Iterator[tuple]:
+        with open(self.path, 'rb') as f:
+            while True:
+                try:
+                    block = pickle.load(f)
+                except EOFError:
+                    return
+                yield from block
+
+def _spill_cleaned(cleaned: pd.DataFrame, kind: int, seq_counter, directory: str,
+                   block_rows: int) -> Optional[_RunFile]:
+    """Sort one cleaned chunk and write it as a run of (start, seq, kind, end_filled, row) tuples"""
+    if cleaned.empty:
+        return None
+    cleaned = cleaned.dropna(subset=['start']).sort_values('start', kind='stable')
+    if cleaned.empty:
+        return None
+    for col in ROW_FIELDS:
+        if col not in cleaned.columns:
+            cleaned[col] = None
+    # Rows without a displayable time range are dropped before the overlap check, as in the combiner
+    cleaned['time_range'] = [create_time_range_display(start, end)
+                             for start, end in zip(cleaned['start'], cleaned['end'])]
+    cleaned = cleaned.dropna(subset=['time_range'])
+    if cleaned.empty:
+        return None
+    end_filled = cleaned['end'].fillna(cleaned['start'] + DEFAULT_EVENT_LENGTH)
+
+    rows = []
+    for values, filled in zip(cleaned[ROW_FIELDS].itertuples(index=False, name=None), end_filled):
+        row = dict(zip(ROW_FIELDS, values))
+        rows.append((row['start'], next(seq_counter), kind, filled, row))
+    return _RunFile(directory, rows, block_rows)
+
+# ===========================
+# STREAMING CONFLICT SWEEP
+# ===========================
+
+def _sweep(merged: Iterator[tuple]) -> Iterator[dict]:
+    """Drop scraped rows overlapping any calendar row; yield survivors in start order"""
+    max_calendar_end = None
+    pending = {}                 # seq -> [entry, conflicted]
+    pending_by_end = []          # heap of (end_filled, seq)
+    pending_by_start = []        # heap of (start, seq) for the output watermark
+    ready = []                   # heap of (start, seq, row) decided and waiting for the watermark
+
+    def settle(upto):
+        # Scraped rows whose end is <= upto can no longer gain a conflict
+        while pending_by_end and (upto is None or pending_by_end[0][0] <= upto):
+            _, seq = heapq.heappop(pending_by_end)
+            entry, conflicted = pending.pop(seq)
+            if not conflicted:
+                heapq.heappush(ready, (entry[0], entry[1], entry[4]))
+
+    def drain(upto):
+        # Emit everything strictly before the earliest undecided scraped row (and before upto)
+        while pending_by_start and pending_by_start[0][1] not in pending:
+            heapq.heappop(pending_by_start)
+        watermark = pending_by_start[0][0] if pending_by_start else None
+        while ready:
+            start = ready[0][0]
+            if watermark is not None and start >= watermark:
+                break
+            if upto is not None and start > upto:
+                break
+            yield heapq.heappop(ready)[2]
+
+    for entry in merged:
+        start, seq, kind, end_filled, row = entry
+        settle(start)
+
+        if kind == CALENDAR:
+            # Zero-length events take no time, so they never conflict, as in the in-memory combine
+            if end_filled > start:
+                # Any undecided scraped row that starts before this calendar event ends overlaps it
+                for pending_entry in pending.values():
+                    if pending_entry[0][0] < end_filled:
+                        pending_entry[1] = True
+                max_calendar_end = end_filled if max_calendar_end is None else max(max_calendar_end, end_filled)
+            heapq.heappush(ready, (start, seq, row))
+        elif end_filled > start:
+            if max_calendar_end is not None and max_calendar_end > start:
+                continue   # overlaps a calendar event that started earlier
+            pending[seq] = [entry, False]
+            heapq.heappush(pending_by_end, (end_filled, seq))
+            heapq.heappush(pending_by_start, (start, seq))
+        else:
+            heapq.heappush(ready, (start, seq, row))
+
+        yield from drain(start)
+
+    settle(None)
+    yield from drain(None)
+
+# ===========================
+# PUBLIC API
+# ===========================
+
+def combine_chunked(google_chunks=None, webscrape_chunks=None, cmu_chunks=None,
+                    block_rows: int = DEFAULT_BLOCK_ROWS, spill_dir: Optional[str] = None,
+                    window_end: Optional[pd.Timestamp] = None) -> Iterator[pd.DataFrame]:
+    """Combine chunked inputs with bounded memory; yields output blocks in start order"""
+    seq_counter = itertools.count()
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        runs = []
+        sources = [
+            (google_chunks, clean_google_calendar_df, CALENDAR),
+            (webscrape_chunks, clean_webscraping_df, SCRAPED),
+            (cmu_chunks, lambda df: clean_cmu_scraper_df(df, window_end=window_end), SCRAPED),
+        ]
+        for chunks, clean_func, kind in sources:
+            for frame in iter_frames(chunks):
+                cleaned = clean_func(frame)
+                if kind == CALENDAR:
+                    cleaned['scraped_event'] = None
+                else:
+                    cleaned['calendar_event'] = None
+                run = _spill_cleaned(cleaned, kind, seq_counter, directory, block_rows)
+                if run is not None:
+                    runs.append(run)
+
+        # (start, seq) is unique, so the tuple comparison never reaches the row dict
+        merged = heapq.merge(*runs, key=lambda entry: (entry[0], entry[1]))
+
+        block = []
+        for row in _sweep(merged):
+            block.append(row)
+            if len(block) >= block_rows:
+                yield pd.DataFrame(block, columns=OUTPUT_COLUMNS)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=OUTPUT_COLUMNS)
+
+def write_combined_csv(path: str, google_chunks=None, webscrape_chunks=None, cmu_chunks=None,
+                       **kwargs) -> int:
+    """Stream the chunked combine straight into a CSV file; returns the number of rows written"""
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i, block in enumerate(combine_chunked(google_chunks, webscrape_chunks, cmu_chunks, **kwargs)):
+            block.to_csv(f, index=False, header=(i == 0))
+            written += len(block)
+        if written == 0:
+            pd.DataFrame(columns=OUTPUT_COLUMNS).to_csv(f, index=False)
+    return written
@@ -0,0 +1,150 @@
+"""
+GroupX class descriptions: indexed matcher and on-disk cache
+============================================================
+``CMUGroupXSeleniumScraper`` used to download and regex-parse the athletics
+descriptions page on every construction, then linearly scan every description
+for each class it scraped. This module parses the page once, stores the result
+on disk, and builds an index (exact map, alias map and token index) so lookups
+are constant time.
+
+The page itself is fetched through ``http_cache.CachedSession``, which owns
+freshness and revalidation (a 304 comes back as the stored body). Requests ask
+to accept a copy up to CACHE_TTL_SECONDS stale, so normally the page is fetched
+at most once a day. The parsed result is cached on disk under the body's hash,
+so an unchanged page is never parsed twice.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import defaultdict
+from typing import Dict, Optional
+
+from bs4 import BeautifulSoup
+
+import http_cache
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+CACHE_FILE = os.path.join(CACHE_DIR, 'class_descriptions.json')
+CACHE_TTL_SECONDS = 24 * 60 * 60
+NOT_AVAILABLE = "Description not available"
+
+# Precompiled once instead of per call
+_WHITESPACE = re.compile(r'\s+')
+_TOKEN = re.compile(r'[a-z0-9&]+')
+_DESCRIPTION_PATTERN = re.compile(
+    r'^([A-Z0-9&\s]+)\n([^A-Z0-9].+?)(?=\n[A-Z0-9&\s]+\n|\nView a video|\n\[|\Z)',
+    re.MULTILINE | re.DOTALL
+)
+
+# Schedule names that differ from the descriptions page headings
+NAME_VARIATIONS = {
+    'indoor cycling': 'cycling',
+    'hiit': 'high intensity interval training',
+    'kettlebell cardio hiit': 'kettlebells',
+}
+
+# ===========================
+# PARSING
+# ===========================
+
+def normalize_class_name(name: str) -> str:
+    """Normalize class names for matching"""
+    normalized = _WHITESPACE.sub(' ', name.lower().strip())
+    for variation, standard in NAME_VARIATIONS.items():
+        if variation in normalized:
+            return standard
+    return normalized
+
+def parse_descriptions_page(content: bytes) -> Dict[str, str]:
+    """Extract {normalized class name: description} from the athletics page HTML"""
+    text = BeautifulSoup(content, 'html.parser').get_text()
+    descriptions = {}
+    for class_name, description in _DESCRIPTION_PATTERN.findall(text):
+        descriptions[normalize_class_name(class_name.strip())] = description.strip()
+    return descriptions
+
+# ===========================
+# INDEXED MATCHER
+# ===========================
+
+class ClassDescriptionMatcher:
+    """Exact map + token index over class descriptions, with memoized lookups"""
+
+    def __init__(self, descriptions: Dict[str, str]):
+        self.descriptions = dict(descriptions)
+        self._order = {name: i for i, name in enumerate(self.descriptions)}
+        self._token_index = defaultdict(set)
+        for name in self.descriptions:
+            for token in _TOKEN.findall(name):
+                self._token_index[token].add(name)
+        self._memo: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.descriptions)
+
+    def _substring_match(self, normalized: str) -> Optional[str]:
+        """Same rule as the old linear scan (either name contains the other), on token-sharing candidates only"""
+        candidates = set()
+        for token in _TOKEN.findall(normalized):
+            candidates |= self._token_index.get(token, set())
+        # Keep the page order so the first heading wins, as before
+        for name in sorted(candidates, key=self._order.__getitem__):
+            if normalized in name or name in normalized:
+                return name
+        return None
+
+    def lookup(self, class_name: str) -> str:
+        """Description for a scraped class name, or NOT_AVAILABLE"""
+        cached = self._memo.get(class_name)
+        if cached is not None:
+            return cached
+
+        normalized = normalize_class_name(class_name)
+        if normalized in self.descriptions:
+            result = self.descriptions[normalized]
+        else:
+            match = self._substring_match(normalized) if normalized else None
+            result = self.descriptions[match] if match else NOT_AVAILABLE
+
+        self._memo[class_name] = result
+        return result
+
+# ===========================
+# ON-DISK CACHE
+# ===========================
+
+def read_cache(path: str = CACHE_FILE) -> Optional[dict]:
+    """Load the cached descriptions entry, or None if missing/corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_cache(entry: dict, path: str = CACHE_FILE) -> None:
+    """Atomically write the cache entry"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path),
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp', delete=False) as f:
+        json.dump(entry, f)
+    os.replace(f.name, path)
+
+def load_descriptions(session: Optional[http_cache.CachedSession], url: str, cache_path: str = CACHE_FILE,
+                      ttl: float = CACHE_TTL_SECONDS) -> Dict[str, str]:
+    """Descriptions of the page at url, fetched through the HTTP cache and parsed only when the body changed"""
+    session = session or http_cache.get_shared_session()
+    response = session.get(url, headers={'Cache-Control': f'max-stale={int(ttl)}'})
+    response.raise_for_status()
+
+    body_hash = hashlib.sha256(response.content).hexdigest()
+    entry = read_cache(cache_path)
+    if entry and entry.get('url') == url and entry.get('body_sha256') == body_hash:
+        print(f"Class descriptions unchanged, reusing parsed cache ({len(entry['descriptions'])} classes)")
+        return entry['descriptions']
+
+    descriptions = parse_descriptions_page(response.content)
+    write_cache({'url': url, 'body_sha256': body_hash, 'descriptions': descriptions}, cache_path)
+    return descriptions
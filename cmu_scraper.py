@@ -36,67 +36,253 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
 import pandas as pd
+import os
 import re
 from datetime import datetime
+import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+import chromedriver_cache
+import class_descriptions
+import http_cache
+from combiner import format_cmu_location_optimized
+from deadlines import Deadline, PartialResult, retry_with_backoff
+from events import EventRecord, SCRAPED
+from groupx_recurrence import WeeklyClassRule, iter_class_occurrences
+
+DEFAULT_DEADLINE_SECONDS = 180    # whole scrape
+DEFAULT_PAGE_BUDGET_SECONDS = 30  # schedule page load / grid wait
+
+# Low-footprint profile (default for headless runs): fewer MB per Chrome, faster grid
+LOW_FOOTPRINT_WINDOW_SIZE = "1280,900"
+PROFILE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'chrome-profiles')
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",    # images
+    "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",                      # media
+    "*.woff", "*.woff2", "*.ttf", "*.otf",                             # fonts
+]
+LOW_FOOTPRINT_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,BackForwardCache",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--autoplay-policy=user-gesture-required",
+    "--blink-settings=imagesEnabled=false",
+]
+
+_profiles_in_use = set()
+_profiles_lock = threading.Lock()
+
+def _profile_locked(profile_dir):
+    """True while a live Chrome holds profile_dir (its SingletonLock points at 'host-pid')"""
+    try:
+        target = os.readlink(os.path.join(profile_dir, "SingletonLock"))
+        pid = int(target.rsplit("-", 1)[1])
+        os.kill(pid, 0)
+        return True
+    except (OSError, ValueError, IndexError):
+        return False
+
+def claim_profile_dir(root=PROFILE_ROOT):
+    """A reusable user-data-dir (keeps login cookies) that no running Chrome is using"""
+    with _profiles_lock:
+        slot = 0
+        while True:
+            profile_dir = os.path.join(root, f"profile-{slot}")
+            if profile_dir not in _profiles_in_use and not _profile_locked(profile_dir):
+                os.makedirs(profile_dir, exist_ok=True)
+                _profiles_in_use.add(profile_dir)
+                return profile_dir
+            slot += 1
+
+def release_profile_dir(profile_dir):
+    with _profiles_lock:
+        _profiles_in_use.discard(profile_dir)
+
+class ProfiledChrome(webdriver.Chrome):
+    """Chrome that hands its user-data-dir back to the profile pool on quit()"""
+
+    def __init__(self, *args, profile_dir=None, **kwargs):
+        self.profile_dir = profile_dir
+        try:
+            super().__init__(*args, **kwargs)
+        except Exception:
+            release_profile_dir(profile_dir)
+            raise
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            release_profile_dir(self.profile_dir)
+
+def create_chrome_driver(headless=False, low_footprint=False, profile_dir=None):
+    """Start Chrome with a cached, pinned driver (also used by browser_pool)
+
+    low_footprint (opt-in, meant for headless runs) uses new headless mode, the
+    'eager' page-load strategy, a smaller window, no images/media/fonts, no
+    background features, and a reusable profile under PROFILE_ROOT so a login
+    survives restarts.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new" if low_footprint else "--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    if low_footprint:
+        chrome_options.add_argument(f"--window-size={LOW_FOOTPRINT_WINDOW_SIZE}")
+        for argument in LOW_FOOTPRINT_ARGS:
+            chrome_options.add_argument(argument)
+        # Return from get() at DOMContentLoaded; the grid itself is awaited explicitly
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+        profile_dir = profile_dir or claim_profile_dir()
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    else:
+        chrome_options.add_argument("--window-size=1920,1080")
+    
+    # Pinned driver path; the network is only checked when the pin is stale.
+    # None means Selenium Manager locates the driver itself.
+    driver_path = chromedriver_cache.resolve_chromedriver_path()
+    service = Service(driver_path) if driver_path else Service()
+    if not low_footprint:
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    driver = ProfiledChrome(service=service, options=chrome_options, profile_dir=profile_dir)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except WebDriverException as e:
+        print(f"Warning: could not block heavy resources: {e}")
+    return driver
+
+def chrome_memory_mb(driver):
+    """RSS (and USS where readable) in MB of the driver's Chrome process tree"""
+    import psutil   # only needed for footprint measurements (see main --measure)
+    root = psutil.Process(driver.service.process.pid)
+    rss = uss = 0
+    processes = 0
+    for process in [root] + root.children(recursive=True):
+        try:
+            info = process.memory_full_info()
+            rss += info.rss
+            uss += info.uss
+        except psutil.AccessDenied:
+            rss += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+        processes += 1
+    return {'rss_mb': rss / 2**20, 'uss_mb': uss / 2**20, 'processes': processes}
+
+def measure_footprint(low_footprint=True, headless=True, timeout=30):
+    """Start one scraper, load the schedule grid and report time-to-grid and Chrome memory"""
+    scraper = CMUGroupXSeleniumScraper(headless=headless, low_footprint=low_footprint)
+    try:
+        started = time.perf_counter()
+        scraper.driver.set_page_load_timeout(timeout)
+        scraper.driver.get(scraper.schedule_url)
+        loaded = scraper.wait_for_schedule_to_load(timeout=timeout)
+        grid_seconds = time.perf_counter() - started
+        report = {
+            'mode': 'low-footprint' if low_footprint else 'default',
+            'driver_start_s': scraper.startup_timing.get('driver'),
+            'grid_loaded_s': grid_seconds if loaded else None,
+            **chrome_memory_mb(scraper.driver),
+        }
+    finally:
+        scraper.close_driver()
+    grid = f"{report['grid_loaded_s']:.2f}s" if report['grid_loaded_s'] is not None else "not loaded"
+    print(f"{report['mode']}: driver {report['driver_start_s']:.2f}s, grid {grid}, "
+          f"RSS {report['rss_mb']:.0f} MB (USS {report['uss_mb']:.0f} MB) over {report['processes']} processes")
+    return report
+
+def class_occurrence_records(classes_data, window_start=None, window_end=None):
+    """EventRecords for every class occurrence in [window_start, window_end) (window_start defaults to now)"""
+    if window_start is None:
+        window_start = pd.Timestamp.now(tz='UTC')
+    rules = [rule for rule in (WeeklyClassRule.from_row(row) for row in classes_data) if rule is not None]
+    records = []
+    for occurrence in iter_class_occurrences(rules, window_start, window_end):
+        description = occurrence.get('class_description')
+        url = occurrence.get('registration_url')
+        url = '' if url is None or pd.isna(url) else url
+        records.append(EventRecord(
+            occurrence['start'], occurrence['end'], occurrence.get('class_name') or 'Untitled Class', SCRAPED,
+            description=url if description is None or pd.isna(description) else description,
+            location=format_cmu_location_optimized(occurrence.get('studio'), occurrence.get('campus_area')),
+            url=url, source='groupx',
+        ))
+    return records
 
 class CMUGroupXSeleniumScraper:
-    def __init__(self, headless=False):
-        self.setup_driver(headless)
+    def __init__(self, headless=False, driver=None, low_footprint=False):
+        started = time.perf_counter()
+        self.headless = headless
+        self.low_footprint = low_footprint
+        # A driver leased from browser_pool is reused as-is and not quit by close_driver()
+        self.owns_driver = driver is None
         self.schedule_url = "https://cmu.dserec.com/online/cr/programs/1/program-classes-weekly-view"
         self.descriptions_url = "https://athletics.cmu.edu/recreation/groupxdescriptions"
         
-        # Load class descriptions
-        self.session = requests.Session()
+        # Load class descriptions (shared pooled, rate-limited session)
+        self.session = http_cache.get_shared_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.class_descriptions = self.load_class_descriptions()
         
-    def setup_driver(self, headless):
-        """Setup Chrome WebDriver with automatic driver management"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
+        # Descriptions load in the background while Chrome starts
+        self.startup_timing = {}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            descriptions_future = executor.submit(self._timed, 'descriptions', self.load_class_descriptions)
+            if driver is None:
+                self._timed('driver', self.setup_driver, headless, self.low_footprint)
+            else:
+                self.driver = driver
+                self.startup_timing['driver'] = 0.0
+            self.class_descriptions = descriptions_future.result()
+        self.description_matcher = class_descriptions.ClassDescriptionMatcher(self.class_descriptions)
+        
+        self.startup_timing['total'] = time.perf_counter() - started
+        print("Scraper ready in {total:.2f}s (driver {driver:.2f}s, descriptions {descriptions:.2f}s)".format(
+            **self.startup_timing))
         
+    def _timed(self, name, func, *args):
+        """Run func(*args) and record its duration in startup_timing[name]"""
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.startup_timing[name] = time.perf_counter() - started
+        
+    def setup_driver(self, headless, low_footprint=False):
+        """Setup Chrome WebDriver with automatic driver management"""
         try:
-            # Automatically download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = create_chrome_driver(headless, low_footprint)
             print("Chrome WebDriver setup successful!")
         except Exception as e:
             print(f"Error setting up Chrome driver: {e}")
             raise
             
     def load_class_descriptions(self):
-        """Load class descriptions from the CMU athletics website"""
+        """Load class descriptions from the on-disk cache or the CMU athletics website"""
         descriptions = {}
         try:
             print("Loading class descriptions...")
-            response = self.session.get(self.descriptions_url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            content = soup.get_text()
-            
-            # Parse the descriptions using regex patterns
-            pattern = r'^([A-Z0-9&\s]+)\n([^A-Z0-9].+?)(?=\n[A-Z0-9&\s]+\n|\nView a video|\n\[|\Z)'
-            matches = re.findall(pattern, content, re.MULTILINE | re.DOTALL)
-            
-            for match in matches:
-                class_name = match[0].strip()
-                description = match[1].strip()
-                clean_name = self.normalize_class_name(class_name)
-                descriptions[clean_name] = description
-                
+            # Fetched through the shared HTTP cache; an unchanged page reuses the parsed result
+            descriptions = class_descriptions.load_descriptions(self.session, self.descriptions_url)
             print(f"Loaded {len(descriptions)} class descriptions")
                 
         except Exception as e:
@@ -106,32 +292,11 @@ class CMUGroupXSeleniumScraper:
     
     def normalize_class_name(self, name):
         """Normalize class names for matching"""
-        normalized = re.sub(r'\s+', ' ', name.lower().strip())
-        variations = {
-            'indoor cycling': 'cycling',
-            'hiit': 'high intensity interval training',
-            'kettlebell cardio hiit': 'kettlebells',
-        }
-        
-        for variation, standard in variations.items():
-            if variation in normalized:
-                normalized = standard
-                break
-                
-        return normalized
+        return class_descriptions.normalize_class_name(name)
     
     def get_class_description(self, class_name):
-        """Get description for a class name"""
-        normalized = self.normalize_class_name(class_name)
-        
-        if normalized in self.class_descriptions:
-            return self.class_descriptions[normalized]
-        
-        for desc_name, description in self.class_descriptions.items():
-            if normalized in desc_name or desc_name in normalized:
-                return description
-                
-        return "Description not available"
+        """Get description for a class name (indexed, memoized lookup)"""
+        return self.description_matcher.lookup(class_name)
     
     def wait_for_schedule_to_load(self, timeout=30):
         """Wait for the schedule grid to load"""
@@ -175,27 +340,68 @@ class CMUGroupXSeleniumScraper:
         else:
             return 'CUC'  # Default assumption
     
-    def scrape_schedule_data(self):
-        """Main method to scrape schedule data with hover simulation"""
-        classes_data = []
+    def scrape_schedule_data(self, deadline_seconds=DEFAULT_DEADLINE_SECONDS,
+                             page_budget_seconds=DEFAULT_PAGE_BUDGET_SECONDS, interactive=None):
+        """Main method to scrape schedule data with hover simulation
+
+        Stops at deadline_seconds and returns what was collected so far as a
+        PartialResult marked partial. Manual input() prompts are only used when
+        interactive (default: a visible browser window); headless runs never block.
+        """
+        classes_data = PartialResult()
+        for class_info in self.iter_schedule_data(deadline_seconds, page_budget_seconds,
+                                                  interactive, status=classes_data):
+            classes_data.append(class_info)
+        return classes_data
+
+    def iter_schedule_data(self, deadline_seconds=DEFAULT_DEADLINE_SECONDS,
+                           page_budget_seconds=DEFAULT_PAGE_BUDGET_SECONDS, interactive=None, status=None):
+        """Generator version of scrape_schedule_data: yields each class as soon as it is parsed
+
+        If a PartialResult is passed as status, its partial/reason fields are set
+        when the scrape is cut short.
+        """
+        if interactive is None:
+            interactive = not self.headless
+        deadline = Deadline(deadline_seconds)
+        collected = 0
+        
+        def mark_partial(reason):
+            print(f"Returning partial GroupX results: {reason} ({deadline.elapsed():.1f}s)")
+            if status is not None:
+                status.partial = True
+                status.reason = reason
         
         try:
             print("Navigating to CMU GroupX schedule page...")
-            self.driver.get(self.schedule_url)
+            
+            def load_schedule_page():
+                self.driver.set_page_load_timeout(max(deadline.budget(page_budget_seconds), 1))
+                self.driver.get(self.schedule_url)
+            
+            # Transient load failures are retried with exponential backoff inside the deadline
+            retry_with_backoff(load_schedule_page, deadline, attempts=3,
+                               transient=(TimeoutException, WebDriverException))
             
             # Check if login is required
             current_url = self.driver.current_url
             if 'login' in current_url.lower() or 'auth' in current_url.lower():
                 print("Login required! Please log in manually in the browser window.")
+                if not interactive:
+                    mark_partial("login required")
+                    return
                 print("After logging in, navigate back to the schedule page.")
                 input("Press Enter after you've logged in and can see the schedule...")
             
             # Wait for page to load
-            time.sleep(5)
+            time.sleep(min(5, deadline.remaining()))
             
             # Try to wait for schedule to load automatically
-            if not self.wait_for_schedule_to_load(timeout=15):
+            if not self.wait_for_schedule_to_load(timeout=max(deadline.budget(15), 1)):
                 print("Schedule didn't load automatically. Please ensure you're on the schedule page.")
+                if not interactive:
+                    mark_partial("schedule grid did not load")
+                    return
                 input("Press Enter when you can see the schedule grid...")
             
             # Find class elements using Selenium
@@ -205,6 +411,9 @@ class CMUGroupXSeleniumScraper:
                 print(f"Found {len(event_elements)} class events with Selenium")
                 
                 for i in range(min(len(event_elements), 36)):  # Process up to 36 classes
+                    if deadline.expired():
+                        mark_partial(f"deadline reached after {collected} classes")
+                        return
                     try:
                         print(f"\nProcessing class {i+1}...")
                         
@@ -236,7 +445,8 @@ class CMUGroupXSeleniumScraper:
                         if matching_elements:
                             class_info = self.parse_dse_event_with_hover(matching_elements[0], element)
                             if class_info:
-                                classes_data.append(class_info)
+                                collected += 1
+                                yield class_info
                         
                         # Move mouse away to clear hover state
                         actions.move_by_offset(100, 100).perform()
@@ -257,12 +467,13 @@ class CMUGroupXSeleniumScraper:
                 for event in dse_events:
                     class_info = self.parse_dse_event(event)
                     if class_info:
-                        classes_data.append(class_info)
+                        collected += 1
+                        yield class_info
             
         except Exception as e:
             print(f"Error during scraping: {e}")
-        
-        return classes_data
+            if deadline.expired():
+                mark_partial(f"deadline reached: {e}")
 
     def parse_dse_event_with_hover(self, soup_element, selenium_element):
         """Parse DSE event with hover data from Selenium element"""
@@ -412,7 +623,7 @@ class CMUGroupXSeleniumScraper:
     
     def close_driver(self):
         """Close the browser driver"""
-        if hasattr(self, 'driver'):
+        if hasattr(self, 'driver') and self.owns_driver:
             self.driver.quit()
     
     def save_to_csv(self, df, filename="cmu_groupx_classes.csv"):
@@ -423,6 +634,18 @@ class CMUGroupXSeleniumScraper:
         print(f"Data saved to {full_path}")
 
 def main():
+    import sys
+    if "--measure" in sys.argv:
+        try:
+            import psutil
+        except ImportError:
+            print("--measure needs psutil to read Chrome's memory use: pip install psutil")
+            return
+        # Compare the default and low-footprint Chrome profiles
+        for low_footprint in (False, True):
+            measure_footprint(low_footprint=low_footprint)
+        return
+
     scraper = None
     try:
         print("Starting CMU GroupX Scraper...")
@@ -5,9 +5,33 @@
 import pandas as pd
 import numpy as np
 import re
+import bisect
+import atexit
+import heapq
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, List, Dict, Any
 
+from busy_bitmap import BusyBitmap
+from dedup import DEFAULT_BUCKET_MINUTES, REPORT_COLUMNS, canonical_event_id, deduplicate_events, normalize_title
+from events import EventRecord, is_record_list, records_to_frame
+from groupx_recurrence import iter_class_occurrences, occurrences_frame, occurrences_to_frame
+
+# Overlap-check implementations accepted by standardize_and_combine
+CONFLICT_BACKENDS = {'pairwise', 'bitmap'}
+
+# Record inputs up to this many rows skip pandas entirely
+FAST_PATH_MAX_ROWS = 5000
+OUTPUT_COLUMNS = ['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']
+
+# Optional process-pool cleaning: only worth the IPC above this many input rows
+PARALLEL_MIN_ROWS = 5000
+MIN_SHARD_ROWS = 500
+
 # ===========================
 # HELPER FUNCTIONS
 # ===========================
@@ -165,15 +189,23 @@ def clean_google_calendar_df(df: pd.DataFrame) -> pd.DataFrame:
     
     return cleaned_df[['start', 'end', 'calendar_event', 'description', 'location', 'url']]
 
-def clean_webscraping_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Optimized web scraping cleaning"""
+def clean_webscraping_df(df: pd.DataFrame, executor: Optional[Executor] = None, shards: int = 1) -> pd.DataFrame:
+    """Optimized web scraping cleaning
+
+    With an executor, date parsing (the per-row hot spot) is split into
+    `shards` contiguous chunks and reassembled in row order.
+    """
     if df.empty:
         return pd.DataFrame(columns=['start', 'end', 'scraped_event', 'description', 'location', 'url'])
     
     cleaned_df = df.copy()
     
     # Vectorized datetime parsing
-    datetime_results = cleaned_df['date_time'].apply(parse_datetime_efficiently)
+    if executor is not None and shards > 1:
+        chunks = _split(cleaned_df['date_time'].tolist(), shards)
+        datetime_results = [result for part in executor.map(_parse_datetime_shard, chunks) for result in part]
+    else:
+        datetime_results = cleaned_df['date_time'].apply(parse_datetime_efficiently)
     cleaned_df['start'] = [x[0] for x in datetime_results]
     cleaned_df['end'] = [x[1] for x in datetime_results]
     
@@ -196,104 +228,48 @@ def clean_webscraping_df(df: pd.DataFrame) -> pd.DataFrame:
     
     return cleaned_df[['start', 'end', 'scraped_event', 'description', 'location', 'url']]
 
-def clean_cmu_scraper_df(df: pd.DataFrame) -> pd.DataFrame:
-    """Optimized CMU scraper cleaning with efficient occurrence generation"""
+def clean_cmu_scraper_df(df: pd.DataFrame, window_start: Optional[pd.Timestamp] = None,
+                         window_end: Optional[pd.Timestamp] = None,
+                         executor: Optional[Executor] = None, shards: int = 1) -> pd.DataFrame:
+    """Optimized CMU scraper cleaning with lazy, window-bounded occurrence generation
+
+    Occurrences are generated only for [window_start, window_end); window_start
+    defaults to now and window_end to the end of each class's term. With an
+    executor, classes are expanded in `shards` chunks and merged back in the
+    serial order.
+    """
     if df.empty:
         return pd.DataFrame(columns=['start', 'end', 'scraped_event', 'description', 'location', 'url'])
     
-    cleaned_df = df.copy()
-    
-    # Pre-compute constants
-    weekday_map = {'Mon': 0, 'Tue': 1, 'Wed': 2, 'Thu': 3, 'Fri': 4, 'Sat': 5, 'Sun': 6}
-    current_time = pd.Timestamp.now(tz='UTC')
-    
-    all_occurrences = []
+    if window_start is None:
+        window_start = pd.Timestamp.now(tz='UTC')
     
-    # Vectorized approach where possible
-    for _, row in cleaned_df.iterrows():
-        occurrences = generate_class_occurrences_optimized(row, weekday_map, current_time)
-        all_occurrences.extend(occurrences)
+    # Each weekly slot becomes one recurrence rule; only in-window dates are expanded
+    if executor is not None and shards > 1:
+        chunks = _split(df, min(shards, len(df)))
+        parts = list(executor.map(_occurrence_shard, chunks, [window_start] * len(chunks),
+                                  [window_end] * len(chunks)))
+        # heapq.merge is stable, so ties keep class order exactly like the serial merge
+        result_df = occurrences_to_frame(list(heapq.merge(*parts, key=lambda occurrence: occurrence['start'])))
+    else:
+        result_df = occurrences_frame(df, window_start, window_end)
     
-    if not all_occurrences:
+    if result_df.empty:
         return pd.DataFrame(columns=['start', 'end', 'scraped_event', 'description', 'location', 'url'])
     
-    result_df = pd.DataFrame(all_occurrences)
-    
     # Vectorized location formatting
-    result_df['location'] = result_df.apply(
-        lambda row: format_cmu_location_optimized(row.get('studio'), row.get('campus_area')), 
-        axis=1
-    )
+    result_df['location'] = [
+        format_cmu_location_optimized(studio, campus_area)
+        for studio, campus_area in zip(result_df['studio'], result_df['campus_area'])
+    ]
     
     # Set other required columns
     result_df['scraped_event'] = result_df['class_name'].fillna('Untitled Class')
     result_df['description'] = result_df['class_description'].fillna(result_df['registration_url'].fillna(''))
     result_df['url'] = result_df['registration_url'].fillna('')
     
-    # Filter future events only
-    result_df = result_df[result_df['start'] >= current_time]
-    
     return result_df[['start', 'end', 'scraped_event', 'description', 'location', 'url']]
 
-def generate_class_occurrences_optimized(row: pd.Series, weekday_map: Dict[str, int], current_time: pd.Timestamp) -> List[Dict]:
-    """Optimized occurrence generation"""
-    try:
-        # Parse term dates once
-        term_start = pd.to_datetime(row['term_start_date'], errors='coerce')
-        term_end = pd.to_datetime(row['term_end_date'], errors='coerce')
-        
-        if pd.isna(term_start) or pd.isna(term_end):
-            return []
-        
-        weekday = row['weekday']
-        if weekday not in weekday_map:
-            return []
-        
-        # Calculate first occurrence
-        effective_start = term_start.date()
-        target_weekday = weekday_map[weekday]
-        days_ahead = target_weekday - effective_start.weekday()
-        if days_ahead < 0:
-            days_ahead += 7
-        
-        first_class_date = effective_start + timedelta(days=days_ahead)
-        
-        # Pre-parse time strings
-        start_time_str = str(row['start_time_local']).strip()
-        end_time_str = str(row['end_time_local']).strip()
-        
-        # Generate all occurrences using date range
-        occurrences = []
-        current_date = first_class_date
-        
-        while current_date <= term_end.date():
-            # Create datetime objects
-            start_datetime = pd.to_datetime(f"{current_date.strftime('%Y-%m-%d')} {start_time_str}", errors='coerce')
-            end_datetime = pd.to_datetime(f"{current_date.strftime('%Y-%m-%d')} {end_time_str}", errors='coerce')
-            
-            if pd.notna(start_datetime) and pd.notna(end_datetime):
-                # Convert to UTC once
-                start_datetime = start_datetime.tz_localize('US/Eastern').tz_convert('UTC')
-                end_datetime = end_datetime.tz_localize('US/Eastern').tz_convert('UTC')
-                
-                # Create occurrence dictionary
-                occurrence = row.to_dict()
-                occurrence.update({
-                    'start': start_datetime,
-                    'end': end_datetime,
-                    'occurrence_date': current_date.strftime('%Y-%m-%d')
-                })
-                
-                occurrences.append(occurrence)
-            
-            # Move to next week
-            current_date += timedelta(days=7)
-        
-        return occurrences
-        
-    except Exception:
-        return []
-
 def format_cmu_location_optimized(studio: Any, campus_area: Any) -> str:
     """Optimized CMU location formatting"""
     parts = []
@@ -306,40 +282,182 @@ def format_cmu_location_optimized(studio: Any, campus_area: Any) -> str:
     
     return ' '.join(parts) if parts else 'CMU Campus'
 
+# ===========================
+# PARALLEL CLEANING
+# ===========================
+
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pool_lock = threading.Lock()
+
+def _in_child_process() -> bool:
+    """True inside a multiprocessing child, including while spawn re-imports the parent's script"""
+    # _inheriting is the flag multiprocessing itself checks to refuse starting processes mid-bootstrap
+    bootstrapping = getattr(multiprocessing.current_process(), '_inheriting', False)
+    return bootstrapping or multiprocessing.parent_process() is not None
+
+def get_process_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Process-wide cleaning pool for this worker count, kept warm across calls
+
+    Pools are keyed by worker count and only shut down at exit, so sessions asking
+    for different counts never pull a pool out from under each other. Returns
+    None inside a pool worker: an unguarded script re-run by spawn would
+    otherwise try to start a pool while it is still bootstrapping.
+    """
+    if _in_child_process():
+        return None
+    with _process_pool_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            if not _process_pools:
+                atexit.register(_shutdown_process_pools)
+            # spawn: forking a threaded process (e.g. Streamlit) can deadlock
+            pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            _process_pools[workers] = pool
+        return pool
+
+def _discard_process_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next call starts a fresh one"""
+    with _process_pool_lock:
+        if _process_pools.get(workers) is pool:
+            del _process_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _shutdown_process_pools() -> None:
+    for pool in _process_pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def resolve_workers(workers: Optional[int], sources: List[Any], min_rows: int = PARALLEL_MIN_ROWS) -> int:
+    """Worker count to clean with: 1 (serial) unless asked for and the DataFrame inputs are large enough"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    frames = [src for src in sources if isinstance(src, pd.DataFrame)]
+    rows = sum(len(df) for df in frames)
+    if workers <= 1 or rows == 0 or rows < min_rows:
+        return 1
+    return workers
+
+def _split(values, parts: int) -> list:
+    """values (list or DataFrame) as `parts` contiguous chunks, in order"""
+    bounds = np.linspace(0, len(values), parts + 1).astype(int)
+    if isinstance(values, pd.DataFrame):
+        return [values.iloc[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+    return [values[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+
+def _parse_datetime_shard(values: List[Any]) -> List[Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]]:
+    return [parse_datetime_efficiently(value) for value in values]
+
+def _occurrence_shard(df: pd.DataFrame, window_start, window_end) -> List[Dict]:
+    return list(iter_class_occurrences(df, window_start, window_end))
+
 # ===========================
 # OPTIMIZED COMBINATION FUNCTION
 # ===========================
 
 def standardize_and_combine_optimized(google_df: Optional[pd.DataFrame] = None, 
                                      webscrape_df: Optional[pd.DataFrame] = None, 
-                                     cmu_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-    """Optimized version of standardize_and_combine with better performance"""
+                                     cmu_df: Optional[pd.DataFrame] = None,
+                                     conflict_backend: str = 'pairwise',
+                                     buffer_before: int = 0,
+                                     buffer_after: int = 0,
+                                     deduplicate: bool = False,
+                                     window_end: Optional[pd.Timestamp] = None,
+                                     workers: Optional[int] = 1,
+                                     parallel_min_rows: int = PARALLEL_MIN_ROWS,
+                                     return_report: bool = False):
+    """Optimized version of standardize_and_combine with better performance
+
+    conflict_backend selects the overlap check: 'pairwise' compares each scraped
+    event against every calendar event, 'bitmap' uses a minute-resolution
+    BusyBitmap and honours buffer_before/buffer_after (minutes of travel time).
+
+    deduplicate (off by default, so the output matches earlier versions)
+    collapses repeated scraped events first. With
+    return_report, a (result, merged_rows) tuple is returned, where merged_rows
+    lists the collapsed rows (None when deduplicate is off).
+
+    window_end bounds GroupX occurrence generation (e.g. the same 14 days as the
+    calendar fetch); by default classes are expanded to the end of their term.
+
+    Any source may also be given as a list of events.EventRecord (already
+    parsed, e.g. from the scrapers' *_records helpers). Small all-record inputs
+    take the pure-Python combine_records path when it gives the same result.
+
+    workers > 1 (None = one per CPU) cleans the sources concurrently on a
+    process pool once the DataFrame inputs reach parallel_min_rows rows: Eventbrite
+    date parsing and GroupX occurrence expansion are sharded across workers and
+    merged back in serial order, so the output is identical to workers=1.
+    The pool uses the spawn start method, so a script calling this with
+    workers > 1 must do so under ``if __name__ == '__main__':``. If the pool
+    can't start, cleaning falls back to serial with a warning.
+    """
+    if conflict_backend not in CONFLICT_BACKENDS:
+        raise ValueError(f"Unknown conflict_backend '{conflict_backend}', expected one of {sorted(CONFLICT_BACKENDS)}")
+
+    sources = [google_df, webscrape_df, cmu_df]
+    if any(src is not None for src in sources) and all(src is None or is_record_list(src) for src in sources):
+        calendar = list(google_df or [])
+        scraped = list(webscrape_df or []) + list(cmu_df or [])
+        if (conflict_backend == 'pairwise' and len(calendar) + len(scraped) <= FAST_PATH_MAX_ROWS
+                and not (deduplicate and may_have_duplicates(scraped))):
+            report = pd.DataFrame(columns=REPORT_COLUMNS) if deduplicate else None
+            return _with_report(combine_records(calendar, scraped), report, return_report)
     
     cleaned_dfs = []
+    workers = resolve_workers(workers, sources, parallel_min_rows)
+    pool = get_process_pool(workers) if workers > 1 else None
+    # One "now" for every shard, so all workers expand the same window
+    window_start = pd.Timestamp.now(tz='UTC')
     
     # Process each data source
     data_sources = [
         (google_df, clean_google_calendar_df, 'calendar_event'),
-        (webscrape_df, clean_webscraping_df, 'scraped_event'),
-        (cmu_df, clean_cmu_scraper_df, 'scraped_event')
+        (webscrape_df, lambda df: clean_webscraping_df(
+            df, pool, min(workers, max(len(df) // MIN_SHARD_ROWS, 1))), 'scraped_event'),
+        (cmu_df, lambda df: clean_cmu_scraper_df(df, window_start, window_end, pool, workers), 'scraped_event')
     ]
+    data_sources = [(df, clean_func, event_type) for df, clean_func, event_type in data_sources
+                    if df is not None and len(df)]
+    
+    def clean(df, clean_func):
+        # Records are already parsed; only the columnar layout is built
+        return records_to_frame(df) if is_record_list(df) else clean_func(df)
+    
+    def clean_all():
+        if pool is not None and len(data_sources) > 1:
+            # Sources run side by side; each hands its shards to the process pool
+            with ThreadPoolExecutor(len(data_sources)) as threads:
+                return list(threads.map(lambda source: clean(source[0], source[1]), data_sources))
+        return [clean(df, clean_func) for df, clean_func, _ in data_sources]
     
-    for df, clean_func, event_type in data_sources:
-        if df is not None and not df.empty:
-            cleaned = clean_func(df)
-            if not cleaned.empty:
-                # Add the appropriate event type column
-                if event_type == 'calendar_event':
-                    cleaned['scraped_event'] = None
-                else:
-                    cleaned['calendar_event'] = None
-                cleaned_dfs.append(cleaned)
+    try:
+        results = clean_all()
+    except BrokenProcessPool:
+        print("Warning: the cleaning process pool failed to start (is the calling script missing an "
+              "`if __name__ == '__main__':` guard?); cleaning serially")
+        _discard_process_pool(workers, pool)
+        pool = None
+        results = clean_all()
+    
+    for (_, _, event_type), cleaned in zip(data_sources, results):
+        if not cleaned.empty:
+            # Add the appropriate event type column
+            if event_type == 'calendar_event':
+                cleaned['scraped_event'] = None
+            else:
+                cleaned['calendar_event'] = None
+            cleaned_dfs.append(cleaned)
     
     if not cleaned_dfs:
-        return pd.DataFrame(columns=['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url'])
+        report = pd.DataFrame(columns=REPORT_COLUMNS) if deduplicate else None
+        return _with_report(pd.DataFrame(columns=OUTPUT_COLUMNS), report, return_report)
     
     # Combine all dataframes
     combined_df = pd.concat(cleaned_dfs, ignore_index=True)
+
+    # Collapse the same class listed by several sources / scrapes
+    merge_report = None
+    if deduplicate:
+        combined_df, merge_report = deduplicate_events(combined_df)
     
     # Create time ranges
     combined_df['time_range'] = combined_df.apply(
@@ -353,10 +471,68 @@ def standardize_and_combine_optimized(google_df: Optional[pd.DataFrame] = None,
     combined_df = combined_df.sort_values('start').reset_index(drop=True)
     
     # Optimized overlap detection
-    final_df = remove_overlapping_events_optimized(combined_df)
+    if conflict_backend == 'bitmap':
+        final_df = remove_overlapping_events_bitmap(combined_df, buffer_before, buffer_after)
+    else:
+        final_df = remove_overlapping_events_optimized(combined_df)
     
     # Return final columns
-    return final_df[['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']]
+    final_df = final_df[['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']]
+    return _with_report(final_df, merge_report, return_report)
+
+def _with_report(final_df: pd.DataFrame, merge_report: Optional[pd.DataFrame], return_report: bool):
+    # The report is returned alongside, never stored in attrs: pandas compares attrs
+    # when propagating metadata, which fails for DataFrame values
+    return (final_df, merge_report) if return_report else final_df
+
+def may_have_duplicates(records: List[EventRecord], bucket_minutes: int = DEFAULT_BUCKET_MINUTES) -> bool:
+    """Cheap pre-check: could deduplicate_events merge anything in these scraped records?"""
+    by_title: Dict[str, List[int]] = {}
+    seen_ids = set()
+    for record in records:
+        minute = int(record.start.timestamp() // 60)
+        event_id = canonical_event_id(record.url)
+        if event_id is not None:
+            if (event_id, minute) in seen_ids:
+                return True
+            seen_ids.add((event_id, minute))
+        title = normalize_title(record.title)
+        if title:
+            by_title.setdefault(title, []).append(minute)
+    for minutes in by_title.values():
+        minutes.sort()
+        if any(b - a <= bucket_minutes for a, b in zip(minutes, minutes[1:])):
+            return True
+    return False
+
+def combine_records(calendar: List[EventRecord], scraped: List[EventRecord]) -> pd.DataFrame:
+    """Pure-Python combine for small record inputs (same overlap rule as the pairwise path)"""
+    calendar = sorted((r for r in calendar if r.start is not None), key=lambda r: r.start)
+    # Zero-length events (reminders, deadlines) take no time, so they never conflict, as in the bitmap
+    blocking = [r for r in calendar if r.end_or_default() > r.start]
+    cal_starts = [r.start for r in blocking]
+    # Running max of calendar end times: a scraped event overlaps iff some calendar
+    # event starting before its end also ends after its start
+    max_end = []
+    for record in blocking:
+        end = record.end_or_default()
+        max_end.append(end if not max_end or end > max_end[-1] else max_end[-1])
+
+    kept = [(r.start, r.end, None, r.title, r.description, r.location, r.url) for r in calendar]
+    for record in scraped:
+        if record.start is None:
+            continue
+        if blocking and record.end_or_default() > record.start:
+            before = bisect.bisect_left(cal_starts, record.end_or_default())
+            if before and max_end[before - 1] > record.start:
+                continue
+        kept.append((record.start, record.end, record.title, None,
+                     record.description, record.location, record.url))
+    kept.sort(key=lambda row: row[0])
+
+    rows = [(create_time_range_display(start, end), scraped_event, calendar_event, description, location, url)
+            for start, end, scraped_event, calendar_event, description, location, url in kept]
+    return pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
 
 def remove_overlapping_events_optimized(df: pd.DataFrame) -> pd.DataFrame:
     """Optimized overlap detection using vectorized operations where possible"""
@@ -379,17 +555,20 @@ def remove_overlapping_events_optimized(df: pd.DataFrame) -> pd.DataFrame:
         scraped_events['start'] + timedelta(hours=1)
     )
     
+    # Zero-length events (reminders, deadlines) take no time, so they never conflict, as in the bitmap
+    blocking = calendar_events[calendar_events['end_filled'] > calendar_events['start']]
+    
     # Find non-overlapping scraped events
     non_overlapping_scraped = []
     
     for _, scraped in scraped_events.iterrows():
         # Check overlap with all calendar events at once
         overlaps = (
-            (calendar_events['start'] < scraped['end_filled']) & 
-            (scraped['start'] < calendar_events['end_filled'])
+            (blocking['start'] < scraped['end_filled']) & 
+            (scraped['start'] < blocking['end_filled'])
         )
         
-        if not overlaps.any():
+        if scraped['end_filled'] <= scraped['start'] or not overlaps.any():
             non_overlapping_scraped.append(scraped)
     
     # Combine results
@@ -405,12 +584,160 @@ def remove_overlapping_events_optimized(df: pd.DataFrame) -> pd.DataFrame:
     
     return pd.DataFrame(columns=df.columns)
 
+def remove_overlapping_events_bitmap(df: pd.DataFrame, buffer_before: int = 0,
+                                     buffer_after: int = 0) -> pd.DataFrame:
+    """Overlap detection against a minute-resolution busy bitmap of the calendar events"""
+
+    calendar_mask = df['calendar_event'].notna()
+    scraped_mask = df['scraped_event'].notna()
+
+    if not calendar_mask.any():
+        return df
+
+    if not scraped_mask.any():
+        return df[calendar_mask].reset_index(drop=True)
+
+    bitmap = BusyBitmap.from_calendar_df(df[calendar_mask])
+    scraped_events = df[scraped_mask]
+    conflicts = bitmap.conflict_minutes_many(
+        scraped_events['start'], scraped_events['end'], buffer_before, buffer_after
+    )
+
+    keep = calendar_mask.copy()
+    keep[scraped_events.index[conflicts == 0]] = True
+
+    # df is already sorted by start, so the filtered view stays in order
+    return df[keep].reset_index(drop=True)
+
+def build_busy_bitmap(google_df: pd.DataFrame,
+                      horizon_start: Optional[pd.Timestamp] = None,
+                      horizon_end: Optional[pd.Timestamp] = None) -> BusyBitmap:
+    """Clean a raw Google Calendar frame and build its busy bitmap for fit/gap queries"""
+    cleaned = clean_google_calendar_df(google_df) if google_df is not None else pd.DataFrame()
+    return BusyBitmap.from_calendar_df(cleaned, horizon_start, horizon_end)
+
+# ===========================
+# INCREMENTAL COMBINATION
+# ===========================
+
+class IncrementalSchedule:
+    """Sorted, conflict-filtered schedule that scraped events are inserted into as they arrive
+
+    The calendar is cleaned once into a BusyBitmap, so each new scraped event
+    costs an O(1) conflict check plus a bisect insert instead of a full re-combine.
+    """
+
+    def __init__(self, google_df: Optional[pd.DataFrame] = None, buffer_before: int = 0,
+                 buffer_after: int = 0, window_end: Optional[pd.Timestamp] = None):
+        self.buffer_before = buffer_before
+        self.buffer_after = buffer_after
+        self.window_end = window_end
+        self._keys: List[Tuple[pd.Timestamp, int]] = []
+        self._rows: List[Dict] = []
+        self._seen = set()
+        self._seq = 0
+
+        calendar = clean_google_calendar_df(google_df) if google_df is not None else pd.DataFrame()
+        self.bitmap = BusyBitmap.from_calendar_df(calendar)
+        self.has_calendar = not calendar.empty
+        for row in calendar.to_dict('records'):
+            row['scraped_event'] = None
+            self._insert(row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _insert(self, row: Dict) -> None:
+        """Insert keeping start order (ties keep arrival order); the display range is formatted once here"""
+        row['time_range'] = create_time_range_display(row['start'], row['end'])
+        key = (row['start'], self._seq)
+        self._seq += 1
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._rows.insert(position, row)
+
+    def add_cleaned(self, cleaned: pd.DataFrame) -> int:
+        """Insert already-cleaned scraped rows that fit the calendar; returns how many were added"""
+        if cleaned.empty:
+            return 0
+        cleaned = cleaned.dropna(subset=['start'])
+        if self.has_calendar:
+            conflicts = self.bitmap.conflict_minutes_many(
+                cleaned['start'], cleaned['end'], self.buffer_before, self.buffer_after
+            )
+            cleaned = cleaned[conflicts == 0]
+
+        added = 0
+        for row in cleaned.to_dict('records'):
+            dedup_key = (normalize_title(row['scraped_event']), row['start'])
+            if dedup_key in self._seen:
+                continue
+            self._seen.add(dedup_key)
+            row['calendar_event'] = None
+            self._insert(row)
+            added += 1
+        return added
+
+    def remove_cleaned(self, cleaned: pd.DataFrame) -> int:
+        """Retract already-cleaned scraped rows (e.g. cancelled or moved classes); returns how many were removed"""
+        if cleaned.empty:
+            return 0
+        removed = 0
+        for row in cleaned.dropna(subset=['start']).to_dict('records'):
+            dedup_key = (normalize_title(row['scraped_event']), row['start'])
+            if dedup_key not in self._seen:
+                continue
+            lo = bisect.bisect_left(self._keys, (row['start'], -1))
+            hi = bisect.bisect_left(self._keys, (row['start'], self._seq))
+            for position in range(lo, hi):
+                candidate = self._rows[position]
+                if candidate['scraped_event'] is not None and \
+                        normalize_title(candidate['scraped_event']) == dedup_key[0]:
+                    del self._keys[position]
+                    del self._rows[position]
+                    self._seen.discard(dedup_key)
+                    removed += 1
+                    break
+        return removed
+
+    def apply_diff(self, diff) -> Tuple[int, int]:
+        """Apply a scrape_diff.ScrapeDiff: retract removed/old rows, insert added/new ones; returns (added, removed)"""
+        inserts, retracts = diff.delta_records()
+        if diff.source == 'groupx':
+            clean = lambda records: clean_cmu_scraper_df(pd.DataFrame(records), window_end=self.window_end)
+        else:
+            clean = lambda records: clean_webscraping_df(pd.DataFrame(records))
+        removed = self.remove_cleaned(clean(retracts)) if retracts else 0
+        added = self.add_cleaned(clean(inserts)) if inserts else 0
+        return added, removed
+
+    def add_eventbrite_records(self, records: List[Dict]) -> int:
+        """Insert raw Eventbrite scraper records"""
+        return self.add_cleaned(clean_webscraping_df(pd.DataFrame(records))) if records else 0
+
+    def add_groupx_records(self, records: List[Dict]) -> int:
+        """Insert raw GroupX scraper records (expanded within window_end)"""
+        return self.add_cleaned(clean_cmu_scraper_df(pd.DataFrame(records), window_end=self.window_end)) if records else 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Current view in the same shape as standardize_and_combine's output"""
+        columns = ['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url']
+        if not self._rows:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(self._rows, columns=columns)
+
 # ===========================
 # MAIN FUNCTION
 # ===========================
 
-def standardize_and_combine(google_df=None, webscrape_df=None, cmu_df=None):
+def standardize_and_combine(google_df=None, webscrape_df=None, cmu_df=None,
+                            conflict_backend='pairwise', buffer_before=0, buffer_after=0,
+                            deduplicate=False, window_end=None, workers=1,
+                            parallel_min_rows=PARALLEL_MIN_ROWS, return_report=False):
     """
     Main function - calls the optimized version for better performance
     """
-    return standardize_and_combine_optimized(google_df, webscrape_df, cmu_df)
\ No newline at end of file
+    return standardize_and_combine_optimized(google_df, webscrape_df, cmu_df,
+                                             conflict_backend, buffer_before, buffer_after,
+                                             deduplicate, window_end, workers, parallel_min_rows,
+                                             return_report)
\ No newline at end of file
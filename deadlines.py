@@ -0,0 +1,144 @@
+"""
+Deadline budgets for scraper runs
+=================================
+Helpers that cap how long a scrape may take:
+
+* ``Deadline`` - an overall wall-clock budget; per-page budgets are clipped to
+  whatever is left of it.
+* ``retry_with_backoff`` / ``async_retry_with_backoff`` - exponential backoff
+  with jitter for transient failures, never sleeping past the deadline.
+* ``hedged`` - start a second attempt if the first is slow and take whichever
+  finishes first, which trims the tail latency of single slow pages.
+* ``PartialResult`` - a list that remembers whether the scrape was cut short,
+  so callers get whatever was collected instead of an exception or a hang.
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Iterable, Optional, Tuple, Type
+
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+
+# ===========================
+# DEADLINE
+# ===========================
+
+class DeadlineExceeded(Exception):
+    """Raised when no time is left in the budget"""
+
+class Deadline:
+    """Overall time budget measured on the monotonic clock (None = unlimited)"""
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.expires_at = None if seconds is None else self.started + seconds
+
+    def remaining(self) -> float:
+        """Seconds left (infinity when unlimited, never negative)"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def budget(self, per_step: float) -> float:
+        """Time allowed for the next step: per-step budget clipped to what is left"""
+        return min(per_step, self.remaining())
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline of {self.seconds}s exceeded")
+
+# ===========================
+# PARTIAL RESULTS
+# ===========================
+
+class PartialResult(list):
+    """List of scraped records that also says whether the run was cut short"""
+
+    def __init__(self, items: Iterable = (), partial: bool = False, reason: str = ''):
+        super().__init__(items)
+        self.partial = partial
+        self.reason = reason
+
+# ===========================
+# RETRIES
+# ===========================
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def retry_with_backoff(func: Callable, deadline: Deadline, attempts: int = 3,
+                       transient: Tuple[Type[BaseException], ...] = (Exception,),
+                       base_delay: float = DEFAULT_BACKOFF_BASE):
+    """Call func() until it succeeds, retrying transient errors while time remains"""
+    for attempt in range(attempts):
+        deadline.check()
+        try:
+            return func()
+        except transient as e:
+            delay = backoff_delay(attempt, base_delay)
+            if attempt == attempts - 1 or delay >= deadline.remaining():
+                raise
+            print(f"Transient error ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+async def async_retry_with_backoff(factory: Callable[[], Awaitable], deadline: Deadline,
+                                   attempts: int = 3, per_attempt: Optional[float] = None,
+                                   transient: Tuple[Type[BaseException], ...] = (Exception,),
+                                   base_delay: float = DEFAULT_BACKOFF_BASE):
+    """Await factory() with a per-attempt timeout, retrying transient errors while time remains"""
+    for attempt in range(attempts):
+        deadline.check()
+        timeout = deadline.budget(per_attempt) if per_attempt is not None else deadline.remaining()
+        try:
+            return await asyncio.wait_for(factory(), None if timeout == float('inf') else timeout)
+        except transient as e:
+            delay = backoff_delay(attempt, base_delay)
+            if attempt == attempts - 1 or delay >= deadline.remaining():
+                raise
+            print(f"Transient error ({e!r}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+async def hedged(factory: Callable[[], Awaitable], hedge_after: float, timeout: float):
+    """Run factory(); if it hasn't finished after hedge_after seconds, race a second copy.
+
+    Returns the first successful result, cancelling the other attempt. Raises
+    asyncio.TimeoutError if neither finishes within timeout, or the last error
+    if both fail.
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    tasks = [asyncio.ensure_future(factory())]
+    last_error = None
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=min(hedge_after, timeout))
+        if not done and loop.time() < end:
+            tasks.append(asyncio.ensure_future(factory()))
+
+        pending = set(tasks)
+        while pending:
+            remaining = end - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        if last_error is not None and not pending:
+            raise last_error
+        raise asyncio.TimeoutError(f"No attempt finished within {timeout}s")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
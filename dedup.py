@@ -0,0 +1,191 @@
+"""
+Cross-source deduplication of scraped events
+============================================
+The same class can reach the combiner several times: multiple Eventbrite
+listing cards link to one ``/e/`` event, a class is listed on both Eventbrite
+and GroupX, or repeated scrapes are appended to each other.
+
+Rows are hashed into buckets keyed by (normalized title, start-time bucket),
+and near-duplicate resolution (start tolerance, compatible venue) only runs
+inside a bucket and its immediate neighbour, so the work stays roughly linear
+instead of comparing every pair of events. A second hash pass merges rows
+that share a canonical Eventbrite event ID at the same start time.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_BUCKET_MINUTES = 15
+VENUE_SIMILARITY_THRESHOLD = 0.5
+REPORT_COLUMNS = ['kept_index', 'merged_index', 'kept_event', 'merged_event', 'start', 'reason']
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_EVENTBRITE_ID = re.compile(r'/e/(?:[^/?#]*-)?(\d{6,})')
+_TITLE_NOISE = {'class', 'classes', 'the', 'a', 'an', 'with', 'and', 'free', 'session'}
+# Words shared by many venues ("Keeler Studio (CUC)" / "Kenner Studio (CUC)"); they say nothing about which room
+_VENUE_NOISE = {'studio', 'studios', 'room', 'cuc', 'center', 'centre', 'building', 'floor',
+                'the', 'at', 'of', 'pittsburgh', 'pgh', 'pa'}
+
+# ===========================
+# NORMALIZATION
+# ===========================
+
+def normalize_title(title) -> str:
+    """Lowercase, strip punctuation and filler words so listings of one class hash together"""
+    if title is None or (isinstance(title, float) and pd.isna(title)):
+        return ''
+    tokens = _NON_ALNUM.sub(' ', str(title).lower()).split()
+    return ' '.join(t for t in tokens if t not in _TITLE_NOISE)
+
+def venue_tokens(location) -> frozenset:
+    """Distinguishing tokens of a location string for fuzzy venue comparison (generic words dropped)"""
+    if location is None or (isinstance(location, float) and pd.isna(location)):
+        return frozenset()
+    return frozenset(t for t in _NON_ALNUM.sub(' ', str(location).lower()).split() if t not in _VENUE_NOISE)
+
+def canonical_event_id(url) -> Optional[str]:
+    """Numeric Eventbrite event ID from an /e/ link, ignoring query strings and slugs"""
+    if not url or (isinstance(url, float) and pd.isna(url)):
+        return None
+    match = _EVENTBRITE_ID.search(str(url))
+    return match.group(1) if match else None
+
+def venues_compatible(a: frozenset, b: frozenset) -> bool:
+    """Unknown venues match anything; otherwise require enough token overlap"""
+    if not a or not b:
+        return True
+    return len(a & b) / len(a | b) >= VENUE_SIMILARITY_THRESHOLD or a <= b or b <= a
+
+# ===========================
+# UNION-FIND
+# ===========================
+
+class _DisjointSet:
+    """Minimal union-find over row positions"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        # Lower position becomes the root so cluster order is deterministic
+        if rb < ra:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        return True
+
+# ===========================
+# DEDUPLICATION
+# ===========================
+
+def _information_score(row: pd.Series) -> int:
+    """Prefer the copy carrying the most detail (real description, venue, end time)"""
+    score = 0
+    for col in ('description', 'location'):
+        value = row.get(col)
+        if isinstance(value, str) and value.strip() and not value.startswith('http'):
+            score += len(value)
+    if pd.notna(row.get('end')):
+        score += 1
+    return score
+
+def deduplicate_events(df: pd.DataFrame, bucket_minutes: int = DEFAULT_BUCKET_MINUTES,
+                       title_column: str = 'scraped_event') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Collapse near-duplicate scraped events; return (deduplicated frame, merge report)
+
+    Only rows with a value in title_column take part, so calendar events pass
+    through untouched. The report has one row per dropped duplicate, naming the
+    index of the row it was merged into and why.
+    """
+    empty_report = pd.DataFrame(columns=REPORT_COLUMNS)
+    if df.empty or title_column not in df.columns:
+        return df, empty_report
+
+    candidates = df[df[title_column].notna()]
+    if len(candidates) < 2:
+        return df, empty_report
+
+    index = list(candidates.index)
+    titles = candidates[title_column].map(normalize_title).tolist()
+    starts = pd.to_datetime(candidates['start'], utc=True)
+    start_minutes = ((starts - pd.Timestamp('1970-01-01', tz='UTC')) // pd.Timedelta(minutes=1)).tolist()
+    locations = (candidates['location'] if 'location' in candidates.columns
+                 else pd.Series('', index=candidates.index)).map(venue_tokens).tolist()
+    event_ids = (candidates['url'] if 'url' in candidates.columns
+                 else pd.Series('', index=candidates.index)).map(canonical_event_id).tolist()
+
+    ds = _DisjointSet(len(index))
+    reasons: Dict[int, str] = {}
+
+    # Pass 1: same canonical Eventbrite ID and start minute
+    by_event_id = {}
+    for pos, (event_id, minute) in enumerate(zip(event_ids, start_minutes)):
+        if event_id is None:
+            continue
+        key = (event_id, minute)
+        if key in by_event_id:
+            if ds.union(by_event_id[key], pos):
+                reasons.setdefault(pos, 'same_event_id')
+                reasons.setdefault(by_event_id[key], 'same_event_id')
+        else:
+            by_event_id[key] = pos
+
+    # Pass 2: title + start bucket, resolving near-duplicates inside each bucket
+    buckets: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+    for pos, (title, minute) in enumerate(zip(titles, start_minutes)):
+        if title:
+            buckets[(title, minute // bucket_minutes)].append(pos)
+
+    for (title, bucket), members in buckets.items():
+        # Neighbouring bucket catches pairs straddling a bucket boundary
+        neighbours = buckets.get((title, bucket - 1), [])
+        for i, pos in enumerate(members):
+            for other in members[:i] + neighbours:
+                if abs(start_minutes[pos] - start_minutes[other]) > bucket_minutes:
+                    continue
+                if not venues_compatible(locations[pos], locations[other]):
+                    continue
+                if ds.union(other, pos):
+                    reasons.setdefault(pos, 'title_time_venue')
+                    reasons.setdefault(other, 'title_time_venue')
+                break
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for pos in range(len(index)):
+        clusters[ds.find(pos)].append(pos)
+
+    drop_labels = []
+    report_rows = []
+    for root, members in clusters.items():
+        if len(members) == 1:
+            continue
+        keep = max(members, key=lambda p: (_information_score(candidates.iloc[p]), -p))
+        for pos in sorted(members):
+            if pos == keep:
+                continue
+            drop_labels.append(index[pos])
+            report_rows.append({
+                'kept_index': index[keep],
+                'merged_index': index[pos],
+                'kept_event': candidates.iloc[keep][title_column],
+                'merged_event': candidates.iloc[pos][title_column],
+                'start': candidates.iloc[pos]['start'],
+                'reason': reasons.get(pos, 'title_time_venue'),
+            })
+
+    if not drop_labels:
+        return df, empty_report
+
+    report = pd.DataFrame(report_rows, columns=REPORT_COLUMNS).sort_values('merged_index').reset_index(drop=True)
+    return df.drop(index=drop_labels), report
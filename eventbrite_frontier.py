@@ -0,0 +1,238 @@
+"""
+Eventbrite crawl frontier
+=========================
+Keeps track of which Eventbrite listing pages and event pages still need to be
+visited, across several search queries/locations and across runs.
+
+* Listing pages are ``/d/<location>/<query>/?page=N``; a query is followed page
+  by page until a page brings no new events or ``max_pages`` is reached.
+* Event links are deduplicated by their canonical numeric event ID, so the
+  several cards Eventbrite renders for one event collapse to one visit.
+* The state is saved atomically every SAVE_EVERY steps and when the crawl
+  finishes. An interrupted crawl resumes from the last save, and later crawls
+  only revisit events that are new or whose listing card changed; unchanged
+  events reuse their stored record.
+* Events not seen on any listing for KNOWN_EVENT_TTL_SECONDS are dropped, so
+  the state file doesn't grow forever.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from dedup import canonical_event_id
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'eventbrite_frontier.json')
+LISTING_URL = "https://www.eventbrite.com/d/{location}/{query}/?page={page}"
+DEFAULT_SEARCHES = [
+    ('pa--pittsburgh', 'fitness-class'),
+    ('pa--pittsburgh', 'yoga'),
+    ('pa--pittsburgh', 'dance-class'),
+]
+DEFAULT_MAX_PAGES = 5
+SAVE_EVERY = 10                                  # listing/event steps between saves
+KNOWN_EVENT_TTL_SECONDS = 30 * 24 * 60 * 60      # forget events unseen for this long
+
+# Sessions and a background refresh may save from several threads of one process
+_save_lock = threading.Lock()
+
+# ===========================
+# HELPER FUNCTIONS
+# ===========================
+
+def canonical_event_url(link: str) -> str:
+    """Event URL without query string/fragment (tracking parameters differ between cards)"""
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme or 'https', parts.netloc or 'www.eventbrite.com', parts.path, '', ''))
+
+def event_key(link: str) -> str:
+    """Stable identity of an event link: numeric Eventbrite ID, else the canonical URL"""
+    return canonical_event_id(link) or canonical_event_url(link)
+
+def card_fingerprint(card_text: str) -> str:
+    """Hash of a listing card's text; a changed card (title, date, price) means a revisit"""
+    normalized = ' '.join((card_text or '').split()).lower()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+# ===========================
+# FRONTIER
+# ===========================
+
+class CrawlFrontier:
+    """Resumable queue of listing pages and event pages for Eventbrite crawls"""
+
+    def __init__(self, searches: Optional[Iterable[Tuple[str, str]]] = None,
+                 max_pages: int = DEFAULT_MAX_PAGES, state_path: str = STATE_FILE):
+        self.searches = [tuple(s) for s in (searches or DEFAULT_SEARCHES)]
+        self.max_pages = max_pages
+        self.state_path = state_path
+
+        # Persistent across crawls
+        self.known_events: Dict[str, Dict] = {}      # key -> {url, fingerprint, record, visited_at, seen_at}
+
+        # Per-crawl progress (saved so an interrupted crawl can resume)
+        self.listing_queue = deque()                 # (location, query, page)
+        self.event_queue = deque()                   # keys waiting for a visit
+        self.crawl_events: List[str] = []            # keys seen in this crawl, in discovery order
+        self.in_progress = False
+        self._unsaved_steps = 0
+
+        self.load()
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+
+    def load(self) -> None:
+        """Restore state from disk if present"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.known_events = state.get('known_events', {})
+        if state.get('in_progress') and [tuple(s) for s in state.get('searches', [])] == self.searches:
+            self.listing_queue = deque(tuple(item) for item in state.get('listing_queue', []))
+            self.event_queue = deque(state.get('event_queue', []))
+            self.crawl_events = state.get('crawl_events', [])
+            self.in_progress = True
+            print(f"Resuming Eventbrite crawl: {len(self.listing_queue)} listing pages, "
+                  f"{len(self.event_queue)} events pending")
+
+    def save(self) -> None:
+        """Atomically write state to disk"""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        state = {
+            'searches': self.searches,
+            'known_events': self.known_events,
+            'listing_queue': list(self.listing_queue),
+            'event_queue': list(self.event_queue),
+            'crawl_events': self.crawl_events,
+            'in_progress': self.in_progress,
+        }
+        with _save_lock:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.state_path),
+                                             prefix=os.path.basename(self.state_path) + '.', suffix='.tmp',
+                                             delete=False) as f:
+                json.dump(state, f)
+            os.replace(f.name, self.state_path)
+        self._unsaved_steps = 0
+
+    def _step_done(self) -> None:
+        """Count a crawl step; save once SAVE_EVERY steps have accumulated"""
+        self._unsaved_steps += 1
+        if self._unsaved_steps >= SAVE_EVERY:
+            self.save()
+
+    def prune(self, ttl: float = KNOWN_EVENT_TTL_SECONDS) -> int:
+        """Forget events not seen on a listing within ttl seconds (never ones queued in this crawl)"""
+        cutoff = time.time() - ttl
+        keep = set(self.crawl_events) | set(self.event_queue)
+        stale = [key for key, entry in self.known_events.items()
+                 if key not in keep and (entry.get('seen_at') or entry.get('visited_at') or 0) < cutoff]
+        for key in stale:
+            del self.known_events[key]
+        return len(stale)
+
+    # ---------------------------
+    # Crawl lifecycle
+    # ---------------------------
+
+    def start(self) -> None:
+        """Begin a new crawl unless an interrupted one is being resumed"""
+        if self.in_progress:
+            return
+        self.listing_queue = deque((location, query, 1) for location, query in self.searches)
+        self.event_queue = deque()
+        self.crawl_events = []
+        self.in_progress = True
+        self.save()
+
+    def finish(self) -> None:
+        """Mark the crawl complete once both queues are drained"""
+        if not self.listing_queue and not self.event_queue:
+            self.in_progress = False
+            dropped = self.prune()
+            if dropped:
+                print(f"Forgot {dropped} Eventbrite events not seen for {KNOWN_EVENT_TTL_SECONDS // 86400} days")
+        self.save()
+
+    def next_listing_url(self) -> Optional[Tuple[Tuple[str, str, int], str]]:
+        """Next listing page to fetch as ((location, query, page), url), or None"""
+        if not self.listing_queue:
+            return None
+        location, query, page = self.listing_queue[0]
+        return (location, query, page), LISTING_URL.format(location=location, query=query, page=page)
+
+    def record_listing(self, listing: Tuple[str, str, int], cards: Iterable[Dict]) -> int:
+        """Register the event cards ({link, title}) found on a listing page; returns new-in-crawl count"""
+        location, query, page = listing
+        seen_in_crawl = set(self.crawl_events)
+        new_in_crawl = 0
+        now = time.time()
+
+        for card in cards:
+            link = card.get('link')
+            if not link or '/e/' not in link:
+                continue
+            key = event_key(link)
+            if key in seen_in_crawl:
+                continue
+            seen_in_crawl.add(key)
+            self.crawl_events.append(key)
+            new_in_crawl += 1
+
+            fingerprint = card_fingerprint(card.get('title', ''))
+            known = self.known_events.get(key)
+            if known is None or known.get('fingerprint') != fingerprint or known.get('record') is None:
+                self.known_events.setdefault(key, {})
+                self.known_events[key].update({'url': canonical_event_url(link), 'fingerprint': fingerprint})
+                self.event_queue.append(key)
+            self.known_events[key]['seen_at'] = now
+
+        if self.listing_queue and self.listing_queue[0] == listing:
+            self.listing_queue.popleft()
+        # Follow pagination while pages keep producing events we haven't seen in this crawl
+        if new_in_crawl and page < self.max_pages:
+            self.listing_queue.append((location, query, page + 1))
+        self._step_done()
+        return new_in_crawl
+
+    def next_event(self) -> Optional[Tuple[str, str]]:
+        """Next (key, url) event page that is new or changed, or None"""
+        while self.event_queue:
+            key = self.event_queue[0]
+            if key in self.known_events:
+                return key, self.known_events[key]['url']
+            self.event_queue.popleft()
+        return None
+
+    def record_event(self, key: str, record: Optional[Dict]) -> None:
+        """Store the parsed record (None if the page had no usable data) and dequeue the event"""
+        entry = self.known_events.setdefault(key, {})
+        entry['record'] = record
+        entry['visited_at'] = time.time()
+        if self.event_queue and self.event_queue[0] == key:
+            self.event_queue.popleft()
+        self._step_done()
+
+    def skip_event(self, key: str) -> None:
+        """Drop an event from this crawl's queue without recording it (retried next crawl)"""
+        if self.event_queue and self.event_queue[0] == key:
+            self.event_queue.popleft()
+        self._step_done()
+
+    def results(self) -> List[Dict]:
+        """Records for every event seen in this crawl, fresh or reused from earlier crawls"""
+        records = []
+        for key in self.crawl_events:
+            record = self.known_events.get(key, {}).get('record')
+            if record:
+                records.append(record)
+        return records
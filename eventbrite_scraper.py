@@ -1,82 +1,337 @@
 # GenAI  - Used ChatGPT to develop this module.
 import asyncio
-from playwright.async_api import async_playwright
 import json
 import pandas as pd
+from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
 
-async def run():
-    url = "https://www.eventbrite.com/d/pa--pittsburgh/fitness-class/"
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url, timeout=60000)
-
-        # Get all event links
-        event_cards = await page.locator("a[href*='/e/']").all()
-        event_links = []
-        for card in event_cards:
-            link = await card.get_attribute("href")
-            title = await card.inner_text()
-            if link and title.strip():
-                event_links.append({"title": title.strip(), "link": link})
-
-        print(f"Found {len(event_links)} events. Visiting each...")
-
-        results = []
-        for event in event_links[:10]:  # test first 10 events
-            print(f"Visiting: {event['link']}")
-            event_page = await browser.new_page()
-            await event_page.goto(event["link"], timeout=60000)
-
-            # Event title
-            title = await event_page.locator("h1").first.inner_text()
-
-            # --- Try to get date/time from visible span ---
-            date_time = None
+import browser_pool
+import http_cache
+from combiner import parse_datetime_efficiently
+from deadlines import Deadline, DeadlineExceeded, PartialResult, async_retry_with_backoff, hedged
+from events import EventRecord, SCRAPED
+from eventbrite_frontier import CrawlFrontier, DEFAULT_MAX_PAGES, STATE_FILE
+
+DEFAULT_DEADLINE_SECONDS = 120    # whole run
+DEFAULT_PAGE_BUDGET_SECONDS = 20  # one listing or event page
+HEDGE_AFTER_SECONDS = 8           # start a second attempt if a page is this slow
+PAGE_ATTEMPTS = 3                 # transient page failures are retried with backoff
+
+# Requests the scraper never needs: heavy assets and scripts from other hosts
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+FIRST_PARTY_HOST_SUFFIXES = ("eventbrite.com", "evbuc.com")
+DATE_SPAN_SELECTOR = ("#instance-selector .date-info [data-testid='display-date-container'] "
+                      "span.date-info__full-datetime")
+
+# One round-trip per page: title, visible date and the JSON-LD Event, parsed in the page
+EXTRACT_EVENT_JS = """
+(dateSelector) => {
+    const h1 = document.querySelector("h1");
+    const dateSpan = document.querySelector(dateSelector);
+    let event = null;
+    for (const script of document.querySelectorAll("script[type='application/ld+json']")) {
+        let data;
+        try { data = JSON.parse(script.textContent); } catch (e) { continue; }
+        for (const item of (Array.isArray(data) ? data : [data])) {
+            if (item && item.startDate) { event = item; break; }
+        }
+        if (event) break;
+    }
+    const location = (event && event.location) || {};
+    return {
+        title: h1 ? h1.innerText : null,
+        date_text: dateSpan ? dateSpan.innerText : null,
+        start: event ? event.startDate : null,
+        end: event ? event.endDate : null,
+        venue: location.name || null,
+        address: location.address || {},
+    };
+}
+"""
+
+EXTRACT_LISTING_JS = """
+(anchors) => anchors.map(a => ({link: a.getAttribute("href"), title: a.innerText}))
+"""
+
+
+async def _block_heavy_requests(route):
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    third_party = not host.endswith(FIRST_PARTY_HOST_SUFFIXES)
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or (third_party and request.resource_type == "script"):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_heavy_resources(page):
+    """Abort images, media, fonts and third-party scripts for everything this page loads"""
+    await page.route("**/*", _block_heavy_requests)
+
+
+def parse_event_json_ld(html):
+    """Return the schema.org Event object embedded in an event page, if any"""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except (TypeError, ValueError):
+            continue
+        for item in (data if isinstance(data, list) else [data]):
+            if isinstance(item, dict) and item.get("startDate"):
+                return soup, item
+    return soup, None
+
+
+def fetch_event_details(link, session=None, timeout=30):
+    """Fetch an event detail page through the shared HTTP cache and parse it without a browser.
+
+    Eventbrite renders the schema.org JSON-LD server-side, so a cached/304 HTTP
+    fetch is enough for most pages. Returns None when the page has no usable
+    data and Playwright should be used instead.
+    """
+    session = session or http_cache.get_shared_session()
+    try:
+        response = session.get(link, timeout=timeout)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"HTTP fetch failed for {link}: {e}")
+        return None
+
+    soup, data = parse_event_json_ld(response.content)
+    if not data:
+        return None
+
+    h1 = soup.find("h1")
+    title = h1.get_text().strip() if h1 else data.get("name")
+    start = data.get("startDate")
+    end = data.get("endDate")
+    location = data.get("location") or {}
+    return {
+        "title": title.strip() if title else None,
+        "link": link,
+        "date_time": f"{start} → {end}" if end else start,
+        "venue": location.get("name"),
+        "address": location.get("address", {})
+    }
+
+
+def to_event_record(record):
+    """EventRecord for one scraped Eventbrite record (None if its date can't be parsed)"""
+    start, end = parse_datetime_efficiently(record.get("date_time"))
+    if start is None or pd.isna(start):
+        return None
+    parts = [str(part) for part in (record.get("venue"), record.get("address"))
+             if part is not None and not (isinstance(part, float) and pd.isna(part)) and str(part).strip()]
+    link = record.get("link") or ""
+    return EventRecord(start, None if pd.isna(end) else end, record.get("title") or "Untitled Event", SCRAPED,
+                       description=link, location="- ".join(parts), url=link, source="eventbrite")
+
+
+def event_records(records):
+    """EventRecords for scraped Eventbrite records, skipping ones without a usable date"""
+    converted = (to_event_record(record) for record in records)
+    return [record for record in converted if record is not None]
+
+
+async def collect_listing_cards(page, url, timeout_ms=60000):
+    """Load one listing page and return its event cards as {title, link} dicts"""
+    await block_heavy_resources(page)
+    await page.goto(url, timeout=timeout_ms, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_selector("a[href*='/e/']", timeout=timeout_ms)
+    except Exception:
+        return []
+
+    # Get all event links in one evaluate instead of two round-trips per card
+    cards = await page.eval_on_selector_all("a[href*='/e/']", EXTRACT_LISTING_JS)
+    event_links = []
+    for card in cards:
+        link = card.get("link")
+        title = (card.get("title") or "").strip()
+        if link and title:
+            event_links.append({"title": title, "link": link})
+    return event_links
+
+
+async def listing_cards_in_context(context, url, timeout_ms=60000):
+    """collect_listing_cards on a fresh page of a pooled browser context"""
+    page = await context.new_page()
+    try:
+        return await collect_listing_cards(page, url, timeout_ms)
+    finally:
+        await page.close()
+
+
+async def scrape_event_page(browser, link, timeout_ms=60000):
+    """Render an event page in Playwright and extract its record (None if no date/time)
+
+    browser can be a Browser or a BrowserContext (as handed out by browser_pool).
+    """
+    event_page = await browser.new_page()
+    try:
+        await block_heavy_resources(event_page)
+        await event_page.goto(link, timeout=timeout_ms, wait_until="domcontentloaded")
+        fields = await event_page.evaluate(EXTRACT_EVENT_JS, DATE_SPAN_SELECTOR)
+
+        # Neither the date span nor JSON-LD rendered yet: give the span a moment, then re-read
+        if not fields.get("date_text") and not fields.get("start"):
             try:
-                date_time = await event_page.locator(
-                    "#instance-selector .date-info [data-testid='display-date-container'] span.date-info__full-datetime"
-                ).inner_text(timeout=5000)
-                date_time = date_time.strip()
-            except:
-                # --- Fallback: Use JSON-LD startDate / endDate ---
-                try:
-                    json_ld_handle = event_page.locator("script[type='application/ld+json']").first
-                    json_ld_text = await json_ld_handle.text_content()
-                    data = json.loads(json_ld_text)
-                    start = data.get("startDate")
-                    end = data.get("endDate")
-                    if start:
-                        date_time = f"{start} → {end}" if end else start
-                except:
-                    date_time = None
-
-            # Only keep events with a valid date_time
-            if date_time:
-                # Extract venue and address from JSON-LD
-                try:
-                    json_ld_handle = event_page.locator("script[type='application/ld+json']").first
-                    json_ld_text = await json_ld_handle.text_content()
-                    data = json.loads(json_ld_text)
-                    location = data.get("location", {}).get("name")
-                    address = data.get("location", {}).get("address", {})
-                except:
-                    location = None
-                    address = None
-
-                results.append({
-                    "title": title.strip() if title else None,
-                    "link": event["link"],
-                    "date_time": date_time,
-                    "venue": location,
-                    "address": address
-                })
-
-            await event_page.close()
-
-        await browser.close()
-        return results
+                await event_page.wait_for_selector(DATE_SPAN_SELECTOR, timeout=min(5000, timeout_ms))
+                fields = await event_page.evaluate(EXTRACT_EVENT_JS, DATE_SPAN_SELECTOR)
+            except Exception:
+                pass
+
+        # Prefer the visible date span, fall back to JSON-LD startDate / endDate
+        date_time = (fields.get("date_text") or "").strip() or None
+        if not date_time and fields.get("start"):
+            start, end = fields["start"], fields.get("end")
+            date_time = f"{start} → {end}" if end else start
+
+        # Only keep events with a valid date_time
+        if not date_time:
+            return None
+
+        title = fields.get("title")
+        return {
+            "title": title.strip() if title else None,
+            "link": link,
+            "date_time": date_time,
+            "venue": fields.get("venue"),
+            "address": fields.get("address")
+        }
+    finally:
+        await event_page.close()
+
+
+async def stream_events(searches=None, max_pages=DEFAULT_MAX_PAGES, max_events=10, state_path=STATE_FILE,
+                        deadline_seconds=DEFAULT_DEADLINE_SECONDS, page_budget_seconds=DEFAULT_PAGE_BUDGET_SECONDS,
+                        status=None, pool=None):
+    """Async generator version of run(): yields each event record as soon as it is available.
+
+    Unchanged events reuse their stored record and are yielded as soon as their
+    listing page is read; new or changed events are yielded as each page is
+    parsed. If a PartialResult is passed as status, its partial/reason fields
+    are set when the deadline cuts the crawl short.
+
+    Pages run on warm browsers leased from the process-wide browser_pool.
+    """
+    deadline = Deadline(deadline_seconds)
+    frontier = CrawlFrontier(searches, max_pages, state_path)
+    frontier.start()
+    partial_reason = ''
+    yielded = set()
+    pool = pool or browser_pool.get_playwright_pool()
+
+    def reusable():
+        # Records from earlier crawls for events that don't need a revisit
+        pending = set(frontier.event_queue)
+        for key in frontier.crawl_events:
+            record = frontier.known_events.get(key, {}).get('record')
+            if key not in yielded and key not in pending and record:
+                yielded.add(key)
+                yield record
+
+    for record in reusable():
+        yield record
+
+    while True:
+        next_listing = frontier.next_listing_url()
+        if next_listing is None:
+            break
+        if deadline.expired():
+            partial_reason = "deadline reached while reading listings"
+            break
+        listing, url = next_listing
+        print(f"Listing: {url}")
+
+        def load_listing():
+            budget = deadline.budget(page_budget_seconds)
+            return pool.run(lambda context: listing_cards_in_context(context, url, int(budget * 1000)))
+
+        try:
+            # Transient failures are retried with backoff, never past the run's deadline
+            cards = await async_retry_with_backoff(load_listing, deadline, attempts=PAGE_ATTEMPTS,
+                                                   per_attempt=page_budget_seconds)
+        except DeadlineExceeded:
+            partial_reason = "deadline reached while reading listings"
+            break
+        except Exception as e:
+            print(f"Error loading listing {url}: {e!r}")
+            cards = []
+        frontier.record_listing(listing, cards)
+        for record in reusable():
+            yield record
+
+    print(f"Found {len(frontier.crawl_events)} unique events, "
+          f"{len(frontier.event_queue)} new or changed. Visiting...")
+
+    visited = 0
+    while visited < max_events:
+        next_event = frontier.next_event()
+        if next_event is None:
+            break
+        if deadline.expired():
+            partial_reason = "deadline reached while visiting events"
+            break
+        key, link = next_event
+        visited += 1
+        print(f"Visiting: {link}")
+        budget = deadline.budget(page_budget_seconds)
+
+        # Cached HTTP fetch first (mostly cache hits / 304s on repeat runs)
+        details = await asyncio.to_thread(fetch_event_details, link, None, budget)
+        if details is None:
+            def render_event():
+                # A slow render gets a hedged second attempt; whichever finishes first wins
+                budget = deadline.budget(page_budget_seconds)
+                return hedged(
+                    lambda: pool.run(lambda context: scrape_event_page(context, link, int(budget * 1000))),
+                    hedge_after=min(HEDGE_AFTER_SECONDS, budget / 2),
+                    timeout=budget,
+                )
+
+            try:
+                # Failed renders are retried with backoff while the run's deadline allows
+                details = await async_retry_with_backoff(render_event, deadline, attempts=PAGE_ATTEMPTS,
+                                                         per_attempt=page_budget_seconds)
+            except DeadlineExceeded:
+                partial_reason = "deadline reached while visiting events"
+                break
+            except Exception as e:
+                print(f"Error visiting {link}: {e!r}")
+                frontier.skip_event(key)
+                continue
+        frontier.record_event(key, details)
+        if details:
+            yielded.add(key)
+            yield details
+
+    frontier.finish()
+    if partial_reason:
+        print(f"Returning partial Eventbrite results: {partial_reason} ({deadline.elapsed():.1f}s)")
+        if status is not None:
+            status.partial = True
+            status.reason = partial_reason
+
+
+async def run(searches=None, max_pages=DEFAULT_MAX_PAGES, max_events=10, state_path=STATE_FILE,
+              deadline_seconds=DEFAULT_DEADLINE_SECONDS, page_budget_seconds=DEFAULT_PAGE_BUDGET_SECONDS):
+    """Crawl Eventbrite listings for every (location, query) search and return event records.
+
+    The crawl frontier follows listing pagination, deduplicates events by ID and
+    persists its state, so only new or changed events are visited (at most
+    max_events per run; the rest are picked up by the next run).
+
+    The run stops at deadline_seconds and each page gets at most
+    page_budget_seconds; the returned PartialResult is marked partial when the
+    deadline cut the crawl short.
+    """
+    results = PartialResult()
+    async for record in stream_events(searches, max_pages, max_events, state_path,
+                                      deadline_seconds, page_budget_seconds, status=results):
+        results.append(record)
+    return results
 
 
 if __name__ == "__main__":
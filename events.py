@@ -0,0 +1,94 @@
+"""
+Shared event record
+===================
+One compact record type for everything the combiner consumes: Google Calendar
+events, Eventbrite events and GroupX class occurrences. Each scraper module
+converts its raw output into ``EventRecord``s with timestamps already parsed
+to UTC, so the combiner does not have to rename, stringify and re-parse
+columns per source.
+
+* ``EventRecord`` uses ``__slots__``: no per-instance dict, cheap to create and
+  to keep thousands of in memory.
+* Small inputs go through the combiner's pure-Python path
+  (``combiner.combine_records``) without building any DataFrame.
+* ``records_to_frame`` turns large inputs into the combiner's cleaned columnar
+  layout. It walks the records once to gather plain lists, then pandas copies
+  each list into its column; the records are not shared with the frame.
+"""
+
+from typing import Optional, Sequence
+
+import pandas as pd
+
+CALENDAR = 'calendar'
+SCRAPED = 'scraped'
+
+class EventRecord:
+    """A calendar event or scraped class/event with parsed UTC timestamps"""
+
+    __slots__ = ('start', 'end', 'title', 'kind', 'description', 'location', 'url', 'source')
+
+    def __init__(self, start: pd.Timestamp, end: Optional[pd.Timestamp], title: str, kind: str,
+                 description: str = '', location: str = '', url: str = '', source: str = ''):
+        self.start = start
+        self.end = end
+        self.title = title
+        self.kind = kind                  # CALENDAR or SCRAPED
+        self.description = description
+        self.location = location
+        self.url = url
+        self.source = source              # 'google', 'eventbrite', 'groupx', 'ics', ...
+
+    @property
+    def is_calendar(self) -> bool:
+        return self.kind == CALENDAR
+
+    def end_or_default(self) -> pd.Timestamp:
+        """End time, defaulting to one hour after start like the combiner's overlap check"""
+        return self.end if self.end is not None else self.start + pd.Timedelta(hours=1)
+
+    def __repr__(self) -> str:
+        return f"EventRecord({self.kind}, {self.title!r}, {self.start}, {self.end})"
+
+def to_utc(value) -> Optional[pd.Timestamp]:
+    """UTC timestamp from a string/datetime (naive values are taken as UTC), None if unparseable"""
+    if value is None or value is pd.NaT:
+        return None
+    ts = pd.to_datetime(value, errors='coerce')
+    if pd.isna(ts):
+        return None
+    return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+def is_record_list(value) -> bool:
+    """True for a list/tuple of EventRecords (an empty list counts)"""
+    return isinstance(value, (list, tuple)) and all(isinstance(item, EventRecord) for item in value)
+
+def records_to_frame(records: Sequence[EventRecord]) -> pd.DataFrame:
+    """Cleaned combiner frame (start, end, calendar_event/scraped_event, description, location, url)
+
+    All records must be of one kind, since the kind picks the title column.
+    """
+    kinds = {record.kind for record in records}
+    if len(kinds) > 1:
+        raise ValueError(f"records_to_frame needs records of one kind, got {sorted(kinds)}")
+    title_column = 'calendar_event' if CALENDAR in kinds else 'scraped_event'
+    if not records:
+        return pd.DataFrame(columns=['start', 'end', title_column, 'description', 'location', 'url'])
+
+    starts, ends, titles, descriptions, locations, urls = [], [], [], [], [], []
+    for record in records:
+        starts.append(record.start)
+        ends.append(record.end)
+        titles.append(record.title)
+        descriptions.append(record.description)
+        locations.append(record.location)
+        urls.append(record.url)
+
+    return pd.DataFrame({
+        'start': pd.to_datetime(starts, utc=True),
+        'end': pd.to_datetime(ends, utc=True),
+        title_column: titles,
+        'description': descriptions,
+        'location': locations,
+        'url': urls,
+    })
@@ -3,19 +3,32 @@
 import streamlit as st
 import pandas as pd
 import datetime as dt
-import os
+import re
+import time
 import json
 
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
+from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 
+from events import CALENDAR, EventRecord, to_utc
+
 # -------------------
 # CONFIG
 # -------------------
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 CREDENTIALS_FILE = "credentials.json"   # download this from Google Cloud Console
-TOKEN_FILE = "token.json"               # will be created after login
+
+# Tokens and calendar data live in each browser session's own state, never in a
+# shared file, so concurrent users never see each other's Google identity.
+SESSION_TOKEN_KEY = "google_token"
+SESSION_CALENDAR_KEY = "google_calendar_cache"
+CALENDAR_CACHE_TTL = 5 * 60             # seconds before a user's events are fetched again
+
+# All-day events ("2025-10-19") have no time of day and never block a class
+HAS_TIME = re.compile(r"T.*:")
+HAS_ZONE = re.compile(r"[-+]\d{2}:\d{2}|Z")
 
 # -------------------
 # AUTHENTICATION
@@ -23,9 +36,16 @@ TOKEN_FILE = "token.json"               # will be created after login
 def get_google_credentials():
     creds = None
 
-    # Load existing token if available
-    if os.path.exists(TOKEN_FILE):
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+    # Load this session's token if available, refreshing it when expired
+    token = st.session_state.get(SESSION_TOKEN_KEY)
+    if token:
+        creds = Credentials.from_authorized_user_info(json.loads(token), SCOPES)
+        if creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+                st.session_state[SESSION_TOKEN_KEY] = creds.to_json()
+            except Exception:
+                creds = None
 
     # If no valid creds yet, go through OAuth flow
     if not creds or not creds.valid:
@@ -43,9 +63,10 @@ def get_google_credentials():
             flow.fetch_token(code=code)
             creds = flow.credentials
 
-            # Save token to file (JSON is safer than pickle)
-            with open(TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
+            # Keep the token in this session only; a used code can't be exchanged twice
+            st.session_state[SESSION_TOKEN_KEY] = creds.to_json()
+            st.session_state.pop(SESSION_CALENDAR_KEY, None)
+            st.query_params.clear()
 
             # Refresh page so "Logged in" state shows immediately
             st.rerun()
@@ -56,7 +77,8 @@ def get_google_credentials():
 # -------------------
 # FETCH EVENTS
 # -------------------
-def get_calendar_events(creds):
+def fetch_event_rows(creds):
+    """One dict per event (Calendar, Summary, Start, End, Location, Description) across all calendars"""
     service = build("calendar", "v3", credentials=creds)
     now = dt.datetime.utcnow()
     now_iso = now.isoformat() + "Z"
@@ -93,6 +115,11 @@ def get_calendar_events(creds):
                 "Description": event.get("description", "")
             })
 
+    return all_events
+
+
+def get_calendar_events(creds):
+    all_events = fetch_event_rows(creds)
     if not all_events:
         st.write("No upcoming events found.")
         return pd.DataFrame()
@@ -100,18 +127,60 @@ def get_calendar_events(creds):
     return pd.DataFrame(all_events)
 
 
-# -------------------
-# STREAMLIT APP
-# -------------------
-st.title("📅 Google Calendar to DataFrame")
+def to_event_record(row):
+    """EventRecord for one event row (None for all-day or unparseable events)"""
+    start_text = str(row.get("Start") or "").strip()
+    if not (HAS_TIME.search(start_text) and HAS_ZONE.search(start_text)):
+        return None
+    start = to_utc(start_text)
+    if start is None:
+        return None
+    return EventRecord(start, to_utc(str(row.get("End") or "").strip() or None),
+                       str(row.get("Summary") or "").strip() or "Untitled Event", CALENDAR,
+                       description=str(row.get("Description") or "").strip(),
+                       location=str(row.get("Location") or "").strip(), source="google")
+
 
-creds = get_google_credentials()
+def calendar_records(rows):
+    """EventRecords for event rows (fetched, cached or imported), skipping all-day/unparseable ones"""
+    records = (to_event_record(row) for row in rows)
+    return [record for record in records if record is not None]
 
-if creds:
-    st.success("✅ Logged in with Google!")
+
+def get_calendar_records(creds):
+    """The next 14 days of events as EventRecords (no DataFrame round-trip)"""
+    return calendar_records(fetch_event_rows(creds))
+
+
+def get_calendar_events_cached(creds, ttl=CALENDAR_CACHE_TTL, force=False):
+    """This session's calendar events, re-fetched from Google at most every ttl seconds"""
+    cached = st.session_state.get(SESSION_CALENDAR_KEY)
+    if not force and cached is not None and time.time() - cached[0] < ttl:
+        return cached[1]
     df = get_calendar_events(creds)
-    if not df.empty:
-        st.dataframe(df)
-        st.download_button("⬇️ Download as CSV", df.to_csv(index=False), "calendar.csv")
-else:
-    st.info("Please log in with Google to continue.")
+    st.session_state[SESSION_CALENDAR_KEY] = (time.time(), df)
+    return df
+
+
+def logout():
+    """Forget this session's Google token and cached events"""
+    st.session_state.pop(SESSION_TOKEN_KEY, None)
+    st.session_state.pop(SESSION_CALENDAR_KEY, None)
+
+
+# -------------------
+# STREAMLIT APP
+# -------------------
+if __name__ == "__main__":
+    st.title("📅 Google Calendar to DataFrame")
+
+    creds = get_google_credentials()
+
+    if creds:
+        st.success("✅ Logged in with Google!")
+        df = get_calendar_events_cached(creds)
+        if not df.empty:
+            st.dataframe(df)
+            st.download_button("⬇️ Download as CSV", df.to_csv(index=False), "calendar.csv")
+    else:
+        st.info("Please log in with Google to continue.")
@@ -0,0 +1,165 @@
+"""
+Lazy weekly recurrence model for GroupX classes
+===============================================
+The GroupX scraper returns one row per weekly class slot (weekday, local
+start/end time, term bounds). Instead of expanding every slot into a row for
+every week of the term and throwing most of them away afterwards, each slot is
+parsed once into a ``WeeklyClassRule`` and occurrences are generated lazily,
+only inside the window that is actually being queried.
+
+``iter_class_occurrences`` is the generator API (occurrences come out in
+start-time order across all rules); ``occurrences_frame`` builds the same
+cleaned DataFrame shape the combiner uses.
+"""
+
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+LOCAL_TZ = ZoneInfo('US/Eastern')
+WEEKDAY_MAP = {'Mon': 0, 'Tue': 1, 'Wed': 2, 'Thu': 3, 'Fri': 4, 'Sat': 5, 'Sun': 6}
+ONE_WEEK = timedelta(days=7)
+
+# Scraper fields carried along with every occurrence
+PAYLOAD_FIELDS = ['class_name', 'class_description', 'registration_url', 'studio', 'campus_area']
+
+# ===========================
+# HELPER FUNCTIONS
+# ===========================
+
+def parse_local_time(value) -> Optional[time]:
+    """Parse '8:00am' / '12:45 pm' style strings once per rule"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    parsed = pd.to_datetime(f"2000-01-01 {str(value).strip()}", errors='coerce')
+    return None if pd.isna(parsed) else parsed.time()
+
+def parse_exception_dates(value) -> frozenset:
+    """Parse a ';'-separated list of YYYY-MM-DD dates on which a class is cancelled"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return frozenset()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        parts = value
+    else:
+        parts = str(value).split(';')
+    dates = set()
+    for part in parts:
+        parsed = pd.to_datetime(str(part).strip(), errors='coerce')
+        if pd.notna(parsed):
+            dates.add(parsed.date())
+    return frozenset(dates)
+
+def _to_utc_timestamp(value) -> Optional[pd.Timestamp]:
+    """Window bound as a UTC timestamp (naive values are taken as UTC)"""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+# ===========================
+# RECURRENCE RULE
+# ===========================
+
+class WeeklyClassRule:
+    """One GroupX class slot: weekly on `weekday`, local start/end, within the term"""
+
+    __slots__ = ('weekday', 'start_time', 'end_time', 'term_start', 'term_end',
+                 'exception_dates', 'payload')
+
+    def __init__(self, weekday: int, start_time: time, end_time: time,
+                 term_start: date, term_end: date,
+                 exception_dates: Iterable[date] = (), payload: Optional[Dict] = None):
+        self.weekday = weekday
+        self.start_time = start_time
+        self.end_time = end_time
+        self.term_start = term_start
+        self.term_end = term_end
+        self.exception_dates = frozenset(exception_dates)
+        self.payload = payload or {}
+
+    @classmethod
+    def from_row(cls, row: Dict) -> Optional['WeeklyClassRule']:
+        """Build a rule from one scraper record; None if it can't recur"""
+        term_start = pd.to_datetime(row.get('term_start_date'), errors='coerce')
+        term_end = pd.to_datetime(row.get('term_end_date'), errors='coerce')
+        weekday = WEEKDAY_MAP.get(row.get('weekday'))
+        start_time = parse_local_time(row.get('start_time_local'))
+        end_time = parse_local_time(row.get('end_time_local'))
+        if pd.isna(term_start) or pd.isna(term_end) or weekday is None or start_time is None or end_time is None:
+            return None
+
+        return cls(
+            weekday, start_time, end_time, term_start.date(), term_end.date(),
+            parse_exception_dates(row.get('exception_dates')),
+            {field: row.get(field) for field in PAYLOAD_FIELDS}
+        )
+
+    def first_date_on_or_after(self, day: date) -> date:
+        """First class date on or after `day`"""
+        return day + timedelta(days=(self.weekday - day.weekday()) % 7)
+
+    def occurrences(self, window_start: Optional[pd.Timestamp] = None,
+                    window_end: Optional[pd.Timestamp] = None) -> Iterator[Dict]:
+        """Lazily yield occurrences whose start falls in [window_start, window_end)"""
+        first_day = self.term_start
+        if window_start is not None:
+            # The local date can be one day behind the UTC date, so step back a day
+            first_day = max(first_day, window_start.tz_convert(LOCAL_TZ).date() - timedelta(days=1))
+        last_day = self.term_end
+        if window_end is not None:
+            last_day = min(last_day, window_end.tz_convert(LOCAL_TZ).date())
+
+        current = self.first_date_on_or_after(first_day)
+        while current <= last_day:
+            if current not in self.exception_dates:
+                start = pd.Timestamp(datetime.combine(current, self.start_time, LOCAL_TZ)).tz_convert('UTC')
+                if window_end is not None and start >= window_end:
+                    return
+                if window_start is None or start >= window_start:
+                    end = pd.Timestamp(datetime.combine(current, self.end_time, LOCAL_TZ)).tz_convert('UTC')
+                    occurrence = dict(self.payload)
+                    occurrence.update({
+                        'start': start,
+                        'end': end,
+                        'occurrence_date': current.strftime('%Y-%m-%d'),
+                    })
+                    yield occurrence
+            current += ONE_WEEK
+
+# ===========================
+# PUBLIC API
+# ===========================
+
+def rules_from_groupx_df(df: pd.DataFrame) -> List[WeeklyClassRule]:
+    """Parse scraper rows into recurrence rules (each time string is parsed once)"""
+    if df is None or df.empty:
+        return []
+    rules = []
+    for row in df.to_dict('records'):
+        rule = WeeklyClassRule.from_row(row)
+        if rule is not None:
+            rules.append(rule)
+    return rules
+
+def iter_class_occurrences(source: Union[pd.DataFrame, Iterable[WeeklyClassRule]],
+                           window_start=None, window_end=None) -> Iterator[Dict]:
+    """Yield occurrences from all rules in start-time order, only inside the window"""
+    rules = rules_from_groupx_df(source) if isinstance(source, pd.DataFrame) else list(source)
+    lo, hi = _to_utc_timestamp(window_start), _to_utc_timestamp(window_end)
+    streams = [rule.occurrences(lo, hi) for rule in rules]
+    # Each rule's stream is already ordered; merging keeps everything lazy
+    return heapq.merge(*streams, key=lambda occurrence: occurrence['start'])
+
+def occurrences_frame(source: Union[pd.DataFrame, Iterable[WeeklyClassRule]],
+                      window_start=None, window_end=None) -> pd.DataFrame:
+    """DataFrame of occurrences in the window (columns: start, end, occurrence_date + scraper fields)"""
+    return occurrences_to_frame(list(iter_class_occurrences(source, window_start, window_end)))
+
+def occurrences_to_frame(occurrences: List[Dict]) -> pd.DataFrame:
+    """DataFrame of already generated occurrences (same layout as occurrences_frame)"""
+    if not occurrences:
+        return pd.DataFrame(columns=['start', 'end', 'occurrence_date'] + PAYLOAD_FIELDS)
+    return pd.DataFrame(occurrences)
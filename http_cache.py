@@ -0,0 +1,309 @@
+"""
+Shared HTTP fetch layer
+=======================
+One pooled ``requests.Session`` for every scraper, with
+
+* an on-disk response cache that follows the HTTP caching rules scrapers care
+  about (RFC 9111): ``Cache-Control: max-age / no-store / no-cache``,
+  ``Expires``, ``Age``, the Last-Modified heuristic, a request's
+  ``Cache-Control: max-stale``, and revalidation with ``If-None-Match`` /
+  ``If-Modified-Since`` so unchanged pages come back as 304;
+* per-host rate limiting so repeated runs stay polite.
+
+Use ``get_shared_session()`` to get the process-wide instance.
+
+References:
+-----------
+1. RFC 9111 - HTTP Caching
+   https://www.rfc-editor.org/rfc/rfc9111
+2. Requests - Session objects and transport adapters
+   https://requests.readthedocs.io/en/latest/user/advanced/
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http')
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_MIN_INTERVAL = 1.0          # seconds between requests to the same host
+HOST_MIN_INTERVALS = {
+    'www.eventbrite.com': 1.5,
+    'athletics.cmu.edu': 1.0,
+    'cmu.dserec.com': 1.0,
+}
+HEURISTIC_FRACTION = 0.1            # RFC 9111 4.2.2: 10% of (Date - Last-Modified)
+HEURISTIC_MAX_SECONDS = 24 * 60 * 60
+CONDITIONAL_HEADERS = ('if-none-match', 'if-modified-since')
+# requests hands back decoded bodies, so these no longer describe what is stored
+DECODED_BODY_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+# ===========================
+# HELPER FUNCTIONS
+# ===========================
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into {directive: argument}"""
+    directives = {}
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '=' in part:
+            key, arg = part.split('=', 1)
+            directives[key.strip().lower()] = arg.strip().strip('"')
+        else:
+            directives[part.lower()] = None
+    return directives
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    """HTTP-date header to epoch seconds"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def freshness_lifetime(headers: Dict[str, str]) -> float:
+    """Seconds a stored response stays fresh (0 means always revalidate)"""
+    lowered = {k.lower(): v for k, v in headers.items()}
+    cc = parse_cache_control(lowered.get('cache-control'))
+    if 'no-cache' in cc:
+        return 0.0
+    if 'max-age' in cc:
+        try:
+            return max(float(cc['max-age']), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    date = _http_date(lowered.get('date'))
+    expires = _http_date(lowered.get('expires'))
+    if 'expires' in lowered:
+        # An invalid Expires (e.g. "0") means already expired
+        if expires is None or date is None:
+            return 0.0
+        return max(expires - date, 0.0)
+
+    last_modified = _http_date(lowered.get('last-modified'))
+    if last_modified is not None and date is not None:
+        return min(max(date - last_modified, 0.0) * HEURISTIC_FRACTION, HEURISTIC_MAX_SECONDS)
+    return 0.0
+
+def max_stale(request_headers: Dict[str, str], stored_headers: Dict[str, str]) -> float:
+    """Extra seconds of staleness the request accepts (RFC 9111 5.2.1.2), unless the response forbids it"""
+    request_cc = parse_cache_control({k.lower(): v for k, v in request_headers.items()}.get('cache-control'))
+    if 'max-stale' not in request_cc:
+        return 0.0
+    stored_cc = parse_cache_control({k.lower(): v for k, v in stored_headers.items()}.get('cache-control'))
+    if 'no-cache' in stored_cc or 'must-revalidate' in stored_cc:
+        return 0.0
+    if request_cc['max-stale'] is None:
+        return float('inf')
+    try:
+        return max(float(request_cc['max-stale']), 0.0)
+    except ValueError:
+        return 0.0
+
+def storable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Response headers minus those that only described the encoded body"""
+    return {k: v for k, v in headers.items() if k.lower() not in DECODED_BODY_HEADERS}
+
+def is_storable(status_code: int, headers: Dict[str, str]) -> bool:
+    """Only cache plain 200s that don't forbid storage"""
+    lowered = {k.lower(): v for k, v in headers.items()}
+    cc = parse_cache_control(lowered.get('cache-control'))
+    return status_code == 200 and 'no-store' not in cc
+
+# ===========================
+# RESPONSE WRAPPER
+# ===========================
+
+class CachedResponse:
+    """Minimal response object shared by fresh, revalidated and network responses"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 from_cache: bool = False, revalidated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+        self.revalidated = revalidated
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get('Content-Type', '')
+        if 'charset=' in content_type:
+            return content_type.split('charset=', 1)[1].split(';')[0].strip()
+        return 'utf-8'
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}", response=self)
+
+# ===========================
+# RATE LIMITER
+# ===========================
+
+class HostRateLimiter:
+    """Enforce a minimum interval between requests to the same host (thread-safe)"""
+
+    def __init__(self, default_interval: float = DEFAULT_MIN_INTERVAL,
+                 host_intervals: Optional[Dict[str, float]] = None):
+        self.default_interval = default_interval
+        self.host_intervals = dict(HOST_MIN_INTERVALS if host_intervals is None else host_intervals)
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        """Block until a request to host is allowed, then reserve the next slot"""
+        interval = self.host_intervals.get(host, self.default_interval)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# ===========================
+# CACHED SESSION
+# ===========================
+
+class CachedSession:
+    """Pooled requests session with an on-disk HTTP cache and per-host rate limiting"""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, pool_maxsize: int = 10,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        self.cache_dir = cache_dir
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def headers(self):
+        """Default headers of the underlying session (same as requests.Session.headers)"""
+        return self.session.headers
+
+    # ---------------------------
+    # Storage
+    # ---------------------------
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def _load(self, url: str) -> Optional[dict]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['content'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, url: str, headers: Dict[str, str], content: Optional[bytes], stored_at: float) -> None:
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        if content is not None:
+            with open(f"{body_path}.tmp", 'wb') as f:
+                f.write(content)
+            os.replace(f"{body_path}.tmp", body_path)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'headers': dict(headers), 'stored_at': stored_at}, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    # ---------------------------
+    # Requests
+    # ---------------------------
+
+    def _send(self, url: str, headers: Dict[str, str], timeout: float) -> requests.Response:
+        self.rate_limiter.wait(urlparse(url).netloc)
+        return self.session.get(url, headers=headers, timeout=timeout)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+            use_cache: bool = True):
+        """GET url, answering from cache while fresh and revalidating once stale"""
+        headers = dict(headers or {})
+
+        # Caller-driven conditional requests are passed straight through
+        if not use_cache or any(h.lower() in CONDITIONAL_HEADERS for h in headers):
+            return self._send(url, headers, timeout)
+
+        entry = self._load(url)
+        if entry is not None:
+            age = time.time() - entry['stored_at']
+            try:
+                age += float(entry['headers'].get('Age', 0))
+            except (TypeError, ValueError):
+                pass
+            if age < freshness_lifetime(entry['headers']) + max_stale(headers, entry['headers']):
+                self._count('hits')
+                return CachedResponse(url, 200, entry['headers'], entry['content'], from_cache=True)
+
+            validators = {k.lower(): v for k, v in entry['headers'].items()}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last-modified'):
+                headers['If-Modified-Since'] = validators['last-modified']
+
+        response = self._send(url, headers, timeout)
+
+        if response.status_code == 304 and entry is not None:
+            # Fold updated headers (new Date/Cache-Control) into the stored response
+            merged = dict(entry['headers'])
+            merged.update(storable_headers(response.headers))
+            self._store(url, merged, None, time.time())
+            self._count('revalidated')
+            return CachedResponse(url, 200, merged, entry['content'], from_cache=True, revalidated=True)
+
+        self._count('misses')
+        stored_headers = storable_headers(response.headers)
+        if is_storable(response.status_code, response.headers):
+            self._store(url, stored_headers, response.content, time.time())
+        return CachedResponse(response.url, response.status_code, stored_headers, response.content)
+
+    def close(self) -> None:
+        self.session.close()
+
+_shared_session: Optional[CachedSession] = None
+_shared_lock = threading.Lock()
+
+def get_shared_session() -> CachedSession:
+    """Process-wide CachedSession used by all scrapers"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = CachedSession()
+        return _shared_session
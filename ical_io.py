@@ -0,0 +1,440 @@
+"""
+Streaming iCalendar import / export
+===================================
+Offline alternative to the live Google Calendar API.
+
+``iter_ics_events`` reads an exported .ics file line by line and yields one
+row per event occurrence in the same ``Calendar/Summary/Start/End/Location/
+Description`` shape that ``google_calendar.get_calendar_events`` produces, so
+the result can go straight into ``combiner.clean_google_calendar_df``.
+Recurring events (RRULE/EXDATE/RECURRENCE-ID) are expanded with dateutil
+inside the requested window. Only the VEVENT currently being read is held in
+memory, so multi-year exports with tens of thousands of events stay bounded.
+
+``write_ics`` streams the combined schedule back out as an .ics calendar.
+
+References:
+-----------
+1. RFC 5545 - Internet Calendaring and Scheduling Core Object Specification
+   https://datatracker.ietf.org/doc/html/rfc5545
+2. dateutil.rrule - Used for recurrence rule expansion
+   https://dateutil.readthedocs.io/en/stable/rrule.html
+"""
+
+import hashlib
+import io
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from dateutil.rrule import rrulestr
+
+DEFAULT_TZ = 'US/Eastern'
+DEFAULT_EXPANSION = timedelta(days=365)   # open-ended RRULEs without a window_end
+GOOGLE_COLUMNS = ['Calendar', 'Summary', 'Start', 'End', 'Location', 'Description']
+MAX_LINE_OCTETS = 75
+
+_DURATION_PATTERN = re.compile(
+    r'^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+_TIME_RANGE_PATTERN = re.compile(
+    r'^(?P<start>\d{4}-\d{2}-\d{2} \d{2}:\d{2})'
+    r'(?: - (?P<end_date>\d{4}-\d{2}-\d{2} )?(?P<end_time>\d{2}:\d{2}))? ET$'
+)
+
+# ===========================
+# LOW-LEVEL PARSING
+# ===========================
+
+def _open_text(source) -> Tuple[io.TextIOBase, bool]:
+    """Return a text stream for a path or file object, and whether we opened it"""
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        return open(source, 'r', encoding='utf-8', errors='replace', newline=''), True
+    if isinstance(source, io.TextIOBase):
+        return source, False
+    # Binary file objects (e.g. Streamlit uploads)
+    return io.TextIOWrapper(source, encoding='utf-8', errors='replace', newline=''), False
+
+def iter_unfolded_lines(stream: Iterable[str]) -> Iterator[str]:
+    """Yield logical content lines, joining RFC 5545 folded continuation lines"""
+    pending = None
+    for raw in stream:
+        line = raw.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+def parse_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """Split 'NAME;PARAM=x:value' into (NAME, {PARAM: x}, value)"""
+    in_quotes = False
+    split_at = -1
+    for i, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ':' and not in_quotes:
+            split_at = i
+            break
+    if split_at < 0:
+        return line.upper(), {}, ''
+
+    head, value = line[:split_at], line[split_at + 1:]
+    parts = head.split(';')
+    params = {}
+    for part in parts[1:]:
+        if '=' in part:
+            key, val = part.split('=', 1)
+            params[key.upper()] = val.strip('"')
+    return parts[0].upper(), params, value
+
+def unescape_text(value: str) -> str:
+    """Undo RFC 5545 TEXT escaping"""
+    return re.sub(r'\\([\\;,nN])', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+def escape_text(value: str) -> str:
+    """Apply RFC 5545 TEXT escaping"""
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def resolve_tz(tzid: Optional[str], default_tz: str):
+    """Map a TZID parameter to a tzinfo, falling back to the default zone"""
+    if tzid:
+        try:
+            return ZoneInfo(tzid)
+        except Exception:
+            pass
+    return ZoneInfo(default_tz)
+
+def parse_ics_datetime(value: str, params: Dict[str, str], default_tz: str) -> Union[datetime, date, None]:
+    """Parse a DATE or DATE-TIME value; floating times are placed in default_tz"""
+    value = value.strip()
+    try:
+        if params.get('VALUE') == 'DATE' or len(value) == 8:
+            return datetime.strptime(value, '%Y%m%d').date()
+        if value.endswith('Z'):
+            return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc)
+        return datetime.strptime(value, '%Y%m%dT%H%M%S').replace(tzinfo=resolve_tz(params.get('TZID'), default_tz))
+    except ValueError:
+        return None
+
+def parse_duration(value: str) -> Optional[timedelta]:
+    """Parse an RFC 5545 DURATION such as PT1H30M or P1D"""
+    match = _DURATION_PATTERN.match(value.strip())
+    if not match:
+        return None
+    parts = {k: int(v) for k, v in match.groupdict().items() if v and k != 'sign'}
+    delta = timedelta(**parts)
+    return -delta if match.group('sign') == '-' else delta
+
+def format_google_style(value: Union[datetime, date, None]) -> str:
+    """Format like the Google API: ISO date-time with offset, or plain date for all-day events"""
+    if value is None:
+        return ''
+    return value.isoformat()
+
+# ===========================
+# EVENT EXPANSION
+# ===========================
+
+def _occurrence_key(uid: str, value: Union[datetime, date]) -> Tuple[str, str]:
+    """Comparable key for a (UID, occurrence start) pair"""
+    if isinstance(value, datetime):
+        return uid, value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    return uid, value.strftime('%Y%m%d')
+
+def scan_overrides(stream: Iterable[str], default_tz: str) -> set:
+    """First pass: collect (UID, RECURRENCE-ID) keys of modified recurring instances"""
+    overrides = set()
+    uid, recurrence_id = None, None
+    for line in iter_unfolded_lines(stream):
+        name, params, value = parse_content_line(line)
+        if name == 'BEGIN' and value.upper() == 'VEVENT':
+            uid, recurrence_id = None, None
+        elif name == 'UID':
+            uid = value
+        elif name == 'RECURRENCE-ID':
+            recurrence_id = parse_ics_datetime(value, params, default_tz)
+        elif name == 'END' and value.upper() == 'VEVENT' and uid and recurrence_id is not None:
+            overrides.add(_occurrence_key(uid, recurrence_id))
+    return overrides
+
+def _window_bounds(dtstart, window_start, window_end, default_tz):
+    """Window bounds matching the awareness of dtstart (dateutil refuses to mix them)"""
+    lo = pd.Timestamp(window_start) if window_start is not None else None
+    hi = pd.Timestamp(window_end) if window_end is not None else None
+    if hi is None:
+        base = pd.Timestamp.now(tz='UTC') if lo is None else lo
+        hi = base + DEFAULT_EXPANSION
+
+    def convert(ts):
+        if ts is None:
+            return None
+        if ts.tz is None:
+            ts = ts.tz_localize(default_tz)
+        if isinstance(dtstart, datetime) and dtstart.tzinfo is not None:
+            return ts.tz_convert('UTC').to_pydatetime()
+        return ts.tz_convert(default_tz).tz_localize(None).to_pydatetime()
+
+    return convert(lo), convert(hi)
+
+def expand_event(event: Dict, window_start=None, window_end=None,
+                 default_tz: str = DEFAULT_TZ, overrides: Optional[set] = None) -> Iterator[Tuple]:
+    """Yield (start, end) pairs for one parsed VEVENT, expanding RRULEs inside the window"""
+    dtstart = event.get('dtstart')
+    if dtstart is None:
+        return
+    duration = event.get('duration')
+    dtend = event.get('dtend')
+    if duration is None:
+        if dtend is not None:
+            duration = dtend - dtstart
+        else:
+            duration = timedelta(days=1) if not isinstance(dtstart, datetime) else timedelta(0)
+
+    rrule_text = event.get('rrule')
+    if not rrule_text:
+        occurrences = [dtstart]
+    else:
+        is_date = not isinstance(dtstart, datetime)
+        rule_start = datetime.combine(dtstart, datetime.min.time()) if is_date else dtstart
+        try:
+            rule = rrulestr(f"RRULE:{rrule_text}", dtstart=rule_start)
+        except (ValueError, TypeError):
+            occurrences = [dtstart]
+        else:
+            lo, hi = _window_bounds(rule_start, window_start, window_end, default_tz)
+            if lo is None:
+                lo = rule_start
+            # rrule.xafter/between are generators over the rule, so nothing is materialized up front
+            occurrences = (occ.date() if is_date else occ for occ in rule.xafter(lo - duration, inc=True))
+            occurrences = _take_until(occurrences, hi, is_date)
+
+    uid = event.get('uid', '')
+    exdates = {_occurrence_key(uid, value) for value in event.get('exdates', [])}
+    lo_ts = pd.Timestamp(window_start) if window_start is not None else None
+    hi_ts = pd.Timestamp(window_end) if window_end is not None else None
+
+    for start in occurrences:
+        key = _occurrence_key(uid, start)
+        if key in exdates:
+            continue
+        if rrule_text and overrides and key in overrides:
+            continue
+        end = start + duration
+        if not _in_window(start, end, lo_ts, hi_ts, default_tz):
+            continue
+        yield start, end
+
+def _take_until(occurrences: Iterator, hi, is_date: bool) -> Iterator:
+    """Stop a (possibly infinite) occurrence stream at the window end"""
+    for occ in occurrences:
+        compare = datetime.combine(occ, datetime.min.time()) if is_date else occ
+        if hi is not None and compare > hi:
+            return
+        yield occ
+
+def _in_window(start, end, lo: Optional[pd.Timestamp], hi: Optional[pd.Timestamp], default_tz: str) -> bool:
+    """True if the occurrence [start, end) overlaps [lo, hi)"""
+    if lo is None and hi is None:
+        return True
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    if start_ts.tz is None:
+        start_ts, end_ts = start_ts.tz_localize(default_tz), end_ts.tz_localize(default_tz)
+    if lo is not None and end_ts <= (lo if lo.tz is not None else lo.tz_localize(default_tz)):
+        return False
+    if hi is not None and start_ts >= (hi if hi.tz is not None else hi.tz_localize(default_tz)):
+        return False
+    return True
+
+# ===========================
+# PUBLIC API - IMPORT
+# ===========================
+
+def iter_ics_events(source, window_start=None, window_end=None,
+                    default_tz: str = DEFAULT_TZ, calendar_name: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """Stream Google-shaped event rows (one per occurrence) from an .ics path or file object"""
+    stream, owned = _open_text(source)
+    try:
+        overrides = set()
+        if stream.seekable():
+            overrides = scan_overrides(stream, default_tz)
+            stream.seek(0)
+
+        name = calendar_name
+        event = None
+        for line in iter_unfolded_lines(stream):
+            prop, params, value = parse_content_line(line)
+
+            if prop == 'X-WR-CALNAME' and calendar_name is None:
+                name = unescape_text(value)
+            elif prop == 'BEGIN' and value.upper() == 'VEVENT':
+                event = {'exdates': []}
+            elif event is None:
+                continue
+            elif event.get('_nested'):
+                # Nested components (VALARM) carry their own DESCRIPTION etc.; skip them
+                if prop == 'END' and value.upper() == event['_nested']:
+                    event.pop('_nested')
+            elif prop == 'END' and value.upper() == 'VEVENT':
+                # STATUS may come before or after DTSTART, so it is only honoured once the event is complete
+                occurrences = [] if event.get('cancelled') else expand_event(event, window_start, window_end,
+                                                                              default_tz, overrides)
+                for start, end in occurrences:
+                    yield {
+                        'Calendar': name or 'Imported Calendar',
+                        'Summary': event.get('summary', 'No Title'),
+                        'Start': format_google_style(start),
+                        'End': format_google_style(end),
+                        'Location': event.get('location', ''),
+                        'Description': event.get('description', ''),
+                    }
+                event = None
+            elif prop == 'BEGIN':
+                event['_nested'] = value.upper()
+            elif prop == 'UID':
+                event['uid'] = value
+            elif prop == 'SUMMARY':
+                event['summary'] = unescape_text(value)
+            elif prop == 'LOCATION':
+                event['location'] = unescape_text(value)
+            elif prop == 'DESCRIPTION':
+                event['description'] = unescape_text(value)
+            elif prop == 'DTSTART':
+                event['dtstart'] = parse_ics_datetime(value, params, default_tz)
+            elif prop == 'DTEND':
+                event['dtend'] = parse_ics_datetime(value, params, default_tz)
+            elif prop == 'DURATION':
+                event['duration'] = parse_duration(value)
+            elif prop == 'RRULE':
+                event['rrule'] = value
+            elif prop == 'EXDATE':
+                for part in value.split(','):
+                    parsed = parse_ics_datetime(part, params, default_tz)
+                    if parsed is not None:
+                        event['exdates'].append(parsed)
+            elif prop == 'STATUS' and value.upper() == 'CANCELLED':
+                event['cancelled'] = True
+    finally:
+        if owned:
+            stream.close()
+
+def read_ics(source, window_start=None, window_end=None, default_tz: str = DEFAULT_TZ,
+             calendar_name: Optional[str] = None) -> pd.DataFrame:
+    """Read an .ics export into the DataFrame shape clean_google_calendar_df expects"""
+    rows = list(iter_ics_events(source, window_start, window_end, default_tz, calendar_name))
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows, columns=GOOGLE_COLUMNS)
+
+# ===========================
+# PUBLIC API - EXPORT
+# ===========================
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + '\r\n'
+    chunks = []
+    current = ''
+    limit = MAX_LINE_OCTETS
+    for ch in line:
+        if len((current + ch).encode('utf-8')) > limit:
+            chunks.append(current)
+            current = ''
+            limit = MAX_LINE_OCTETS - 1   # continuation lines start with a space
+        current += ch
+    chunks.append(current)
+    return '\r\n '.join(chunks) + '\r\n'
+
+def parse_time_range_display(time_range: str) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Invert combiner.create_time_range_display back to UTC start/end timestamps"""
+    match = _TIME_RANGE_PATTERN.match(str(time_range).strip())
+    if not match:
+        return None, None
+    start = pd.Timestamp(match.group('start')).tz_localize('US/Eastern')
+    end = None
+    if match.group('end_time'):
+        end_date = (match.group('end_date') or match.group('start')[:11]).strip()
+        end = pd.Timestamp(f"{end_date} {match.group('end_time')}").tz_localize('US/Eastern')
+    return start.tz_convert('UTC'), (end.tz_convert('UTC') if end is not None else None)
+
+def _format_utc(ts: pd.Timestamp) -> str:
+    """Format a timestamp as an RFC 5545 UTC DATE-TIME"""
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+    return ts.strftime('%Y%m%dT%H%M%SZ')
+
+def _row_times(row: Dict) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Start/end from explicit columns when present, else from the time_range display string"""
+    start, end = row.get('start'), row.get('end')
+    if start is not None and not pd.isna(start):
+        return pd.Timestamp(start), (pd.Timestamp(end) if end is not None and not pd.isna(end) else None)
+    return parse_time_range_display(row.get('time_range', ''))
+
+def iter_ics_lines(rows: Iterable[Dict], calendar_name: str = 'Fit-Tartans Schedule') -> Iterator[str]:
+    """Yield folded .ics lines for schedule rows (combined output or any frame with start/end)"""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    yield fold_line('BEGIN:VCALENDAR')
+    yield fold_line('VERSION:2.0')
+    yield fold_line('PRODID:-//The Fit Tartans//Fitness Scheduler//EN')
+    yield fold_line('CALSCALE:GREGORIAN')
+    yield fold_line(f'X-WR-CALNAME:{escape_text(calendar_name)}')
+
+    for row in rows:
+        start, end = _row_times(row)
+        if start is None:
+            continue
+        summary = row.get('scraped_event') or row.get('calendar_event') or row.get('Summary') or 'Untitled Event'
+        if isinstance(summary, float) and pd.isna(summary):
+            summary = 'Untitled Event'
+        uid_source = f"{summary}|{_format_utc(start)}|{row.get('url', '')}"
+        uid = hashlib.sha1(uid_source.encode('utf-8')).hexdigest()
+
+        yield fold_line('BEGIN:VEVENT')
+        yield fold_line(f'UID:{uid}@fit-tartans')
+        yield fold_line(f'DTSTAMP:{stamp}')
+        yield fold_line(f'DTSTART:{_format_utc(start)}')
+        if end is not None:
+            yield fold_line(f'DTEND:{_format_utc(end)}')
+        yield fold_line(f'SUMMARY:{escape_text(str(summary))}')
+        for key, prop in (('location', 'LOCATION'), ('description', 'DESCRIPTION'), ('url', 'URL')):
+            value = row.get(key)
+            if value is not None and not (isinstance(value, float) and pd.isna(value)) and str(value).strip():
+                text = str(value).strip() if prop == 'URL' else escape_text(str(value).strip())
+                yield fold_line(f'{prop}:{text}')
+        yield fold_line('END:VEVENT')
+
+    yield fold_line('END:VCALENDAR')
+
+def write_ics(rows: Union[pd.DataFrame, Iterable[Dict]], dest, calendar_name: str = 'Fit-Tartans Schedule') -> None:
+    """Stream schedule rows to an .ics path or text file object"""
+    if isinstance(rows, pd.DataFrame):
+        rows = (record for record in _iter_frame_records(rows))
+    owned = isinstance(dest, (str, bytes)) or hasattr(dest, '__fspath__')
+    out = open(dest, 'w', encoding='utf-8', newline='') if owned else dest
+    try:
+        for line in iter_ics_lines(rows, calendar_name):
+            out.write(line)
+    finally:
+        if owned:
+            out.close()
+
+def _iter_frame_records(df: pd.DataFrame) -> Iterator[Dict]:
+    """Row dicts without materializing the whole frame as a list"""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, values))
+
+def schedule_to_ics_bytes(df: pd.DataFrame, calendar_name: str = 'Fit-Tartans Schedule') -> bytes:
+    """Render a schedule frame as .ics bytes (for st.download_button)"""
+    buffer = io.StringIO()
+    write_ics(df, buffer, calendar_name)
+    return buffer.getvalue().encode('utf-8')
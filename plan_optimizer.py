@@ -0,0 +1,203 @@
+"""
+Weekly workout plan optimizer
+=============================
+Searches combinations of candidate classes from ``standardize_and_combine``'s
+output for the best weekly plans, e.g. "3 classes, no two on consecutive days,
+at least one yoga, little travel between CUC and Tepper".
+
+Each candidate occurrence in the planning week is encoded as bitmasks:
+
+* ``slots`` - one bit per SLOT_MINUTES of the week (7 * 96 bits), so two classes
+  overlap iff ``a.slots & b.slots``
+* ``day``   - one bit per weekday, so "no consecutive days" is a shift-and-mask
+* ``types`` - one bit per required class type it satisfies
+
+The search is a depth-first branch-and-bound over candidates in start order:
+a branch is cut when it can no longer satisfy the required types, or when even
+the best remaining scores cannot beat the N-th best plan found so far. The
+search stops at its time budget and returns the best plans found, marked
+partial.
+"""
+
+import heapq
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from deadlines import Deadline, PartialResult
+from recommend import Preferences, keyword_score, parse_time_ranges, score_candidates
+
+SLOT_MINUTES = 15
+DAYS_PER_WEEK = 7
+DEFAULT_TIME_BUDGET_SECONDS = 2.0
+DEFAULT_PLANS = 3
+DEADLINE_CHECK_EVERY = 1024
+
+_AREA_IN_PARENS = re.compile(r'\(([^)]+)\)\s*$')
+
+# ===========================
+# PLAN SPEC
+# ===========================
+
+class PlanSpec:
+    """Constraints and objective for a weekly plan"""
+
+    def __init__(self, classes_per_week: int = 3, no_consecutive_days: bool = True,
+                 required_types: Sequence[str] = (), travel_weight: float = 1.0,
+                 buffer_minutes: int = 0):
+        self.classes_per_week = classes_per_week
+        self.no_consecutive_days = no_consecutive_days
+        self.required_types = [t.strip() for t in required_types if t and t.strip()]
+        self.travel_weight = travel_weight          # value lost per change of campus area between classes
+        self.buffer_minutes = buffer_minutes        # extra slots blocked after each class
+
+def location_area(location) -> str:
+    """Campus area of a location: 'Keeler (CUC)' -> 'CUC', otherwise the location itself"""
+    if not isinstance(location, str) or not location.strip():
+        return ''
+    match = _AREA_IN_PARENS.search(location)
+    return (match.group(1) if match else location).strip().lower()
+
+# ===========================
+# ENCODING
+# ===========================
+
+class _Candidate:
+    __slots__ = ('row', 'start', 'score', 'slots', 'day', 'types', 'area')
+
+    def __init__(self, row, start, score, slots, day, types, area):
+        self.row = row
+        self.start = start
+        self.score = score
+        self.slots = slots
+        self.day = day
+        self.types = types
+        self.area = area
+
+def encode_candidates(combined_df: pd.DataFrame, spec: PlanSpec, prefs: Optional[Preferences] = None,
+                      week_start: Optional[pd.Timestamp] = None) -> Tuple[List[_Candidate], pd.DataFrame]:
+    """Candidates inside the planning week, in start order, plus the scored frame they index into"""
+    scored = score_candidates(combined_df, prefs or Preferences())
+    if scored.empty:
+        return [], scored
+    start, end = parse_time_ranges(scored['time_range'])
+
+    if week_start is None:
+        week_start = start.min()
+    origin = pd.Timestamp(week_start).normalize()
+    week_end = origin + pd.Timedelta(days=DAYS_PER_WEEK)
+    in_week = ((start >= origin) & (end <= week_end)).to_numpy()
+
+    first_slot = ((start - origin) // pd.Timedelta(minutes=SLOT_MINUTES)).to_numpy()
+    length = np.ceil((end - start + pd.Timedelta(minutes=spec.buffer_minutes))
+                     / pd.Timedelta(minutes=SLOT_MINUTES)).to_numpy()
+    day = ((start - origin) // pd.Timedelta(days=1)).to_numpy()
+
+    type_bits = np.zeros(len(scored), dtype=np.int64)
+    for j, class_type in enumerate(spec.required_types):
+        type_bits |= keyword_score(scored['scraped_event'], [class_type]).astype(np.int64) << j
+
+    candidates = []
+    seen = set()
+    for i in np.flatnonzero(in_week):
+        key = (scored['scraped_event'].iat[i], first_slot[i], scored['location'].iat[i])
+        if key in seen:           # the same occurrence listed twice
+            continue
+        seen.add(key)
+        n_slots = max(int(length[i]), 1)
+        candidates.append(_Candidate(
+            row=i, start=int(first_slot[i]), score=float(scored['score'].iat[i]),
+            slots=((1 << n_slots) - 1) << int(first_slot[i]), day=1 << int(day[i]),
+            types=int(type_bits[i]), area=location_area(scored['location'].iat[i]),
+        ))
+    candidates.sort(key=lambda c: (c.start, -c.score))
+    return candidates, scored
+
+# ===========================
+# BRANCH AND BOUND
+# ===========================
+
+def search_plans(candidates: List[_Candidate], spec: PlanSpec, n_plans: int = DEFAULT_PLANS,
+                 time_budget: float = DEFAULT_TIME_BUDGET_SECONDS) -> PartialResult:
+    """Best n_plans plans as (value, [candidate indices]) pairs, best first"""
+    k = spec.classes_per_week
+    required = (1 << len(spec.required_types)) - 1
+    n = len(candidates)
+    deadline = Deadline(time_budget)
+    best = []            # min-heap of (value, tiebreak, picks)
+    counter = 0
+    nodes = 0
+    timed_out = False
+
+    # Suffix aggregates for pruning: best remaining scores and which types are still reachable
+    suffix_types = [0] * (n + 1)
+    suffix_top = [[] for _ in range(n + 1)]     # top-k scores from i onwards, descending
+    for i in range(n - 1, -1, -1):
+        suffix_types[i] = suffix_types[i + 1] | candidates[i].types
+        suffix_top[i] = heapq.nlargest(k, suffix_top[i + 1] + [candidates[i].score])
+
+    def record(value, picks):
+        nonlocal counter
+        counter += 1
+        entry = (value, -counter, list(picks))
+        if len(best) < n_plans:
+            heapq.heappush(best, entry)
+        elif value > best[0][0]:
+            heapq.heapreplace(best, entry)
+
+    def dfs(i, picks, value, used_slots, blocked_days, covered, last_area):
+        nonlocal nodes, timed_out
+        if len(picks) == k:
+            if covered & required == required:
+                record(value, picks)
+            return
+        remaining = k - len(picks)
+        for j in range(i, n):
+            nodes += 1
+            if nodes % DEADLINE_CHECK_EVERY == 0 and deadline.expired():
+                timed_out = True
+            if timed_out:
+                return
+            if n - j < remaining or (covered | suffix_types[j]) & required != required:
+                return
+            # Bound: even the best remaining scores can't beat the N-th best plan
+            if len(best) == n_plans and value + sum(suffix_top[j][:remaining]) <= best[0][0]:
+                return
+            c = candidates[j]
+            if c.slots & used_slots or c.day & blocked_days:
+                continue
+            travel = spec.travel_weight if last_area is not None and c.area != last_area else 0.0
+            day_block = c.day | (c.day << 1) | (c.day >> 1) if spec.no_consecutive_days else 0
+            picks.append(j)
+            dfs(j + 1, picks, value + c.score - travel, used_slots | c.slots,
+                blocked_days | day_block, covered | c.types, c.area)
+            picks.pop()
+
+    if k > 0:
+        dfs(0, [], 0.0, 0, 0, 0, None)
+
+    return PartialResult(sorted(((value, picks) for value, _, picks in best), key=lambda p: -p[0]),
+                         partial=timed_out,
+                         reason=f"time budget of {time_budget}s reached after {nodes} nodes" if timed_out else '')
+
+def best_plans(combined_df: pd.DataFrame, spec: PlanSpec, prefs: Optional[Preferences] = None,
+               n_plans: int = DEFAULT_PLANS, time_budget: float = DEFAULT_TIME_BUDGET_SECONDS,
+               week_start: Optional[pd.Timestamp] = None) -> PartialResult:
+    """Best weekly plans from standardize_and_combine output; each plan is a dict with its classes"""
+    candidates, scored = encode_candidates(combined_df, spec, prefs, week_start)
+    found = search_plans(candidates, spec, n_plans, time_budget)
+
+    plans = PartialResult(partial=found.partial, reason=found.reason)
+    for value, picks in found:
+        rows = [candidates[j].row for j in picks]
+        classes = scored.iloc[rows][['time_range', 'scraped_event', 'location', 'score', 'url']]
+        areas = [candidates[j].area for j in picks]
+        plans.append({
+            'value': value,
+            'score': float(classes['score'].sum()),
+            'area_changes': sum(a != b for a, b in zip(areas, areas[1:])),
+            'classes': classes.reset_index(drop=True),
+        })
+    return plans
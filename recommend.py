@@ -0,0 +1,150 @@
+"""
+Preference-weighted class recommendations
+=========================================
+Ranks the rows of ``standardize_and_combine``'s output against a user's
+preferences and returns the best K.
+
+Every scraped row gets a score in [0, sum of weights] from four vectorized
+components:
+
+* ``type``     - title matches one of the preferred class types (yoga, hiit, ...)
+* ``location`` - location matches a preferred campus area / studio (CUC, Tepper, ...)
+* ``time``     - start falls in a preferred time-of-day window, decaying with
+  distance outside it
+* ``gap``      - enough free time between the class ending and the next calendar
+  event that day
+
+Scores are computed with numpy over the whole frame; the top K are selected with
+``heapq.nlargest`` (O(n log K)), so hundreds of thousands of candidates rank
+interactively. Ties keep schedule order.
+"""
+
+import heapq
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_K = 10
+TIME_DECAY_MINUTES = 120       # a class this far outside a preferred window scores 0 on time
+NO_NEXT_EVENT_GAP = 24 * 60    # gap used when nothing else is on the calendar that day
+
+# "2025-10-19 08:00 - 08:45 ET" / "2025-10-19 23:00 - 2025-10-20 00:30 ET" / "2025-10-19 08:00 ET"
+_TIME_RANGE = re.compile(
+    r'^(?P<start>\d{4}-\d{2}-\d{2} \d{2}:\d{2})'
+    r'(?: - (?:(?P<end_date>\d{4}-\d{2}-\d{2}) )?(?P<end_time>\d{2}:\d{2}))? ET$'
+)
+
+# ===========================
+# PREFERENCES
+# ===========================
+
+class Preferences:
+    """What a user wants from a class, with a weight per component"""
+
+    def __init__(self, class_types: Iterable[str] = (), locations: Iterable[str] = (),
+                 time_windows: Sequence[Tuple[int, int]] = (), min_gap_minutes: int = 30,
+                 type_weight: float = 3.0, location_weight: float = 2.0,
+                 time_weight: float = 2.0, gap_weight: float = 1.0):
+        self.class_types = [t.strip() for t in class_types if t and t.strip()]
+        self.locations = [l.strip() for l in locations if l and l.strip()]
+        self.time_windows = [(int(a), int(b)) for a, b in time_windows]   # (start hour, end hour), local time
+        self.min_gap_minutes = min_gap_minutes
+        self.weights = {'type': type_weight, 'location': location_weight,
+                        'time': time_weight, 'gap': gap_weight}
+
+# ===========================
+# VECTORIZED COMPONENTS
+# ===========================
+
+def _factorized(values: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    """(codes, uniques): recurring classes repeat the same strings, so string work runs on uniques only"""
+    codes, uniques = pd.factorize(values.fillna('').astype(str))
+    return codes, pd.Series(uniques)
+
+def parse_time_ranges(time_range: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """(start, end) Eastern wall-clock timestamps from combiner time_range strings"""
+    codes, uniques = _factorized(time_range)
+    parts = uniques.str.extract(_TIME_RANGE)
+    start = pd.to_datetime(parts['start'], format='%Y-%m-%d %H:%M', errors='coerce')
+    end_date = parts['end_date'].fillna(parts['start'].str.slice(0, 10))
+    end = pd.to_datetime(end_date + ' ' + parts['end_time'], format='%Y-%m-%d %H:%M', errors='coerce')
+    end = end.fillna(start + pd.Timedelta(hours=1))
+    return (pd.Series(start.to_numpy()[codes], index=time_range.index),
+            pd.Series(end.to_numpy()[codes], index=time_range.index))
+
+def _keyword_pattern(keywords: List[str]) -> Optional[str]:
+    return '|'.join(re.escape(k) for k in keywords) if keywords else None
+
+def keyword_score(text: pd.Series, keywords: List[str]) -> np.ndarray:
+    """1.0 where text contains any keyword (case-insensitive), else 0.0; neutral 1.0 when no keywords"""
+    pattern = _keyword_pattern(keywords)
+    if pattern is None:
+        return np.ones(len(text))
+    codes, uniques = _factorized(text)
+    return uniques.str.contains(pattern, case=False, regex=True).to_numpy(dtype=float)[codes]
+
+def time_of_day_score(start: pd.Series, windows: List[Tuple[int, int]]) -> np.ndarray:
+    """1.0 inside a preferred window, decaying linearly to 0 TIME_DECAY_MINUTES outside it"""
+    if not windows:
+        return np.ones(len(start))
+    minutes = (start.dt.hour * 60 + start.dt.minute).to_numpy(dtype=float)
+    best = np.zeros(len(minutes))
+    for first_hour, last_hour in windows:
+        lo, hi = first_hour * 60, last_hour * 60
+        distance = np.maximum(np.maximum(lo - minutes, minutes - hi), 0)
+        best = np.maximum(best, np.clip(1 - distance / TIME_DECAY_MINUTES, 0, 1))
+    return np.nan_to_num(best)
+
+def gap_minutes(end: pd.Series, calendar_starts: pd.Series) -> np.ndarray:
+    """Minutes from each end to the next calendar event starting that same day"""
+    ends = end.to_numpy(dtype='datetime64[m]')
+    cal = np.sort(calendar_starts.dropna().to_numpy(dtype='datetime64[m]'))
+    gaps = np.full(len(ends), float(NO_NEXT_EVENT_GAP))
+    if len(cal) == 0 or len(ends) == 0:
+        return gaps
+    nxt = np.searchsorted(cal, ends, side='left')
+    has_next = nxt < len(cal)
+    next_start = cal[np.minimum(nxt, len(cal) - 1)]
+    same_day = has_next & (next_start.astype('datetime64[D]') == ends.astype('datetime64[D]'))
+    gaps[same_day] = (next_start[same_day] - ends[same_day]).astype(float)
+    return gaps
+
+def score_candidates(combined_df: pd.DataFrame, prefs: Preferences) -> pd.DataFrame:
+    """Scraped rows of combined_df with per-component and total 'score' columns"""
+    is_calendar = combined_df['calendar_event'].notna()
+    start, end = parse_time_ranges(combined_df['time_range'])
+    candidates = combined_df[~is_calendar & start.notna()].copy()
+    cand_start, cand_end = start[candidates.index], end[candidates.index]
+
+    components = {
+        'type': keyword_score(candidates['scraped_event'], prefs.class_types),
+        'location': keyword_score(candidates['location'], prefs.locations),
+        'time': time_of_day_score(cand_start, prefs.time_windows),
+        'gap': np.clip(gap_minutes(cand_end, start[is_calendar]) / max(prefs.min_gap_minutes, 1), 0, 1),
+    }
+    total = np.zeros(len(candidates))
+    for name, values in components.items():
+        candidates[f'score_{name}'] = values
+        total += prefs.weights[name] * values
+    candidates['score'] = total
+    return candidates
+
+# ===========================
+# TOP-K
+# ===========================
+
+def top_k(scored: pd.DataFrame, k: int = DEFAULT_K) -> pd.DataFrame:
+    """Best k rows by score (heap selection; ties keep schedule order)"""
+    if scored.empty or k <= 0:
+        return scored.iloc[0:0]
+    scores = scored['score'].tolist()
+    best = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+    return scored.iloc[best]
+
+def recommend(combined_df: pd.DataFrame, prefs: Preferences, k: int = DEFAULT_K) -> pd.DataFrame:
+    """Top k scraped classes/events for prefs from standardize_and_combine output"""
+    if combined_df is None or combined_df.empty:
+        return pd.DataFrame(columns=list(combined_df.columns if combined_df is not None else []) + ['score'])
+    return top_k(score_candidates(combined_df, prefs), k).reset_index(drop=True)
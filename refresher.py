@@ -0,0 +1,137 @@
+"""
+Background schedule refresher
+=============================
+Headless entry point that scrapes GroupX and Eventbrite ahead of time and
+publishes versioned snapshots (see ``snapshots.py``), so the Streamlit app can
+show data instantly instead of scraping inside a button handler. Every scrape
+is also archived in the schedule history (``schedule_warehouse.py``).
+
+Run once (e.g. from cron or a systemd timer); the sources are scraped back to
+back without waiting in between::
+
+    python refresher.py --once
+
+or as a long-running process::
+
+    python refresher.py --groupx-interval 360 --eventbrite-interval 120 --stagger 15
+
+Intervals and the stagger are in minutes. The sources never scrape at the same
+moment: Eventbrite starts ``--stagger`` minutes after GroupX, and each source is
+rescheduled relative to when its own run finished, so a slow scrape pushes its
+next run back instead of piling up.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import schedule_warehouse
+import snapshots
+
+DEFAULT_GROUPX_INTERVAL_MINUTES = 6 * 60     # class schedule changes rarely
+DEFAULT_EVENTBRITE_INTERVAL_MINUTES = 2 * 60
+DEFAULT_STAGGER_MINUTES = 15
+
+# ===========================
+# SCRAPE JOBS
+# ===========================
+
+def scrape_groupx():
+    """Run the GroupX scraper headless; returns its PartialResult"""
+    import cmu_scraper
+    scraper = cmu_scraper.CMUGroupXSeleniumScraper(headless=True, low_footprint=True)
+    try:
+        return scraper.scrape_schedule_data(interactive=False)
+    finally:
+        scraper.close_driver()
+
+def scrape_eventbrite():
+    """Run the Eventbrite crawl; returns its PartialResult"""
+    import eventbrite_scraper
+    return asyncio.run(eventbrite_scraper.run())
+
+JOBS: Dict[str, Callable] = {
+    'groupx': scrape_groupx,
+    'eventbrite': scrape_eventbrite,
+}
+
+def refresh(source: str, root: str = snapshots.SNAPSHOT_DIR) -> Optional[Dict]:
+    """Scrape one source and publish a snapshot; keeps the previous snapshot on failure or empty results"""
+    started = time.monotonic()
+    print(f"Refreshing {source}...")
+    try:
+        records = JOBS[source]()
+    except Exception as e:
+        print(f"{source} refresh failed: {e}")
+        return None
+    if not records:
+        print(f"{source} refresh returned no records; keeping previous snapshot")
+        return None
+    entry = snapshots.publish(source, pd.DataFrame(records),
+                              partial=getattr(records, 'partial', False),
+                              reason=getattr(records, 'reason', ''), root=root)
+    schedule_warehouse.archive_scrape(source, records)
+    print(f"{source} refreshed in {time.monotonic() - started:.1f}s")
+    return entry
+
+# ===========================
+# SCHEDULER
+# ===========================
+
+def run_forever(intervals: Dict[str, float], stagger: float, root: str = snapshots.SNAPSHOT_DIR,
+                skip_fresh: bool = True) -> None:
+    """Refresh each source on its own cadence (seconds), staggered so scrapes never overlap"""
+    now = time.time()
+    next_due = {}
+    for i, source in enumerate(intervals):
+        due = now + i * stagger
+        entry = snapshots.latest(source, root) if skip_fresh else None
+        if entry is not None:
+            # A restart shouldn't rescrape data that is still fresh
+            due = max(due, entry['published_at'] + intervals[source])
+        next_due[source] = due
+
+    while True:
+        source = min(next_due, key=next_due.get)
+        wait = next_due[source] - time.time()
+        if wait > 0:
+            print(f"Next refresh: {source} in {wait / 60:.1f} min")
+            time.sleep(wait)
+        refresh(source, root)
+
+        finished = time.time()
+        next_due[source] = finished + intervals[source]
+        # Keep the other sources at least `stagger` apart from this run
+        for other in next_due:
+            if other != source and next_due[other] < finished + stagger:
+                next_due[other] = finished + stagger
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pre-scrape GroupX and Eventbrite into versioned snapshots")
+    parser.add_argument('--once', action='store_true', help="refresh every source once and exit")
+    parser.add_argument('--sources', nargs='+', choices=sorted(JOBS), default=list(JOBS))
+    parser.add_argument('--groupx-interval', type=float, default=DEFAULT_GROUPX_INTERVAL_MINUTES)
+    parser.add_argument('--eventbrite-interval', type=float, default=DEFAULT_EVENTBRITE_INTERVAL_MINUTES)
+    parser.add_argument('--stagger', type=float, default=DEFAULT_STAGGER_MINUTES,
+                        help="minutes between sources' scrapes (ignored with --once)")
+    parser.add_argument('--snapshot-dir', default=snapshots.SNAPSHOT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.once:
+        # Sources already run one after another; no need to wait between them
+        for source in args.sources:
+            refresh(source, args.snapshot_dir)
+        return
+
+    minutes = {'groupx': args.groupx_interval, 'eventbrite': args.eventbrite_interval}
+    intervals = {source: minutes[source] * 60 for source in args.sources}
+    try:
+        run_forever(intervals, args.stagger * 60, args.snapshot_dir)
+    except KeyboardInterrupt:
+        print("Refresher stopped")
+
+if __name__ == "__main__":
+    main()
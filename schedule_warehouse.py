@@ -0,0 +1,358 @@
+"""
+Historical schedule warehouse
+=============================
+Every GroupX / Eventbrite scrape is archived in a local SQLite database, so
+class offerings can be analyzed across terms ("when is spin most often
+offered?", "which studios are busiest?") long after ``cmu_groupx_classes.csv``
+and the snapshots have been overwritten or pruned.
+
+Tables (under ``.cache/schedule_history.sqlite3``, or ``$SCHEDULE_HISTORY_DB``)::
+
+    scrapes      one row per archived scrape: source, scraped_at, rows, partial
+    occurrences  one row per distinct occurrence ever seen (source, class, start,
+                 location), tagged with its term and first/last scrape
+    sightings    (scrape_id, occurrence_id): which scrape saw which occurrence
+    class_keys / locations
+                 every distinct class / location, for substring lookups
+
+Nothing is ever deleted: a class dropped from a later scrape keeps its row and
+its sightings, so any past scrape can be reconstructed. GroupX classes are
+expanded over their whole term before archiving.
+
+Start times are stored as UTC epoch seconds, plus the Eastern weekday / start
+time for "when" aggregates. ``occurrences`` is indexed on start time, class
+name and location, so range and aggregate queries run in SQL in milliseconds
+without loading anything into pandas. A class or location filter ('spin')
+is first matched against the small lookup tables, and the matching keys are
+then read through the indexes instead of scanning every occurrence.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from combiner import parse_datetime_efficiently
+from dedup import normalize_title
+from groupx_recurrence import LOCAL_TZ, WeeklyClassRule
+
+WAREHOUSE_PATH = (os.environ.get('SCHEDULE_HISTORY_DB')
+                  or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'schedule_history.sqlite3'))
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrapes (
+    scrape_id   INTEGER PRIMARY KEY,
+    source      TEXT NOT NULL,
+    scraped_at  REAL NOT NULL,
+    rows        INTEGER NOT NULL,
+    partial     INTEGER NOT NULL DEFAULT 0,
+    reason      TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    occurrence_id    INTEGER PRIMARY KEY,
+    source           TEXT NOT NULL,
+    class_key        TEXT NOT NULL,
+    class_name       TEXT NOT NULL,
+    start_utc        INTEGER NOT NULL,
+    end_utc          INTEGER,
+    weekday          INTEGER NOT NULL,
+    start_local      TEXT NOT NULL,
+    location         TEXT NOT NULL DEFAULT '',
+    campus_area      TEXT NOT NULL DEFAULT '',
+    term_name        TEXT NOT NULL DEFAULT '',
+    url              TEXT NOT NULL DEFAULT '',
+    first_scrape_id  INTEGER NOT NULL REFERENCES scrapes(scrape_id),
+    last_scrape_id   INTEGER NOT NULL REFERENCES scrapes(scrape_id),
+    UNIQUE (source, class_key, start_utc, location)
+);
+CREATE INDEX IF NOT EXISTS idx_occurrences_start ON occurrences (start_utc);
+CREATE INDEX IF NOT EXISTS idx_occurrences_class ON occurrences (class_key, start_utc);
+CREATE INDEX IF NOT EXISTS idx_occurrences_location ON occurrences (location, start_utc);
+CREATE INDEX IF NOT EXISTS idx_occurrences_term ON occurrences (term_name);
+CREATE TABLE IF NOT EXISTS sightings (
+    scrape_id      INTEGER NOT NULL REFERENCES scrapes(scrape_id),
+    occurrence_id  INTEGER NOT NULL REFERENCES occurrences(occurrence_id),
+    PRIMARY KEY (scrape_id, occurrence_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS class_keys (class_key TEXT PRIMARY KEY) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS locations (location TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+_KEY_COLUMNS = ('source', 'class_key', 'start_utc', 'location')
+_OCCURRENCE_COLUMNS = ('source', 'class_key', 'class_name', 'start_utc', 'end_utc', 'weekday',
+                       'start_local', 'location', 'campus_area', 'term_name', 'url')
+
+# ===========================
+# ROW CONVERSION
+# ===========================
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+def _epoch(ts: Optional[pd.Timestamp]) -> Optional[int]:
+    return None if ts is None or pd.isna(ts) else int(ts.timestamp())
+
+def _occurrence_row(source: str, class_name: str, start: pd.Timestamp, end: Optional[pd.Timestamp],
+                    location: str = '', campus_area: str = '', term_name: str = '', url: str = '') -> Dict:
+    local = start.tz_convert(LOCAL_TZ)
+    return {
+        'source': source,
+        'class_key': normalize_title(class_name),
+        'class_name': class_name,
+        'start_utc': _epoch(start),
+        'end_utc': _epoch(end),
+        'weekday': local.weekday(),
+        'start_local': local.strftime('%H:%M'),
+        'location': location,
+        'campus_area': campus_area,
+        'term_name': term_name,
+        'url': url,
+    }
+
+def groupx_occurrence_rows(classes_data: Iterable[Dict]) -> List[Dict]:
+    """One row per class occurrence over each class's whole term"""
+    rows = []
+    for record in classes_data:
+        rule = WeeklyClassRule.from_row(record)
+        if rule is None:
+            continue
+        term_name = _text(record.get('term_name'))
+        for occurrence in rule.occurrences():
+            rows.append(_occurrence_row(
+                'groupx', _text(occurrence.get('class_name')) or 'Untitled Class',
+                occurrence['start'], occurrence['end'],
+                location=_text(occurrence.get('studio')), campus_area=_text(occurrence.get('campus_area')),
+                term_name=term_name, url=_text(occurrence.get('registration_url')),
+            ))
+    return rows
+
+def eventbrite_occurrence_rows(records: Iterable[Dict]) -> List[Dict]:
+    """One row per Eventbrite event with a parseable date"""
+    rows = []
+    for record in records:
+        start, end = parse_datetime_efficiently(record.get('date_time'))
+        if start is None or pd.isna(start):
+            continue
+        rows.append(_occurrence_row(
+            'eventbrite', _text(record.get('title')) or 'Untitled Event', start, end,
+            location=_text(record.get('venue')), url=_text(record.get('link')),
+        ))
+    return rows
+
+OCCURRENCE_ROWS = {
+    'groupx': groupx_occurrence_rows,
+    'eventbrite': eventbrite_occurrence_rows,
+}
+
+# ===========================
+# WAREHOUSE
+# ===========================
+
+class ScheduleWarehouse:
+    """Append-only SQLite archive of scraped occurrences with indexed range/aggregate queries"""
+
+    def __init__(self, path: str = WAREHOUSE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # timeout: wait for another process's archive instead of failing with 'database is locked'
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets the app read while the refresher archives
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            self._fill_lookups('occurrences')
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'ScheduleWarehouse':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def archive(self, source: str, records: Iterable[Dict], partial: bool = False, reason: str = '',
+                scraped_at: Optional[float] = None) -> int:
+        """Archive one scrape of source; returns its scrape_id"""
+        if source not in OCCURRENCE_ROWS:
+            raise ValueError(f"Unknown warehouse source '{source}', expected one of {tuple(OCCURRENCE_ROWS)}")
+        records = list(records)
+        rows = OCCURRENCE_ROWS[source](records)
+        scraped_at = time.time() if scraped_at is None else scraped_at
+
+        with self.conn:
+            scrape_id = self.conn.execute(
+                'INSERT INTO scrapes (source, scraped_at, rows, partial, reason) VALUES (?, ?, ?, ?, ?)',
+                (source, scraped_at, len(records), int(bool(partial)), reason or ''),
+            ).lastrowid
+            self.conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS staging ({', '.join(_OCCURRENCE_COLUMNS)})")
+            self.conn.execute('DELETE FROM staging')
+            placeholders = ', '.join(f':{column}' for column in _OCCURRENCE_COLUMNS)
+            self.conn.executemany(f"INSERT INTO staging VALUES ({placeholders})", rows)
+
+            # New occurrences get a row; known ones only move their last_scrape_id
+            columns = ', '.join(_OCCURRENCE_COLUMNS)
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO occurrences ({columns}, first_scrape_id, last_scrape_id) "
+                f"SELECT {columns}, ?, ? FROM staging",
+                (scrape_id, scrape_id),
+            )
+            join = ' AND '.join(f"o.{column} = s.{column}" for column in _KEY_COLUMNS)
+            self.conn.execute(
+                f"UPDATE occurrences SET last_scrape_id = ? WHERE occurrence_id IN "
+                f"(SELECT o.occurrence_id FROM staging s JOIN occurrences o ON {join})",
+                (scrape_id,),
+            )
+            self.conn.execute(
+                f"INSERT OR IGNORE INTO sightings (scrape_id, occurrence_id) "
+                f"SELECT ?, o.occurrence_id FROM staging s JOIN occurrences o ON {join}",
+                (scrape_id,),
+            )
+            self._fill_lookups('staging')
+            self.conn.execute('DELETE FROM staging')
+        print(f"Archived {source} scrape {scrape_id} ({len(rows)} occurrences)")
+        return scrape_id
+
+    def _fill_lookups(self, table: str) -> None:
+        """Add new class keys / locations from table (occurrences only for databases without lookups yet)"""
+        for column, lookup in (('class_key', 'class_keys'), ('location', 'locations')):
+            if table == 'occurrences' and self.conn.execute(f"SELECT 1 FROM {lookup} LIMIT 1").fetchone():
+                continue
+            self.conn.execute(f"INSERT OR IGNORE INTO {lookup} SELECT DISTINCT {column} FROM {table}")
+
+    @staticmethod
+    def _filters(start=None, end=None, class_name: Optional[str] = None, location: Optional[str] = None,
+                 source: Optional[str] = None, term_name: Optional[str] = None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('start_utc >= ?')
+            params.append(_epoch(_as_utc(start)))
+        if end is not None:
+            clauses.append('start_utc < ?')
+            params.append(_epoch(_as_utc(end)))
+        if class_name:
+            # Substring match on the normalized title ('spin' matches 'Spin Express'), run on
+            # the lookup table; the IN list then uses idx_occurrences_class
+            clauses.append('class_key IN (SELECT class_key FROM class_keys WHERE class_key LIKE ?)')
+            params.append(f"%{normalize_title(class_name)}%")
+        if location:
+            clauses.append('location IN (SELECT location FROM locations WHERE location LIKE ?)')
+            params.append(f"%{location}%")
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if term_name:
+            clauses.append('term_name = ?')
+            params.append(term_name)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def occurrences_between(self, start, end, class_name: Optional[str] = None,
+                            location: Optional[str] = None, source: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[Dict]:
+        """Occurrences starting in [start, end), in start order"""
+        where, params = self._filters(start, end, class_name, location, source)
+        sql = (f"SELECT source, class_name, start_utc, end_utc, weekday, start_local, location, "
+               f"campus_area, term_name, url FROM occurrences{where} ORDER BY start_utc")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def popular_times(self, class_name: Optional[str] = None, start=None, end=None,
+                      limit: int = 10) -> List[Dict]:
+        """Most common (weekday, local start time) slots, e.g. when spin is most often offered"""
+        where, params = self._filters(start, end, class_name)
+        sql = (f"SELECT weekday, start_local, COUNT(*) AS occurrences, COUNT(DISTINCT term_name) AS terms "
+               f"FROM occurrences{where} GROUP BY weekday, start_local "
+               f"ORDER BY occurrences DESC, weekday, start_local LIMIT ?")
+        return [{**dict(row), 'weekday': WEEKDAY_NAMES[row['weekday']]}
+                for row in self.conn.execute(sql, params + [limit])]
+
+    def busiest_studios(self, start=None, end=None, source: Optional[str] = 'groupx',
+                        limit: int = 10) -> List[Dict]:
+        """Locations with the most occurrences (and class hours) in the range"""
+        where, params = self._filters(start, end, source=source)
+        sql = (f"SELECT location, COUNT(*) AS occurrences, "
+               f"ROUND(SUM(COALESCE(end_utc - start_utc, 3600)) / 3600.0, 1) AS hours, "
+               f"COUNT(DISTINCT class_key) AS classes "
+               f"FROM occurrences{where} GROUP BY location ORDER BY occurrences DESC LIMIT ?")
+        return [dict(row) for row in self.conn.execute(sql, params + [limit])]
+
+    def offerings_by_term(self, class_name: Optional[str] = None) -> List[Dict]:
+        """Occurrence counts per term (optionally for one class), oldest term first"""
+        where, params = self._filters(class_name=class_name, source='groupx')
+        sql = (f"SELECT term_name, COUNT(*) AS occurrences, MIN(start_utc) AS first_start, "
+               f"COUNT(DISTINCT class_key) AS classes FROM occurrences{where} "
+               f"GROUP BY term_name ORDER BY first_start")
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def scrape_occurrences(self, scrape_id: int) -> List[Dict]:
+        """Everything one past scrape saw, in start order"""
+        sql = ("SELECT o.source, o.class_name, o.start_utc, o.end_utc, o.location, o.term_name, o.url "
+               "FROM sightings s JOIN occurrences o ON o.occurrence_id = s.occurrence_id "
+               "WHERE s.scrape_id = ? ORDER BY o.start_utc")
+        return [dict(row) for row in self.conn.execute(sql, (scrape_id,))]
+
+    def scrapes(self, source: Optional[str] = None) -> List[Dict]:
+        """Archived scrapes, newest first"""
+        where, params = self._filters(source=source)
+        sql = f"SELECT * FROM scrapes{where} ORDER BY scraped_at DESC"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+def _as_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(LOCAL_TZ).tz_convert('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+def archive_scrape(source: str, records, path: str = WAREHOUSE_PATH) -> Optional[int]:
+    """Archive a scrape (a scraper's PartialResult or list of dicts); never raises, returns scrape_id or None"""
+    try:
+        with ScheduleWarehouse(path) as warehouse:
+            return warehouse.archive(source, records, partial=getattr(records, 'partial', False),
+                                     reason=getattr(records, 'reason', ''))
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Could not archive {source} scrape: {e}")
+        return None
+
+# ===========================
+# COMMAND LINE
+# ===========================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Archive scrapes and query the schedule history")
+    parser.add_argument('--db', default=WAREHOUSE_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    archive = commands.add_parser('import', help="archive a scraper CSV (e.g. cmu_groupx_classes.csv)")
+    archive.add_argument('csv')
+    archive.add_argument('--source', choices=sorted(OCCURRENCE_ROWS), default='groupx')
+    stats = commands.add_parser('stats', help="popular times and busiest studios")
+    stats.add_argument('--class-name', help="e.g. spin")
+    stats.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with ScheduleWarehouse(args.db) as warehouse:
+        if args.command == 'import':
+            df = pd.read_csv(args.csv, dtype=str)
+            warehouse.archive(args.source, df.to_dict('records'), scraped_at=os.path.getmtime(args.csv))
+            return
+
+        started = time.perf_counter()
+        label = args.class_name or 'all classes'
+        print(f"Most common times for {label}:")
+        for row in warehouse.popular_times(args.class_name, limit=args.limit):
+            print(f"  {row['weekday']:<9} {row['start_local']}  {row['occurrences']:>5} "
+                  f"occurrences over {row['terms']} term(s)")
+        print("Busiest studios:")
+        for row in warehouse.busiest_studios(limit=args.limit):
+            print(f"  {row['location'] or '(unknown)':<40} {row['occurrences']:>5} occurrences, "
+                  f"{row['hours']} h, {row['classes']} classes")
+        print(f"Queries took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Scrape change detection
+=======================
+Stable row fingerprints for GroupX and Eventbrite records, and diffs between
+two scrapes of the same source.
+
+* The *identity* of a record says which class/event it is: a GroupX class by
+  (class name, weekday), an Eventbrite event by its canonical event ID.
+* The *fingerprint* hashes the fields users care about (title, weekday/date,
+  times, studio/venue). Same identity + different fingerprint = modified, e.g.
+  a class that moved to another time or studio.
+
+``diff_records`` pairs the two scrapes: exact fingerprint matches are
+unchanged, leftover records with the same identity are paired as modified (in
+start order), and everything else is added or removed.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from dedup import normalize_title
+from eventbrite_frontier import event_key
+
+CHANGE_ADDED = 'added'
+CHANGE_REMOVED = 'removed'
+CHANGE_MODIFIED = 'modified'
+
+# Fields hashed into the fingerprint, per source
+FINGERPRINT_FIELDS = {
+    'groupx': ['class_name', 'weekday', 'start_time_local', 'end_time_local', 'studio',
+               'term_start_date', 'term_end_date'],
+    'eventbrite': ['title', 'date_time', 'venue'],
+}
+# Field used to pair several modified records that share an identity
+ORDER_FIELD = {'groupx': 'start_time_local', 'eventbrite': 'date_time'}
+
+_WHITESPACE = re.compile(r'\s+')
+
+# ===========================
+# FINGERPRINTS
+# ===========================
+
+def _normalize_value(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return _WHITESPACE.sub(' ', str(value)).strip().lower()
+
+def record_identity(record: Dict, source: str) -> str:
+    """Which class/event a record describes, independent of its time or place"""
+    if source == 'groupx':
+        return f"{normalize_title(record.get('class_name'))}|{_normalize_value(record.get('weekday'))}"
+    if source == 'eventbrite':
+        link = record.get('link')
+        return event_key(link) if isinstance(link, str) and link else normalize_title(record.get('title'))
+    raise ValueError(f"Unknown source '{source}'")
+
+def record_fingerprint(record: Dict, source: str) -> str:
+    """Stable hash of a record's user-visible fields"""
+    parts = [_normalize_value(record.get(field)) for field in FINGERPRINT_FIELDS[source]]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+def fingerprint_frame(df: pd.DataFrame, source: str) -> pd.DataFrame:
+    """Copy of df with '_identity' and '_fingerprint' columns"""
+    out = df.copy()
+    records = out.to_dict('records')
+    out['_identity'] = [record_identity(r, source) for r in records]
+    out['_fingerprint'] = [record_fingerprint(r, source) for r in records]
+    return out
+
+def changed_fields(old: Dict, new: Dict, source: str) -> List[str]:
+    """Fingerprinted fields whose normalized value differs"""
+    return [field for field in FINGERPRINT_FIELDS[source]
+            if _normalize_value(old.get(field)) != _normalize_value(new.get(field))]
+
+# ===========================
+# DIFF
+# ===========================
+
+class ScrapeDiff:
+    """Added, removed and modified records between two scrapes of one source"""
+
+    def __init__(self, source: str, added: List[Dict], removed: List[Dict],
+                 modified: List[Tuple[Dict, Dict, List[str]]], unchanged: int):
+        self.source = source
+        self.added = added
+        self.removed = removed
+        self.modified = modified          # (old record, new record, changed fields)
+        self.unchanged = unchanged
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+    def counts(self) -> Dict[str, int]:
+        return {CHANGE_ADDED: len(self.added), CHANGE_REMOVED: len(self.removed),
+                CHANGE_MODIFIED: len(self.modified), 'unchanged': self.unchanged}
+
+    def delta_records(self) -> Tuple[List[Dict], List[Dict]]:
+        """(records to insert, records to retract) for downstream incremental updates"""
+        return (self.added + [new for _, new, _ in self.modified],
+                self.removed + [old for old, _, _ in self.modified])
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per change: 'change', 'changed_fields', 'previous' plus the record's fields"""
+        rows = []
+        for record in self.added:
+            rows.append({'change': CHANGE_ADDED, 'changed_fields': '', 'previous': '', **record})
+        for old, new, fields in self.modified:
+            previous = '; '.join(f"{field}: {old.get(field)}" for field in fields)
+            rows.append({'change': CHANGE_MODIFIED, 'changed_fields': ', '.join(fields),
+                         'previous': previous, **new})
+        for record in self.removed:
+            rows.append({'change': CHANGE_REMOVED, 'changed_fields': '', 'previous': '', **record})
+        return pd.DataFrame(rows, columns=None if rows else ['change', 'changed_fields', 'previous'])
+
+def _records(df: Optional[pd.DataFrame]) -> List[Dict]:
+    if df is None or df.empty:
+        return []
+    return df.to_dict('records')
+
+def diff_records(old_df: Optional[pd.DataFrame], new_df: Optional[pd.DataFrame], source: str) -> ScrapeDiff:
+    """Diff two scrapes of source (either may be None/empty)"""
+    order_field = ORDER_FIELD[source]
+
+    # Exact matches (same identity and fingerprint) are unchanged; keep a multiset for repeats
+    old_by_exact = defaultdict(list)
+    for record in _records(old_df):
+        old_by_exact[(record_identity(record, source), record_fingerprint(record, source))].append(record)
+
+    unchanged = 0
+    new_leftover = defaultdict(list)
+    for record in _records(new_df):
+        key = (record_identity(record, source), record_fingerprint(record, source))
+        if old_by_exact.get(key):
+            old_by_exact[key].pop()
+            unchanged += 1
+        else:
+            new_leftover[key[0]].append(record)
+
+    old_leftover = defaultdict(list)
+    for (identity, _), records in old_by_exact.items():
+        old_leftover[identity].extend(records)
+
+    # Leftovers sharing an identity are the same class/event with changed details
+    added, removed, modified = [], [], []
+    sort_key = lambda r: _normalize_value(r.get(order_field))
+    for identity in list(new_leftover) + [i for i in old_leftover if i not in new_leftover]:
+        news = sorted(new_leftover.get(identity, []), key=sort_key)
+        olds = sorted(old_leftover.get(identity, []), key=sort_key)
+        for old, new in zip(olds, news):
+            modified.append((old, new, changed_fields(old, new, source)))
+        added.extend(news[len(olds):])
+        removed.extend(olds[len(news):])
+
+    return ScrapeDiff(source, added, removed, modified, unchanged)
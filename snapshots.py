@@ -0,0 +1,189 @@
+"""
+Versioned scrape snapshots
+==========================
+The refresher (``refresher.py``) publishes every GroupX / Eventbrite scrape as
+an immutable, versioned CSV; ``streamlit_app.py`` reads the latest one instead
+of scraping inside a button handler.
+
+Layout under ``.cache/snapshots`` (or ``$SCHEDULE_SNAPSHOT_DIR``)::
+
+    groupx/20251019T061500123Z.csv
+    groupx/20251019T061500123Z.diff.csv    changes vs the previous version
+    eventbrite/20251019T063000456Z.csv
+    manifest.json      {source: {version, path, published_at, rows, partial, reason,
+                                 base_version, diff_path, changes}}
+
+A snapshot file is fully written before the manifest is atomically replaced to
+point at it, so readers never see a half-written snapshot. Publishing holds a
+lock (a thread lock plus ``manifest.lock`` where ``fcntl`` exists) for the whole
+read-modify-write of the manifest, so the app and the refresher never drop each
+other's entries. Older versions are pruned, keeping the newest KEEP_VERSIONS
+per source.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import fcntl    # POSIX only; elsewhere publishers are serialized within one process
+except ImportError:
+    fcntl = None
+
+from scrape_diff import diff_records
+
+SNAPSHOT_DIR = (os.environ.get('SCHEDULE_SNAPSHOT_DIR')
+                or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'snapshots'))
+SOURCES = ('groupx', 'eventbrite')
+KEEP_VERSIONS = 5
+_VERSION_FILE = re.compile(r'^(\d{8}T\d+Z)\.csv$')
+_publish_lock = threading.Lock()
+
+# ===========================
+# MANIFEST
+# ===========================
+
+def _manifest_path(root: str) -> str:
+    return os.path.join(root, 'manifest.json')
+
+def read_manifest(root: str = SNAPSHOT_DIR) -> Dict[str, Dict]:
+    """Current {source: entry} manifest ({} if nothing has been published)"""
+    try:
+        with open(_manifest_path(root), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _atomic_write(path: str, write: Callable) -> None:
+    """Call write(file) on a uniquely named temp file next to path, then move it into place"""
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', dir=os.path.dirname(path),
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp', delete=False) as f:
+        write(f)
+    os.replace(f.name, path)
+
+def _write_manifest(manifest: Dict[str, Dict], root: str) -> None:
+    _atomic_write(_manifest_path(root), lambda f: json.dump(manifest, f, indent=2))
+
+@contextmanager
+def _manifest_lock(root: str):
+    """Exclusive hold on root's manifest across threads (and processes, with fcntl)"""
+    with _publish_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(root, 'manifest.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+# ===========================
+# PUBLISH / READ
+# ===========================
+
+def publish(source: str, df: pd.DataFrame, partial: bool = False, reason: str = '',
+            root: str = SNAPSHOT_DIR) -> Dict:
+    """Write df as a new version of source and atomically make it the latest"""
+    if source not in SOURCES:
+        raise ValueError(f"Unknown snapshot source '{source}', expected one of {SOURCES}")
+    source_dir = os.path.join(root, source)
+    os.makedirs(source_dir, exist_ok=True)
+
+    with _manifest_lock(root):
+        # Diff against the current latest before replacing it
+        previous_df, previous = load_latest(source, root)
+        diff = diff_records(previous_df, df, source)
+
+        published_at = time.time()
+        if previous and published_at <= previous['published_at']:
+            published_at = previous['published_at'] + 0.001     # versions stay unique and ordered
+        version = time.strftime('%Y%m%dT%H%M%S', time.gmtime(published_at)) + f"{int(published_at * 1000) % 1000:03d}Z"
+        path = os.path.join(source_dir, f"{version}.csv")
+        _atomic_write(path, lambda f: df.to_csv(f, index=False))
+        diff_path = os.path.join(source_dir, f"{version}.diff.csv")
+        _atomic_write(diff_path, lambda f: diff.to_frame().to_csv(f, index=False))
+
+        entry = {
+            'version': version,
+            'path': os.path.relpath(path, root),
+            'published_at': published_at,
+            'rows': int(len(df)),
+            'partial': bool(partial),
+            'reason': reason,
+            'base_version': previous['version'] if previous else None,
+            'diff_path': os.path.relpath(diff_path, root),
+            'changes': diff.counts(),
+        }
+        manifest = read_manifest(root)
+        manifest[source] = entry
+        _write_manifest(manifest, root)
+        prune(source, root=root)
+    counts = diff.counts()
+    print(f"Published {source} snapshot {version} ({len(df)} rows; +{counts['added']} "
+          f"-{counts['removed']} ~{counts['modified']})")
+    return entry
+
+def prune(source: str, keep: int = KEEP_VERSIONS, root: str = SNAPSHOT_DIR) -> None:
+    """Delete all but the newest keep versions of source (never the one in the manifest)"""
+    source_dir = os.path.join(root, source)
+    current = read_manifest(root).get(source, {}).get('path')
+    versions = sorted(name for name in os.listdir(source_dir) if _VERSION_FILE.match(name))
+    for name in versions[:-keep] if keep else versions:
+        if os.path.join(source, name) == current:
+            continue
+        version = _VERSION_FILE.match(name).group(1)
+        for stale in (name, f"{version}.diff.csv"):
+            try:
+                os.remove(os.path.join(source_dir, stale))
+            except OSError:
+                pass
+
+def latest(source: str, root: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    """Manifest entry of the latest snapshot of source, or None"""
+    return read_manifest(root).get(source)
+
+def load(entry: Dict, root: str = SNAPSHOT_DIR) -> Optional[pd.DataFrame]:
+    """DataFrame of the snapshot version described by a manifest entry (None if it is gone)"""
+    try:
+        return pd.read_csv(os.path.join(root, entry['path']), dtype=str)
+    except (OSError, ValueError, pd.errors.EmptyDataError):
+        return None
+
+def load_latest(source: str, root: str = SNAPSHOT_DIR) -> Tuple[Optional[pd.DataFrame], Optional[Dict]]:
+    """(DataFrame, manifest entry) of the latest snapshot, or (None, None)"""
+    entry = latest(source, root)
+    if entry is None:
+        return None, None
+    df = load(entry, root)
+    return (df, entry) if df is not None else (None, None)
+
+def load_diff(entry: Dict, root: str = SNAPSHOT_DIR) -> Optional[pd.DataFrame]:
+    """Changes of this version vs its base version (ScrapeDiff.to_frame layout), or None"""
+    if not entry.get('diff_path'):
+        return None
+    try:
+        return pd.read_csv(os.path.join(root, entry['diff_path']), dtype=str)
+    except (OSError, ValueError, pd.errors.EmptyDataError):
+        return None
+
+def age_seconds(entry: Dict) -> float:
+    return max(time.time() - entry.get('published_at', 0), 0.0)
+
+def describe_age(entry: Dict) -> str:
+    """Human-readable snapshot age, e.g. '3 min ago' or '2.5 h ago'"""
+    age = age_seconds(entry)
+    if age < 60:
+        return "just now"
+    if age < 3600:
+        return f"{int(age // 60)} min ago"
+    if age < 48 * 3600:
+        return f"{age / 3600:.1f} h ago"
+    return f"{age / 86400:.0f} days ago"
@@ -5,10 +5,20 @@
 import streamlit as st
 import pandas as pd
 import asyncio
+import threading
+import time
 
 # Import your existing scripts
 import google_calendar
 import combiner
+import ical_io
+import snapshots
+import scrape_diff
+import recommend
+import plan_optimizer
+import table_view
+import schedule_warehouse
+from deadlines import PartialResult
 
 # Eventbrite scraper
 try:
@@ -22,6 +32,7 @@ except Exception as e:  # catch anything that goes wrong during import (missing
 # CMU GroupX scraper
 try:
     import cmu_scraper
+    import browser_pool
 except ImportError:
     cmu_scraper = None
 
@@ -40,6 +51,156 @@ if "eventbrite_df" not in st.session_state:
     st.session_state["eventbrite_df"] = None
 if "groupx_df" not in st.session_state:
     st.session_state["groupx_df"] = None
+if "live_schedule" not in st.session_state:
+    st.session_state["live_schedule"] = None
+if "combined_df" not in st.session_state:
+    st.session_state["combined_df"] = None
+
+
+# Scraped GroupX/Eventbrite data is public, so it is shared by every session:
+# each snapshot version is read and parsed once per process.
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_shared_snapshot(source, version, path):
+    return snapshots.load({"path": path})
+
+
+def load_snapshot(source, version, path):
+    """One published snapshot version; each session gets its own copy so edits can't leak between sessions"""
+    df = _load_shared_snapshot(source, version, path)
+    return None if df is None else df.copy()
+
+
+# How long a click waits for another session's scrape of the same source
+SCRAPE_WAIT_SECONDS = 10 * 60
+
+
+@st.cache_resource
+def scrape_lock(source):
+    """Process-wide lock so concurrent sessions don't scrape the same source at once"""
+    return threading.Lock()
+
+
+def sync_shared_data():
+    """Point this session at the newest shared snapshot of each source"""
+    info = {}
+    versions = st.session_state.setdefault("snapshot_versions", {})
+    for source, key in (("eventbrite", "eventbrite_df"), ("groupx", "groupx_df")):
+        entry = snapshots.latest(source)
+        if entry is None:
+            continue
+        info[source] = entry
+        if versions.get(source) != entry["version"] or st.session_state[key] is None:
+            df = load_snapshot(source, entry["version"], entry["path"])
+            if df is not None:
+                # Move an existing live view forward by the delta instead of rebuilding it
+                live = st.session_state["live_schedule"]
+                if live is not None and st.session_state[key] is not None:
+                    live.apply_diff(scrape_diff.diff_records(st.session_state[key], df, source))
+                st.session_state[key] = df
+                versions[source] = entry["version"]
+    return info
+
+
+def share_scrape(source, records):
+    """Publish a session's scrape so every other session picks it up"""
+    entry = snapshots.publish(source, pd.DataFrame(records), partial=getattr(records, "partial", False),
+                              reason=getattr(records, "reason", ""))
+    # Expanding the term and writing the history is slow; keep it off the script thread
+    threading.Thread(target=schedule_warehouse.archive_scrape, args=(source, records), daemon=True).start()
+    st.session_state.setdefault("snapshot_versions", {})[source] = entry["version"]
+
+
+def claim_scrape(source, label):
+    """Take source's scrape lock; returns False (lock not held) if another session published meanwhile or the wait timed out"""
+    clicked_at = time.time()
+    lock = scrape_lock(source)
+    if not lock.acquire(blocking=False):
+        with st.spinner(f"Another user is scraping {label}; waiting for their results..."):
+            acquired = lock.acquire(timeout=SCRAPE_WAIT_SECONDS)
+        if not acquired:
+            st.error(f"Another user's {label} scrape is taking too long; please try again in a few minutes.")
+            return False
+    entry = snapshots.latest(source)
+    if entry is not None and entry["published_at"] >= clicked_at:
+        lock.release()
+        sync_shared_data()
+        st.success(f"✅ Using the {label} results another session just scraped")
+        return False
+    return True
+
+
+# Start from the latest shared snapshots instead of an empty session
+snapshot_info = sync_shared_data()
+
+
+CHANGE_COLORS = {
+    scrape_diff.CHANGE_ADDED: "background-color: #e6f4ea",
+    scrape_diff.CHANGE_MODIFIED: "background-color: #fff4e5",
+    scrape_diff.CHANGE_REMOVED: "background-color: #fdecea; text-decoration: line-through",
+}
+
+
+def show_snapshot_age(source):
+    entry = snapshot_info.get(source)
+    if entry is not None:
+        note = " (partial)" if entry.get("partial") else ""
+        st.caption(f"Using {entry['rows']} pre-scraped rows from {snapshots.describe_age(entry)}{note}. "
+                   f"Scrape again for fresh data.")
+        show_changes(entry)
+
+
+def show_changes(entry):
+    """Highlight what changed since the previous scrape (new, moved/edited, cancelled)"""
+    counts = entry.get("changes") or {}
+    total = sum(counts.get(change, 0) for change in CHANGE_COLORS)
+    if not entry.get("base_version") or not total:
+        return
+    diff_df = snapshots.load_diff(entry)
+    if diff_df is None or diff_df.empty:
+        return
+    label = (f"{counts.get('added', 0)} new, {counts.get('modified', 0)} changed, "
+             f"{counts.get('removed', 0)} removed since the previous scrape")
+    with st.expander(label):
+        st.dataframe(diff_df.style.apply(
+            lambda row: [CHANGE_COLORS.get(row["change"], "")] * len(row), axis=1
+        ))
+
+
+# Streaming redraws re-render the whole table, so only redraw every few records or seconds
+LIVE_REDRAW_EVERY = 25
+LIVE_REDRAW_SECONDS = 1.0
+
+
+def redraw_due(count, drawn_at):
+    """Whether the streamed tables should be redrawn after count records (last drawn at drawn_at)"""
+    return count % LIVE_REDRAW_EVERY == 0 or time.monotonic() - drawn_at >= LIVE_REDRAW_SECONDS
+
+
+def retract_dropped(source, previous_df, records):
+    """Take rows the previous scrape had but this complete scrape dropped out of the live view"""
+    live = st.session_state["live_schedule"]
+    if live is None or previous_df is None or getattr(records, "partial", False):
+        return
+    live.apply_diff(scrape_diff.diff_records(previous_df, pd.DataFrame(records), source))
+
+
+def get_live_schedule():
+    """Incrementally-built, conflict-filtered view that scraped events are inserted into as they arrive"""
+    if st.session_state["live_schedule"] is None:
+        window_end = pd.Timestamp.now(tz="UTC") + pd.Timedelta(days=14)
+        st.session_state["live_schedule"] = combiner.IncrementalSchedule(
+            st.session_state.get("calendar_df"), window_end=window_end
+        )
+    return st.session_state["live_schedule"]
+
+
+def combine_inputs(cal_df, eb_df, gx_df, window_end):
+    """The sources as EventRecords, so small inputs take the combiner's pure-Python path (DataFrames if a scraper is missing)"""
+    if eventbrite_scraper is None or cmu_scraper is None:
+        return cal_df, eb_df, gx_df
+    return (google_calendar.calendar_records(cal_df.to_dict("records")),
+            eventbrite_scraper.event_records(eb_df.to_dict("records")),
+            cmu_scraper.class_occurrence_records(gx_df.to_dict("records"), window_end=window_end))
 
 
 # --- Google Calendar ---
@@ -48,15 +209,30 @@ if st.button("Fetch Google Calendar (next 14 days)"):
     try:
         creds = google_calendar.get_google_credentials()
         if creds:
-            cal_df = google_calendar.get_calendar_events(creds)
+            cal_df = google_calendar.get_calendar_events_cached(creds)
             st.session_state["calendar_df"] = cal_df
+            st.session_state["live_schedule"] = None
             st.success("✅ Calendar events loaded")
-            st.dataframe(cal_df)
         else:
             st.error("Google login failed. Please authorize the app.")
     except Exception as e:
         st.error(f"Error fetching calendar: {e}")
 
+ics_file = st.file_uploader("Or import a calendar export (.ics)", type=["ics"])
+if ics_file is not None and st.button("Import .ics (next 14 days)"):
+    try:
+        now = pd.Timestamp.now(tz="UTC")
+        cal_df = ical_io.read_ics(ics_file, window_start=now, window_end=now + pd.Timedelta(days=14))
+        st.session_state["calendar_df"] = cal_df
+        st.session_state["live_schedule"] = None
+        st.success(f"✅ Imported {len(cal_df)} calendar events")
+    except Exception as e:
+        st.error(f"Error importing calendar file: {e}")
+
+# Tables render from session state (outside the button handlers) so paging/sorting survives reruns
+if st.session_state["calendar_df"] is not None:
+    table_view.paged_table(st.session_state["calendar_df"], "calendar")
+
 
 # --- Eventbrite ---
 st.header("Step 2: Scrape Eventbrite Fitness Events")
@@ -65,34 +241,91 @@ if eventbrite_scraper is None:
             f"Make sure eventbrite_scraper.py is in this folder and its deps are installed. "
             f"Details: {_EVENTBRITE_IMPORT_ERR}")
 else:
-    if st.button("Scrape Eventbrite"):
+    show_snapshot_age("eventbrite")
+    if st.button("Scrape Eventbrite") and claim_scrape("eventbrite", "Eventbrite"):
         try:
             # run async scraper
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            events = loop.run_until_complete(eventbrite_scraper.run())  # your scraper’s async entrypoint
+
+            # Stream records in as they are parsed and render progressively
+            events = PartialResult()
+            previous_df = st.session_state["eventbrite_df"]
+            live = get_live_schedule()
+            table = st.empty()
+            fits = st.empty()
+            drawn_at = 0.0
+            stream = eventbrite_scraper.stream_events(status=events)
+            while True:
+                try:
+                    record = loop.run_until_complete(stream.__anext__())
+                except StopAsyncIteration:
+                    break
+                events.append(record)
+                live.add_eventbrite_records([record])
+                if redraw_due(len(events), drawn_at):
+                    table.dataframe(pd.DataFrame(events))
+                    fits.dataframe(live.to_frame())
+                    drawn_at = time.monotonic()
+            table.empty()
+            retract_dropped("eventbrite", previous_df, events)
+            fits.dataframe(live.to_frame())
             eb_df = pd.DataFrame(events)
             st.session_state["eventbrite_df"] = eb_df
+            if events:
+                share_scrape("eventbrite", events)
+            if getattr(events, "partial", False):
+                st.warning(f"⚠️ Partial Eventbrite results ({events.reason})")
             st.success("✅ Eventbrite events scraped")
-            st.dataframe(eb_df)
         except Exception as e:
             st.error(f"Error scraping Eventbrite: {e}")
+        finally:
+            scrape_lock("eventbrite").release()
+    if st.session_state["eventbrite_df"] is not None:
+        table_view.paged_table(st.session_state["eventbrite_df"], "eventbrite")
 
 
 
 # --- GroupX ---
 st.header("Step 3: Scrape CMU GroupX Events")
 if cmu_scraper:
-    if st.button("Scrape GroupX"):
+    show_snapshot_age("groupx")
+    if st.button("Scrape GroupX") and claim_scrape("groupx", "GroupX"):
         try:
-         scraper = cmu_scraper.CMUGroupXSeleniumScraper(headless=True)
-         classes_data = scraper.scrape_schedule_data()
+         # Lease a warm Chrome from the process-wide pool instead of launching one per click
+         with browser_pool.get_selenium_pool().lease() as driver:
+             scraper = cmu_scraper.CMUGroupXSeleniumScraper(headless=True, driver=driver)
+
+             # Stream classes in as they are parsed and render progressively
+             classes_data = PartialResult()
+             previous_df = st.session_state["groupx_df"]
+             live = get_live_schedule()
+             table = st.empty()
+             fits = st.empty()
+             drawn_at = 0.0
+             for class_info in scraper.iter_schedule_data(status=classes_data):
+                 classes_data.append(class_info)
+                 live.add_groupx_records([class_info])
+                 if redraw_due(len(classes_data), drawn_at):
+                     table.dataframe(pd.DataFrame(classes_data))
+                     fits.dataframe(live.to_frame())
+                     drawn_at = time.monotonic()
+             table.empty()
+         retract_dropped("groupx", previous_df, classes_data)
+         fits.dataframe(live.to_frame())
          gx_df = pd.DataFrame(classes_data)
          st.session_state["groupx_df"] = gx_df
+         if classes_data:
+             share_scrape("groupx", classes_data)
+         if getattr(classes_data, "partial", False):
+             st.warning(f"⚠️ Partial GroupX results ({classes_data.reason})")
          st.success("✅ GroupX events scraped")
-         st.dataframe(gx_df)
         except Exception as e:
             st.error(f"Error scraping GroupX: {e}")
+        finally:
+            scrape_lock("groupx").release()
+    if st.session_state["groupx_df"] is not None:
+        table_view.paged_table(st.session_state["groupx_df"], "groupx")
 else:
     st.info("⚠️ GroupX scraper not integrated as .py file yet.")
 
@@ -106,15 +339,83 @@ if st.button("Combine"):
 
     if cal_df is not None and eb_df is not None and gx_df is not None:
         try:
-            final_df = combiner.standardize_and_combine(cal_df, eb_df, gx_df)
+            # Only expand GroupX classes over the same 14 days as the calendar fetch
+            window_end = pd.Timestamp.now(tz="UTC") + pd.Timedelta(days=14)
+            sources = combine_inputs(cal_df, eb_df, gx_df, window_end)
+            final_df, merged_rows = combiner.standardize_and_combine(*sources, window_end=window_end,
+                                                                     deduplicate=True, return_report=True)
+            st.session_state["combined_df"] = final_df
+            st.session_state["merged_rows"] = merged_rows
+            table_view.forget_download("combined_csv")
+            table_view.forget_download("combined_ics")
             st.success("✅ Combined schedule created")
-            st.dataframe(final_df)
-
-            csv = final_df.to_csv(index=False).encode("utf-8")
-            st.download_button("Download Combined CSV", csv, "combined_schedule.csv", "text/csv")
         except Exception as e:
             st.error(f"Error combining data: {e}")
     else:
         st.warning("Please run all three steps first.")
 
+if st.session_state["combined_df"] is not None:
+    final_df = st.session_state["combined_df"]
+    table_view.paged_table(final_df, "combined")
+
+    merged_rows = st.session_state.get("merged_rows")
+    if merged_rows is not None and not merged_rows.empty:
+        with st.expander(f"{len(merged_rows)} duplicate listings merged"):
+            table_view.paged_table(merged_rows, "merged_rows")
+
+    # Encode the files only when asked for, not on every rerun
+    table_view.lazy_download("Download Combined CSV", lambda: final_df.to_csv(index=False).encode("utf-8"),
+                             "combined_schedule.csv", "text/csv", "combined_csv")
+    table_view.lazy_download("Download Combined .ics", lambda: ical_io.schedule_to_ics_bytes(final_df),
+                             "combined_schedule.ics", "text/calendar", "combined_ics")
+
+
+# --- Recommendations ---
+st.header("Step 5: Recommended Classes")
+combined_df = st.session_state.get("combined_df")
+if combined_df is None:
+    st.info("Combine your schedule first to get recommendations.")
+else:
+    class_types = st.text_input("Preferred class types (comma-separated)", "yoga, hiit")
+    locations = st.text_input("Preferred locations / studios (comma-separated)", "CUC")
+    hours = st.slider("Preferred time of day", 0, 24, (7, 10))
+    min_gap = st.number_input("Minutes needed before your next calendar event", 0, 240, 30, step=5)
+    k = st.slider("How many recommendations", 1, 50, recommend.DEFAULT_K)
+
+    prefs = recommend.Preferences(
+        class_types=class_types.split(","),
+        locations=locations.split(","),
+        time_windows=[hours],
+        min_gap_minutes=min_gap,
+    )
+    top = recommend.recommend(combined_df, prefs, k)
+    st.dataframe(top[["time_range", "scraped_event", "location", "score", "url"]])
+
+
+# --- Weekly plan ---
+st.header("Step 6: Plan Your Week")
+if combined_df is None:
+    st.info("Combine your schedule first to build a weekly plan.")
+else:
+    per_week = st.number_input("Classes per week", 1, 7, 3)
+    no_consecutive = st.checkbox("No two classes on consecutive days", value=True)
+    required = st.text_input("Must include at least one of each (comma-separated)", "yoga")
+    travel_weight = st.slider("Travel penalty per change of campus area", 0.0, 5.0, 1.0, step=0.5)
+    n_plans = st.slider("Number of plans", 1, 10, plan_optimizer.DEFAULT_PLANS)
 
+    if st.button("Find plans"):
+        spec = plan_optimizer.PlanSpec(
+            classes_per_week=per_week,
+            no_consecutive_days=no_consecutive,
+            required_types=required.split(","),
+            travel_weight=travel_weight,
+        )
+        plans = plan_optimizer.best_plans(combined_df, spec, prefs, n_plans=n_plans)
+        if plans.partial:
+            st.warning(f"⚠️ Search stopped early ({plans.reason}); showing the best plans found so far")
+        if not plans:
+            st.warning("No plan satisfies these constraints this week.")
+        for i, plan in enumerate(plans, 1):
+            with st.expander(f"Plan {i}: score {plan['value']:.2f}, "
+                             f"{plan['area_changes']} campus-area changes", expanded=(i == 1)):
+                st.dataframe(plan["classes"])
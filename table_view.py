@@ -0,0 +1,125 @@
+"""
+Paginated table view for large schedule frames
+==============================================
+``st.dataframe(df)`` serializes the whole frame to the browser on every rerun,
+which gets slow with a term's worth of class occurrences. ``paged_table``
+instead:
+
+* converts the frame to an Arrow table once and keeps it (with any sort orders
+  computed so far) in session state, keyed on the frame object itself, so
+  reruns reuse the buffers;
+* sorts on the server with ``pyarrow.compute.sort_indices``;
+* sends only the visible page (``Table.take``) to the browser.
+
+``lazy_download`` builds CSV/.ics bytes only after the user asks for them,
+instead of encoding the full file on every rerun.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZES = [25, 50, 100, 250]
+
+# ===========================
+# ARROW CACHE
+# ===========================
+
+class _ArrowCache:
+    """Arrow copy of one DataFrame plus its cached sort permutations"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.source = df                  # identity check: a new frame means a new cache
+        self.table = to_arrow(df)
+        self.orders: Dict[tuple, pa.Array] = {}
+
+    def sorted_indices(self, column: Optional[str], descending: bool) -> Optional[pa.Array]:
+        if column is None:
+            return None
+        key = (column, descending)
+        if key not in self.orders:
+            self.orders[key] = pc.sort_indices(
+                self.table, sort_keys=[(column, 'descending' if descending else 'ascending')]
+            )
+        return self.orders[key]
+
+    def page(self, start: int, stop: int, column: Optional[str], descending: bool) -> pd.DataFrame:
+        """Rows [start, stop) of the (optionally sorted) table as a small DataFrame"""
+        order = self.sorted_indices(column, descending)
+        if order is None:
+            view = self.table.slice(start, stop - start)
+        else:
+            view = self.table.take(order.slice(start, stop - start))
+        return view.to_pandas()
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Arrow table for df; mixed-type object columns (e.g. address dicts) fall back to strings"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        object_columns = df.select_dtypes(include='object').columns
+        as_text = df.astype({col: str for col in object_columns})
+        return pa.Table.from_pandas(as_text, preserve_index=False)
+
+def _arrow_cache(df: pd.DataFrame, key: str) -> _ArrowCache:
+    state_key = f"_table_view_{key}"
+    cache = st.session_state.get(state_key)
+    if cache is None or cache.source is not df:
+        cache = _ArrowCache(df)
+        st.session_state[state_key] = cache
+    return cache
+
+# ===========================
+# WIDGETS
+# ===========================
+
+def paged_table(df: Optional[pd.DataFrame], key: str, page_size: int = DEFAULT_PAGE_SIZE,
+                columns: Optional[List[str]] = None) -> None:
+    """Render df one server-sorted page at a time"""
+    if df is None or df.empty:
+        st.dataframe(df if df is not None else pd.DataFrame())
+        return
+    if columns is not None:
+        df_columns = [c for c in columns if c in df.columns]
+    else:
+        df_columns = list(df.columns)
+    cache = _arrow_cache(df, key)
+    total = cache.table.num_rows
+
+    sort_col, order_col, size_col, page_col = st.columns([3, 2, 2, 2])
+    sort_by = sort_col.selectbox("Sort by", ["(original order)"] + df_columns, key=f"{key}_sort")
+    descending = order_col.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    size = size_col.selectbox("Rows per page", PAGE_SIZES,
+                              index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+                              key=f"{key}_size")
+    pages = max((total + size - 1) // size, 1)
+    # A remembered page past the end (smaller frame or larger page size) would make the widget raise
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = page_col.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+
+    start = (int(page) - 1) * size
+    stop = min(start + size, total)
+    column = None if sort_by == "(original order)" else sort_by
+    visible = cache.page(start, stop, column, descending)
+    st.dataframe(visible[df_columns], hide_index=True)
+    st.caption(f"Rows {start + 1}-{stop} of {total}")
+
+def lazy_download(label: str, build: Callable[[], bytes], file_name: str, mime: str, key: str) -> None:
+    """Download button whose payload is built only after the user asks for it (then kept for the session)"""
+    state_key = f"_download_{key}"
+    if state_key not in st.session_state:
+        if st.button(f"Prepare {label}", key=f"{key}_prepare"):
+            st.session_state[state_key] = build()
+            st.rerun()
+        return
+    st.download_button(label, st.session_state[state_key], file_name, mime, key=f"{key}_download")
+
+def forget_download(key: str) -> None:
+    """Drop a prepared download (call when the underlying data changes)"""
+    st.session_state.pop(f"_download_{key}", None)
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from benchmark_app import CALENDAR_EVENTS_PER_SCALE, EVENTBRITE_EVENTS_PER_SCALE, load_fixtures, state_env
+
+def test_fixtures_scale_into_distinct_rows():
+    one, three = load_fixtures(1), load_fixtures(3)
+    assert len(one['calendar']) == CALENDAR_EVENTS_PER_SCALE
+    assert len(one['eventbrite']) == EVENTBRITE_EVENTS_PER_SCALE
+    for name, column in (('calendar', 'Summary'), ('eventbrite', 'link'), ('groupx', 'class_name')):
+        assert len(three[name]) == 3 * len(one[name])
+        assert three[name][column].nunique() == 3 * one[name][column].nunique()
+
+def test_recorded_fixtures_replace_the_generated_ones(tmp_path):
+    recorded = pd.DataFrame([{'title': 'Recorded', 'link': 'https://www.eventbrite.com/e/recorded-1',
+                              'date_time': '2030-03-04T07:00:00-05:00 → 2030-03-04T08:00:00-05:00',
+                              'venue': 'Studio', 'address': 'Pittsburgh, PA'}])
+    recorded.to_csv(tmp_path / 'eventbrite.csv', index=False)
+    fixtures = load_fixtures(2, fixture_dir=str(tmp_path))
+    assert fixtures['eventbrite']['title'].tolist() == ['Recorded', 'Recorded #1']
+    assert fixtures['eventbrite']['link'].tolist() == [recorded['link'][0], recorded['link'][0] + '-1']
+    assert len(fixtures['calendar']) == 2 * CALENDAR_EVENTS_PER_SCALE
+
+def test_worker_state_stays_in_the_state_dir(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-c', 'import snapshots, schedule_warehouse; '
+                               'print(snapshots.SNAPSHOT_DIR); print(schedule_warehouse.WAREHOUSE_PATH)'],
+        env=state_env(str(tmp_path)), cwd=root, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert output == [str(tmp_path / 'snapshots'), str(tmp_path / 'history.sqlite3')]
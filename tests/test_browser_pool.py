@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+import browser_pool
+import cmu_scraper
+from browser_pool import SeleniumDriverPool
+
+class FakeDriver:
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.crashed = False
+        self.quit_count = 0
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise RuntimeError('chrome not reachable')
+        return 'about:blank'
+
+    def get(self, url):
+        self.current_url
+
+    def quit(self):
+        self.quit_count += 1
+
+def test_lease_reuses_a_warm_driver():
+    pool = SeleniumDriverPool(FakeDriver)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second
+
+def test_crashed_and_worn_out_drivers_are_replaced():
+    pool = SeleniumDriverPool(FakeDriver, max_uses=2)
+    with pytest.raises(RuntimeError):
+        with pool.lease() as crashed:
+            crashed.crashed = True
+            raise RuntimeError('scrape failed')
+    assert crashed.quit_count == 1
+    with pool.lease() as driver:
+        assert driver is not crashed
+    with pool.lease() as again:
+        assert again is driver
+    assert driver.quit_count == 1
+    with pool.lease() as fresh:
+        assert fresh is not driver
+
+def test_pool_caps_live_drivers():
+    pool = SeleniumDriverPool(FakeDriver, max_drivers=1)
+    leased = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with pool.lease():
+            leased.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    leased.wait(5)
+    assert not pool._slots.acquire(timeout=0.1)
+    release.set()
+    thread.join()
+    assert pool._slots.acquire(timeout=1)
+
+def test_closed_pool_refuses_leases():
+    pool = SeleniumDriverPool(FakeDriver)
+    with pool.lease() as driver:
+        pass
+    pool.close()
+    assert driver.quit_count == 1
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+
+def test_selenium_pools_are_keyed_by_headless(monkeypatch):
+    monkeypatch.setattr(browser_pool, '_selenium_pools', {})
+    monkeypatch.setattr(browser_pool.atexit, 'register', lambda func: func)
+    monkeypatch.setattr(cmu_scraper, 'create_chrome_driver',
+                        lambda headless, low_footprint=False: FakeDriver(headless))
+
+    headless = browser_pool.get_selenium_pool(headless=True)
+    headed = browser_pool.get_selenium_pool(headless=False)
+    assert headless is not headed
+    assert browser_pool.get_selenium_pool(headless=True) is headless
+    with headless.lease() as driver:
+        assert driver.headless
+    with headed.lease() as driver:
+        assert not driver.headless
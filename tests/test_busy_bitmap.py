@@ -0,0 +1,92 @@
+import pandas as pd
+
+import chunked_combine
+import combiner
+from busy_bitmap import BusyBitmap
+from events import CALENDAR, SCRAPED, EventRecord, to_utc
+
+def calendar_row(summary, start, end):
+    return {'Calendar': 'primary', 'Summary': summary, 'Start': start, 'End': end, 'Location': '', 'Description': ''}
+
+def eventbrite(title, start, end):
+    link = f"https://www.eventbrite.com/e/{title.lower().replace(' ', '-')}-tickets-1"
+    return {'title': title, 'link': link, 'date_time': f"{start} → {end}", 'venue': 'Gym', 'address': ''}
+
+CALENDAR_DF = pd.DataFrame([
+    calendar_row('Lecture', '2030-03-04T10:00:00-05:00', '2030-03-04T11:20:00-05:00'),
+    # Zero-length reminders: one on a minute boundary, one mid-minute
+    calendar_row('Assignment due', '2030-03-04T12:00:00-05:00', '2030-03-04T12:00:00-05:00'),
+    calendar_row('Take meds', '2030-03-04T17:30:30-05:00', '2030-03-04T17:30:30-05:00'),
+])
+EVENTBRITE_DF = pd.DataFrame([
+    eventbrite('Overlaps lecture', '2030-03-04T11:00:00-05:00', '2030-03-04T12:00:00-05:00'),
+    eventbrite('Starts at deadline', '2030-03-04T12:00:00-05:00', '2030-03-04T13:00:00-05:00'),
+    eventbrite('Spans deadline', '2030-03-04T11:30:00-05:00', '2030-03-04T12:30:00-05:00'),
+    eventbrite('Spans reminder', '2030-03-04T17:00:00-05:00', '2030-03-04T18:00:00-05:00'),
+    eventbrite('Ends at lecture', '2030-03-04T09:00:00-05:00', '2030-03-04T10:00:00-05:00'),
+])
+KEPT = ['Ends at lecture', 'Spans deadline', 'Starts at deadline', 'Spans reminder']
+
+def scraped_titles(df):
+    return [title for title in df['scraped_event'] if isinstance(title, str)]
+
+def test_bitmap_counts_busy_minutes():
+    calendar = combiner.clean_google_calendar_df(CALENDAR_DF)
+    bitmap = BusyBitmap.from_calendar_df(calendar)
+    lecture = pd.Timestamp('2030-03-04T10:00:00-05:00')
+    assert bitmap.conflict_minutes(lecture, lecture + pd.Timedelta(minutes=80)) == 80
+    assert bitmap.conflict_minutes(lecture - pd.Timedelta(minutes=60), lecture) == 0
+    # A travel buffer reaches into the lecture
+    assert bitmap.conflict_minutes(lecture - pd.Timedelta(minutes=60), lecture, buffer_after=15) == 15
+    # Missing ends default to one hour
+    assert bitmap.conflict_minutes(lecture - pd.Timedelta(minutes=30)) == 30
+    assert not bitmap.is_free(lecture + pd.Timedelta(minutes=79))
+
+def test_zero_length_events_block_nothing():
+    calendar = combiner.clean_google_calendar_df(CALENDAR_DF)
+    bitmap = BusyBitmap.from_calendar_df(calendar)
+    assert bitmap.is_free(pd.Timestamp('2030-03-04T11:30:00-05:00'), pd.Timestamp('2030-03-04T12:30:00-05:00'))
+    assert bitmap.is_free(pd.Timestamp('2030-03-04T17:00:00-05:00'), pd.Timestamp('2030-03-04T18:00:00-05:00'))
+    only_reminders = BusyBitmap.from_calendar_df(calendar.iloc[1:])
+    assert len(only_reminders) == 0
+
+def test_free_gaps():
+    calendar = combiner.clean_google_calendar_df(CALENDAR_DF.iloc[:1])
+    lecture = pd.Timestamp('2030-03-04T10:00:00-05:00')
+    bitmap = BusyBitmap.from_calendar_df(calendar, lecture - pd.Timedelta(hours=1), lecture + pd.Timedelta(hours=3))
+    gaps = bitmap.free_gaps(30)
+    assert [(start.tz_convert('US/Eastern').strftime('%H:%M'), end.tz_convert('US/Eastern').strftime('%H:%M'))
+            for start, end in gaps] == [('09:00', '10:00'), ('11:20', '13:00')]
+    assert bitmap.free_gaps(90) == [(lecture + pd.Timedelta(minutes=80), lecture + pd.Timedelta(hours=3))]
+
+def test_bitmap_backend_matches_pairwise():
+    pairwise = combiner.standardize_and_combine(CALENDAR_DF, EVENTBRITE_DF, None, conflict_backend='pairwise')
+    bitmap = combiner.standardize_and_combine(CALENDAR_DF, EVENTBRITE_DF, None, conflict_backend='bitmap')
+    assert scraped_titles(pairwise) == KEPT
+    assert bitmap.values.tolist() == pairwise.values.tolist()
+
+def test_record_and_chunked_paths_match_pairwise():
+    pairwise = combiner.standardize_and_combine(CALENDAR_DF, EVENTBRITE_DF, None)
+    calendar = [EventRecord(to_utc(row['Start']), to_utc(row['End']), row['Summary'], CALENDAR)
+                for row in CALENDAR_DF.to_dict('records')]
+    scraped = []
+    for row in EVENTBRITE_DF.to_dict('records'):
+        start, end = row['date_time'].split(' → ')
+        scraped.append(EventRecord(to_utc(start), to_utc(end), row['title'], SCRAPED))
+    assert scraped_titles(combiner.combine_records(calendar, scraped)) == KEPT
+
+    chunked = pd.concat(chunked_combine.combine_chunked([CALENDAR_DF], [EVENTBRITE_DF]), ignore_index=True)
+    assert chunked.values.tolist() == pairwise.values.tolist()
+
+def test_zero_length_scraped_events_never_conflict():
+    points = pd.DataFrame([
+        eventbrite('Inside lecture', '2030-03-04T10:30:00-05:00', '2030-03-04T10:30:00-05:00'),
+        eventbrite('Mid-minute', '2030-03-04T10:30:30-05:00', '2030-03-04T10:30:30-05:00'),
+        eventbrite('Lecture start', '2030-03-04T10:00:00-05:00', '2030-03-04T10:00:00-05:00'),
+    ])
+    pairwise = combiner.standardize_and_combine(CALENDAR_DF, points, None, conflict_backend='pairwise')
+    bitmap = combiner.standardize_and_combine(CALENDAR_DF, points, None, conflict_backend='bitmap')
+    assert sorted(scraped_titles(pairwise)) == ['Inside lecture', 'Lecture start', 'Mid-minute']
+    assert sorted(bitmap.values.tolist()) == sorted(pairwise.values.tolist())
+    chunked = pd.concat(chunked_combine.combine_chunked([CALENDAR_DF], [points]), ignore_index=True)
+    assert sorted(chunked.values.tolist()) == sorted(pairwise.values.tolist())
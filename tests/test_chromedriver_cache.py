@@ -0,0 +1,68 @@
+import json
+import sys
+import types
+
+import pytest
+
+import chromedriver_cache
+from chromedriver_cache import read_pin, resolve_chromedriver_path, write_pin
+
+def executable(tmp_path, name):
+    path = tmp_path / name
+    path.write_text('#!/bin/sh\n')
+    path.chmod(0o755)
+    return str(path)
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Fake webdriver_manager; set manager.path (or manager.error) and count installs"""
+    state = types.SimpleNamespace(path=None, error=None, installs=0)
+
+    class ChromeDriverManager:
+        def install(self):
+            state.installs += 1
+            if state.error:
+                raise state.error
+            return state.path
+
+    module = types.ModuleType('webdriver_manager.chrome')
+    module.ChromeDriverManager = ChromeDriverManager
+    monkeypatch.setitem(sys.modules, 'webdriver_manager.chrome', module)
+    monkeypatch.delenv('CHROMEDRIVER_PATH', raising=False)
+    monkeypatch.setattr(chromedriver_cache, 'WDM_CACHE_GLOB', '/nonexistent/**/chromedriver*')
+    monkeypatch.setattr(chromedriver_cache.shutil, 'which', lambda name: None)
+    return state
+
+def test_environment_variable_wins(tmp_path, manager, monkeypatch):
+    env_driver = executable(tmp_path, 'env-driver')
+    monkeypatch.setenv('CHROMEDRIVER_PATH', env_driver)
+    assert resolve_chromedriver_path(str(tmp_path / 'pin.json')) == env_driver
+    assert manager.installs == 0
+
+def test_fresh_pin_skips_the_network(tmp_path, manager):
+    cache_file = str(tmp_path / 'pin.json')
+    pinned = executable(tmp_path, 'pinned')
+    write_pin(pinned, cache_file)
+    assert resolve_chromedriver_path(cache_file) == pinned
+    assert manager.installs == 0
+
+def test_stale_pin_is_refreshed(tmp_path, manager):
+    cache_file = str(tmp_path / 'pin.json')
+    write_pin(executable(tmp_path, 'old'), cache_file)
+    manager.path = executable(tmp_path, 'new')
+    assert resolve_chromedriver_path(cache_file, ttl=0) == manager.path
+    assert read_pin(cache_file)['path'] == manager.path
+
+def test_offline_falls_back_to_the_stale_pin(tmp_path, manager):
+    cache_file = str(tmp_path / 'pin.json')
+    pinned = executable(tmp_path, 'old')
+    write_pin(pinned, cache_file)
+    manager.error = ConnectionError('offline')
+    assert resolve_chromedriver_path(cache_file, ttl=0) == pinned
+
+def test_missing_pinned_binary_is_not_used(tmp_path, manager):
+    cache_file = tmp_path / 'pin.json'
+    cache_file.write_text(json.dumps({'path': str(tmp_path / 'deleted'), 'pinned_at': 1e12}))
+    manager.error = ConnectionError('offline')
+    assert resolve_chromedriver_path(str(cache_file)) is None
+    assert manager.installs == 1
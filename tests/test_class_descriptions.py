@@ -0,0 +1,61 @@
+from class_descriptions import (NOT_AVAILABLE, ClassDescriptionMatcher, load_descriptions,
+                                normalize_class_name, parse_descriptions_page)
+from http_cache import CachedSession, HostRateLimiter
+
+PAGE = b"""<html><body>
+<div>YOGA FLOW
+a gentle vinyasa class.</div>
+<div>INDOOR CYCLING
+ride to the beat.</div>
+<div>ZUMBA
+dance fitness.</div>
+</body></html>"""
+
+def session(tmp_path):
+    return CachedSession(cache_dir=str(tmp_path / 'http'), rate_limiter=HostRateLimiter(default_interval=0))
+
+def test_parse_and_normalize():
+    descriptions = parse_descriptions_page(PAGE)
+    assert descriptions == {'yoga flow': 'a gentle vinyasa class.', 'cycling': 'ride to the beat.',
+                            'zumba': 'dance fitness.'}
+    assert normalize_class_name('  Indoor   Cycling ') == 'cycling'
+
+def test_matcher_exact_substring_and_missing():
+    matcher = ClassDescriptionMatcher(parse_descriptions_page(PAGE))
+    assert matcher.lookup('YOGA FLOW') == 'a gentle vinyasa class.'
+    assert matcher.lookup('Indoor Cycling 45') == 'ride to the beat.'
+    assert matcher.lookup('Zumba Gold') == 'dance fitness.'
+    assert matcher.lookup('Pilates') == NOT_AVAILABLE
+
+def test_load_descriptions_goes_through_the_http_cache(tmp_path, http_server):
+    def respond(request_headers):
+        if request_headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, {'ETag': '"v1"', 'Cache-Control': 'no-cache', 'Content-Type': 'text/html'}, PAGE
+    http_server.respond = respond
+    s = session(tmp_path)
+    cache_path = str(tmp_path / 'descriptions.json')
+
+    first = load_descriptions(s, http_server.url, cache_path=cache_path)
+    second = load_descriptions(s, http_server.url, cache_path=cache_path)
+    assert first == second == parse_descriptions_page(PAGE)
+    # Revalidation is the HTTP cache's job: one full fetch, then a 304
+    assert 'If-None-Match' not in http_server.requests[0]
+    assert http_server.requests[1]['If-None-Match'] == '"v1"'
+    assert s.stats == {'hits': 0, 'revalidated': 1, 'misses': 1}
+
+def test_load_descriptions_accepts_a_day_old_copy(tmp_path, http_server):
+    http_server.respond = lambda headers: (200, {'Cache-Control': 'max-age=0', 'ETag': '"v1"'}, PAGE)
+    s = session(tmp_path)
+    cache_path = str(tmp_path / 'descriptions.json')
+    load_descriptions(s, http_server.url, cache_path=cache_path)
+    assert load_descriptions(s, http_server.url, cache_path=cache_path) == parse_descriptions_page(PAGE)
+    assert len(http_server.requests) == 1
+
+def test_changed_page_is_reparsed(tmp_path, http_server):
+    pages = [PAGE, PAGE.replace(b'dance fitness.', b'latin dance.')]
+    http_server.respond = lambda headers: (200, {'Cache-Control': 'no-store'}, pages[len(http_server.requests) - 1])
+    s = session(tmp_path)
+    cache_path = str(tmp_path / 'descriptions.json')
+    assert load_descriptions(s, http_server.url, cache_path=cache_path)['zumba'] == 'dance fitness.'
+    assert load_descriptions(s, http_server.url, cache_path=cache_path)['zumba'] == 'latin dance.'
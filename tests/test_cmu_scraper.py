@@ -0,0 +1,20 @@
+import inspect
+import sys
+
+import pytest
+
+import cmu_scraper
+
+def test_low_footprint_is_opt_in():
+    assert inspect.signature(cmu_scraper.create_chrome_driver).parameters['low_footprint'].default is False
+    assert inspect.signature(cmu_scraper.CMUGroupXSeleniumScraper).parameters['low_footprint'].default is False
+
+def test_measure_without_psutil_explains_what_is_missing(monkeypatch, capsys):
+    def measure_footprint(**kwargs):
+        pytest.fail("measure_footprint should not run without psutil")
+
+    monkeypatch.setitem(sys.modules, 'psutil', None)
+    monkeypatch.setattr(sys, 'argv', ['cmu_scraper.py', '--measure'])
+    monkeypatch.setattr(cmu_scraper, 'measure_footprint', measure_footprint)
+    cmu_scraper.main()
+    assert '--measure needs psutil' in capsys.readouterr().out
@@ -0,0 +1,146 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+import combiner
+
+CALENDAR = pd.DataFrame([
+    {'Calendar': 'primary', 'Summary': '15-213 Lecture', 'Start': '2030-03-04T10:00:00-05:00',
+     'End': '2030-03-04T11:20:00-05:00', 'Location': 'GHC 4401', 'Description': ''},
+    {'Calendar': 'primary', 'Summary': 'Office hours', 'Start': '2030-03-05T15:00:00-05:00',
+     'End': '2030-03-05T16:00:00-05:00', 'Location': '', 'Description': 'Weekly'},
+])
+
+def eventbrite(title, link, start, end, venue):
+    return {'title': title, 'link': link, 'date_time': f"{start} → {end}", 'venue': venue, 'address': 'Pittsburgh, PA'}
+
+SUNRISE = 'https://www.eventbrite.com/e/sunrise-yoga-tickets-1000001'
+DANCE = 'https://www.eventbrite.com/e/evening-dance-tickets-1000003'
+EVENTBRITE = pd.DataFrame([
+    eventbrite('Sunrise Yoga', SUNRISE, '2030-03-04T07:00:00-05:00', '2030-03-04T08:00:00-05:00', 'Schenley Park'),
+    # The same event reached through a second listing card
+    eventbrite('Sunrise Yoga', SUNRISE + '?aff=ebdssbdestsearch', '2030-03-04T07:00:00-05:00',
+               '2030-03-04T08:00:00-05:00', 'Schenley Park'),
+    # Overlaps the lecture
+    eventbrite('Lunch Spin', 'https://www.eventbrite.com/e/lunch-spin-tickets-1000002',
+               '2030-03-04T10:30:00-05:00', '2030-03-04T11:15:00-05:00', 'Cycle Hub'),
+    eventbrite('Evening Dance', DANCE, '2030-03-05T18:00:00-05:00', '2030-03-05T19:30:00-05:00', 'Studio'),
+])
+
+# Output of standardize_and_combine(CALENDAR, EVENTBRITE) before deduplication existed
+BASELINE = [
+    ['2030-03-04 07:00 - 08:00 ET', 'Sunrise Yoga', None, SUNRISE, 'Schenley Park- Pittsburgh, PA', SUNRISE],
+    ['2030-03-04 07:00 - 08:00 ET', 'Sunrise Yoga', None, SUNRISE + '?aff=ebdssbdestsearch',
+     'Schenley Park- Pittsburgh, PA', SUNRISE + '?aff=ebdssbdestsearch'],
+    ['2030-03-04 10:00 - 11:20 ET', None, '15-213 Lecture', '', 'GHC 4401', ''],
+    ['2030-03-05 15:00 - 16:00 ET', None, 'Office hours', 'Weekly', '', ''],
+    ['2030-03-05 18:00 - 19:30 ET', 'Evening Dance', None, DANCE, 'Studio- Pittsburgh, PA', DANCE],
+]
+
+def test_default_output_matches_baseline():
+    result = combiner.standardize_and_combine(CALENDAR, EVENTBRITE, None)
+    assert result.columns.tolist() == combiner.OUTPUT_COLUMNS
+    assert result.values.tolist() == BASELINE
+
+def test_deduplicate_off_matches_baseline_and_reports_nothing():
+    result, report = combiner.standardize_and_combine(CALENDAR, EVENTBRITE, None, deduplicate=False,
+                                                      return_report=True)
+    assert result.values.tolist() == BASELINE
+    assert report is None
+
+def test_deduplicate_on_merges_only_true_duplicates():
+    # Same class at the same time in two rooms of one building: not a duplicate
+    rooms = pd.DataFrame([
+        eventbrite('Zumba', 'https://www.eventbrite.com/e/zumba-tickets-2000001',
+                   '2030-03-06T18:00:00-05:00', '2030-03-06T19:00:00-05:00', 'Keeler Studio (CUC)'),
+        eventbrite('Zumba', 'https://www.eventbrite.com/e/zumba-tickets-2000002',
+                   '2030-03-06T18:00:00-05:00', '2030-03-06T19:00:00-05:00', 'Kenner Studio (CUC)'),
+    ])
+    result, report = combiner.standardize_and_combine(CALENDAR, pd.concat([EVENTBRITE, rooms]), None,
+                                                      deduplicate=True, return_report=True)
+    zumba = [['2030-03-06 18:00 - 19:00 ET', 'Zumba', None, row['link'], row['venue'] + '- Pittsburgh, PA', row['link']]
+             for row in rooms.to_dict('records')]
+    assert result.values.tolist() == [BASELINE[0]] + BASELINE[2:] + zumba
+    assert report['reason'].tolist() == ['same_event_id']
+    assert report['merged_event'].tolist() == ['Sunrise Yoga']
+
+# ===========================
+# PARALLEL CLEANING
+# ===========================
+
+GROUPX_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cmu_groupx_classes.csv')
+
+def large_inputs():
+    now = pd.Timestamp.now(tz='UTC').floor('D')
+    groupx = pd.read_csv(GROUPX_CSV)
+    groupx['term_start_date'] = str((now - pd.Timedelta(days=3)).date())
+    groupx['term_end_date'] = str((now + pd.Timedelta(days=60)).date())
+    # Enough Eventbrite rows for the date parsing to be sharded too
+    events = pd.DataFrame([
+        eventbrite(f"Event {i}", f"https://www.eventbrite.com/e/event-{i}-tickets-{3000000 + i}",
+                   (now + pd.Timedelta(hours=8 + i)).isoformat(), (now + pd.Timedelta(hours=9 + i)).isoformat(),
+                   f"Venue {i % 7}")
+        for i in range(2 * combiner.MIN_SHARD_ROWS)
+    ])
+    return CALENDAR, events, groupx
+
+def test_parallel_cleaning_matches_serial():
+    calendar, events, groupx = large_inputs()
+    window_end = pd.Timestamp.now(tz='UTC') + pd.Timedelta(days=14)
+    serial = combiner.standardize_and_combine(calendar, events, groupx, window_end=window_end, workers=1)
+    parallel = combiner.standardize_and_combine(calendar, events, groupx, window_end=window_end,
+                                                workers=2, parallel_min_rows=0)
+    assert len(serial) > 1000
+    pd.testing.assert_frame_equal(parallel, serial)
+
+def test_parallel_cleaning_with_empty_inputs_stays_serial():
+    result = combiner.standardize_and_combine(None, pd.DataFrame(), None, workers=2, parallel_min_rows=0)
+    assert result.empty and result.columns.tolist() == combiner.OUTPUT_COLUMNS
+
+class _BrokenPool:
+    def map(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died while bootstrapping")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+def test_broken_pool_falls_back_to_serial(monkeypatch, capsys):
+    calendar, events, groupx = large_inputs()
+    serial = combiner.standardize_and_combine(calendar, events, groupx, workers=1)
+    monkeypatch.setattr(combiner, 'get_process_pool', lambda workers: _BrokenPool())
+    result = combiner.standardize_and_combine(calendar, events, groupx, workers=2, parallel_min_rows=0)
+    pd.testing.assert_frame_equal(result, serial)
+    assert 'cleaning serially' in capsys.readouterr().out
+
+# ===========================
+# INCREMENTAL COMBINATION
+# ===========================
+
+def test_incremental_schedule_matches_batch_combine():
+    unique = EVENTBRITE.drop(index=1)
+    batch = combiner.standardize_and_combine(CALENDAR, unique, None, conflict_backend='bitmap')
+    schedule = combiner.IncrementalSchedule(CALENDAR)
+    # Arrival order doesn't matter, and a repeated card is only inserted once
+    records = unique.to_dict('records')
+    assert schedule.add_eventbrite_records(records[::-1]) == 2
+    assert schedule.add_eventbrite_records(records[:1]) == 0
+    assert schedule.to_frame().values.tolist() == batch.values.tolist()
+
+def test_incremental_schedule_retracts_rows():
+    schedule = combiner.IncrementalSchedule(CALENDAR)
+    schedule.add_eventbrite_records(EVENTBRITE.drop(index=1).to_dict('records'))
+    cleaned = combiner.clean_webscraping_df(EVENTBRITE.iloc[[0]])
+    assert schedule.remove_cleaned(cleaned) == 1
+    assert schedule.remove_cleaned(cleaned) == 0
+    assert [title for title in schedule.to_frame()['scraped_event'] if title] == ['Evening Dance']
+    assert len(combiner.IncrementalSchedule().to_frame()) == 0
+
+def test_record_inputs_match_frame_inputs():
+    from eventbrite_scraper import event_records
+    from google_calendar import calendar_records
+
+    calendar = calendar_records(CALENDAR.to_dict('records'))
+    scraped = event_records(EVENTBRITE.to_dict('records'))
+    assert combiner.combine_records(calendar, scraped).values.tolist() == BASELINE
+    assert combiner.standardize_and_combine(calendar, scraped).values.tolist() == BASELINE
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+from deadlines import (Deadline, DeadlineExceeded, PartialResult, async_retry_with_backoff, backoff_delay,
+                       hedged, retry_with_backoff)
+
+class Flaky:
+    """Fails the first `failures` calls, then returns 'ok'"""
+
+    def __init__(self, failures, error=ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error(f"attempt {self.calls}")
+        return 'ok'
+
+def test_deadline_budgets():
+    unlimited = Deadline(None)
+    assert unlimited.remaining() == float('inf') and unlimited.budget(5) == 5
+    deadline = Deadline(0.5)
+    assert deadline.budget(10) <= 0.5
+    assert Deadline(0).expired()
+    with pytest.raises(DeadlineExceeded):
+        Deadline(0).check()
+
+def test_partial_result_is_a_list():
+    result = PartialResult([1, 2], partial=True, reason='deadline')
+    assert result == [1, 2] and result.partial and result.reason == 'deadline'
+    assert not PartialResult().partial
+
+def test_backoff_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, cap=2) <= 2 for attempt in range(10))
+
+def test_retry_recovers_from_transient_errors():
+    func = Flaky(2)
+    assert retry_with_backoff(func, Deadline(10), attempts=3, base_delay=0.001) == 'ok'
+    assert func.calls == 3
+
+def test_retry_gives_up_on_other_errors_and_after_the_last_attempt():
+    func = Flaky(5, ValueError)
+    with pytest.raises(ValueError):
+        retry_with_backoff(func, Deadline(10), transient=(ConnectionError,))
+    assert func.calls == 1
+    func = Flaky(5)
+    with pytest.raises(ConnectionError):
+        retry_with_backoff(func, Deadline(10), attempts=2, base_delay=0.001)
+    assert func.calls == 2
+
+def test_async_retry_times_out_each_attempt():
+    calls = []
+
+    async def slow_then_fast():
+        calls.append(1)
+        await asyncio.sleep(1 if len(calls) == 1 else 0)
+        return len(calls)
+
+    result = asyncio.run(async_retry_with_backoff(slow_then_fast, Deadline(5), per_attempt=0.05,
+                                                  transient=(asyncio.TimeoutError,), base_delay=0.001))
+    assert result == 2
+
+def test_hedged_takes_the_faster_copy():
+    calls = []
+
+    async def first_slow():
+        calls.append(1)
+        await asyncio.sleep(2 if len(calls) == 1 else 0.01)
+        return len(calls)
+
+    started = time.monotonic()
+    assert asyncio.run(hedged(first_slow, hedge_after=0.05, timeout=1)) == 2
+    assert time.monotonic() - started < 1
+
+def test_hedged_raises_when_nothing_finishes():
+    async def never():
+        await asyncio.sleep(10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(hedged(never, hedge_after=0.01, timeout=0.05))
@@ -0,0 +1,53 @@
+import pandas as pd
+
+from dedup import canonical_event_id, deduplicate_events, normalize_title, venue_tokens, venues_compatible
+
+START = pd.Timestamp('2026-10-20 17:00', tz='UTC')
+
+def scraped(title, minutes=0, location='', url='', description=''):
+    return {'start': START + pd.Timedelta(minutes=minutes), 'end': START + pd.Timedelta(minutes=minutes + 45),
+            'scraped_event': title, 'description': description, 'location': location, 'url': url}
+
+def test_normalize_title_drops_case_punctuation_and_filler():
+    assert normalize_title('The Yoga Class!') == normalize_title('yoga') == 'yoga'
+    assert normalize_title(None) == ''
+
+def test_canonical_event_id_ignores_slug_and_query():
+    assert canonical_event_id('https://www.eventbrite.com/e/flow-yoga-tickets-1234567?aff=x') == '1234567'
+    assert canonical_event_id('https://www.eventbrite.com/d/pa--pittsburgh/yoga/') is None
+
+def test_studios_in_the_same_building_are_different_venues():
+    keeler, kenner = venue_tokens('Keeler Studio (CUC)'), venue_tokens('Kenner Studio (CUC)')
+    assert not venues_compatible(keeler, kenner)
+    assert venues_compatible(venue_tokens('Keeler (CUC)'), venue_tokens('Keeler Studio'))
+    assert venues_compatible(frozenset(), kenner)
+
+def test_same_class_in_two_studios_is_not_merged():
+    df = pd.DataFrame([scraped('Yoga', 0, 'Keeler Studio (CUC)'),
+                       scraped('Yoga', 10, 'Kenner Studio (CUC)'),
+                       scraped('Spin', 5, 'Studio A. Kenner (CUC)'),
+                       scraped('Spin', 5, 'Studio B. Kenner (CUC)')])
+    result, report = deduplicate_events(df)
+    assert len(result) == 4
+    assert report.empty
+
+def test_repeated_listing_is_merged_into_the_most_detailed_copy():
+    df = pd.DataFrame([scraped('Flow Yoga', 0, 'Keeler Studio (CUC)'),
+                       scraped('flow yoga!', 5, 'Keeler (CUC)', description='Bring a mat'),
+                       scraped('Spin', 0, 'Keeler Studio (CUC)')])
+    result, report = deduplicate_events(df)
+    assert list(result.index) == [1, 2]
+    assert report[['kept_index', 'merged_index', 'reason']].values.tolist() == [[1, 0, 'title_time_venue']]
+
+def test_same_eventbrite_id_at_the_same_start_is_merged():
+    df = pd.DataFrame([scraped('Community Yoga', 0, url='https://www.eventbrite.com/e/yoga-tickets-1234567'),
+                       scraped('Yoga in the Park', 0, url='https://www.eventbrite.com/e/x-1234567?aff=ebdssbdestsearch'),
+                       scraped('Community Yoga', 60 * 24 * 7, url='https://www.eventbrite.com/e/yoga-tickets-1234567')])
+    result, report = deduplicate_events(df)
+    assert len(result) == 2
+    assert report['reason'].tolist() == ['same_event_id']
+
+def test_calendar_rows_pass_through():
+    df = pd.DataFrame([{**scraped(None), 'calendar_event': 'Lecture'}, {**scraped(None), 'calendar_event': 'Lecture'}])
+    result, report = deduplicate_events(df)
+    assert len(result) == 2 and report.empty
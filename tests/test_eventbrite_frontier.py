@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+
+import eventbrite_frontier
+from eventbrite_frontier import CrawlFrontier, card_fingerprint, event_key
+
+SEARCHES = [('pa--pittsburgh', 'yoga')]
+
+def link(n, query=''):
+    return f"https://www.eventbrite.com/e/class-{n}-tickets-10000{n}{query}"
+
+def frontier(tmp_path, **kwargs):
+    return CrawlFrontier(SEARCHES, max_pages=2, state_path=str(tmp_path / 'frontier.json'), **kwargs)
+
+def test_event_key_collapses_tracking_variants():
+    assert event_key(link(1)) == event_key(link(1, '?aff=ebdssbdestsearch')) == '100001'
+    assert card_fingerprint('  Yoga\nSat 9am ') == card_fingerprint('yoga sat 9AM')
+
+def test_crawl_follows_pagination_and_dedupes_cards(tmp_path):
+    f = frontier(tmp_path)
+    f.start()
+    listing, url = f.next_listing_url()
+    assert url == 'https://www.eventbrite.com/d/pa--pittsburgh/yoga/?page=1'
+    assert f.record_listing(listing, [{'link': link(1), 'title': 'A'}, {'link': link(1, '?x=1'), 'title': 'A'},
+                                      {'link': link(2), 'title': 'B'}, {'link': '/d/elsewhere', 'title': 'C'}]) == 2
+    listing, url = f.next_listing_url()
+    assert listing == ('pa--pittsburgh', 'yoga', 2)
+    # A page with nothing new ends the query
+    assert f.record_listing(listing, [{'link': link(2), 'title': 'B'}]) == 0
+    assert f.next_listing_url() is None
+
+    for record in ({'title': 'A'}, None):
+        key, _ = f.next_event()
+        f.record_event(key, record)
+    assert f.next_event() is None
+    f.finish()
+    assert f.results() == [{'title': 'A'}]
+    assert not f.in_progress
+
+def test_unchanged_events_are_not_revisited(tmp_path):
+    f = frontier(tmp_path)
+    f.start()
+    f.record_listing(f.next_listing_url()[0], [{'link': link(1), 'title': 'A'}, {'link': link(2), 'title': 'B'}])
+    while (item := f.next_event()) is not None:
+        f.record_event(item[0], {'title': 'x'})
+    f.listing_queue.clear()
+    f.finish()
+
+    again = frontier(tmp_path)
+    again.start()
+    again.record_listing(again.next_listing_url()[0],
+                         [{'link': link(1), 'title': 'A'}, {'link': link(2), 'title': 'B (moved to Sunday)'}])
+    assert list(again.event_queue) == [event_key(link(2))]
+    assert len(again.results()) == 2
+
+def test_interrupted_crawl_resumes_from_the_last_save(tmp_path):
+    f = frontier(tmp_path)
+    f.start()
+    f.record_listing(f.next_listing_url()[0], [{'link': link(n), 'title': str(n)} for n in range(1, 4)])
+    f.save()
+
+    resumed = frontier(tmp_path)
+    assert resumed.in_progress
+    assert list(resumed.event_queue) == [event_key(link(n)) for n in range(1, 4)]
+    assert resumed.next_listing_url()[0] == ('pa--pittsburgh', 'yoga', 2)
+
+def test_saves_are_batched(tmp_path, monkeypatch):
+    f = frontier(tmp_path)
+    saves = []
+    monkeypatch.setattr(f, 'save', lambda: saves.append(1) or setattr(f, '_unsaved_steps', 0))
+    f.start()
+    for n in range(eventbrite_frontier.SAVE_EVERY * 2):
+        f.skip_event(str(n))
+    assert len(saves) == 1 + 2
+
+def test_stale_events_are_forgotten_when_a_crawl_finishes(tmp_path):
+    f = frontier(tmp_path)
+    old = time.time() - eventbrite_frontier.KNOWN_EVENT_TTL_SECONDS - 60
+    f.known_events = {'stale': {'url': 'u', 'seen_at': old, 'record': {}},
+                      'recent': {'url': 'u', 'visited_at': time.time(), 'record': {}}}
+    f.start()
+    f.listing_queue.clear()
+    f.finish()
+    assert list(f.known_events) == ['recent']
+    with open(f.state_path, encoding='utf-8') as fh:
+        assert list(json.load(fh)['known_events']) == ['recent']
+
+def test_concurrent_saves_leave_valid_json_and_no_temp_files(tmp_path):
+    frontiers = [frontier(tmp_path) for _ in range(4)]
+    for n, f in enumerate(frontiers):
+        f.known_events = {str(i): {'url': 'u' * 1000} for i in range(n * 50)}
+
+    errors = []
+
+    def save_many(f):
+        try:
+            for _ in range(20):
+                f.save()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_many, args=(f,)) for f in frontiers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    with open(frontiers[0].state_path, encoding='utf-8') as fh:
+        json.load(fh)
+    assert os.listdir(tmp_path) == ['frontier.json']
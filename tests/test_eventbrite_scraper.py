@@ -0,0 +1,120 @@
+import asyncio
+import types
+
+import pandas as pd
+
+from eventbrite_scraper import (EXTRACT_EVENT_JS, EXTRACT_LISTING_JS, _block_heavy_requests,
+                                collect_listing_cards, scrape_event_page)
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = types.SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = 'abort'
+
+    async def continue_(self):
+        self.outcome = 'continue'
+
+class FakePage:
+    """Records calls; evaluate returns the queued results in order"""
+
+    def __init__(self, evaluations=(), cards=(), selector_appears=True):
+        self.evaluations = list(evaluations)
+        self.cards = list(cards)
+        self.selector_appears = selector_appears
+        self.calls = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.calls.append(('route', pattern))
+
+    async def goto(self, url, timeout=None, wait_until=None):
+        self.calls.append(('goto', wait_until))
+
+    async def wait_for_selector(self, selector, timeout=None):
+        self.calls.append(('wait', selector))
+        if not self.selector_appears:
+            raise TimeoutError(selector)
+
+    async def evaluate(self, script, arg):
+        assert script == EXTRACT_EVENT_JS
+        self.calls.append(('evaluate',))
+        return self.evaluations.pop(0)
+
+    async def eval_on_selector_all(self, selector, script):
+        assert script == EXTRACT_LISTING_JS
+        self.calls.append(('evaluate',))
+        return self.cards
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self, page):
+        self.page = page
+
+    async def new_page(self):
+        return self.page
+
+def route_outcome(url, resource_type):
+    route = FakeRoute(url, resource_type)
+    asyncio.run(_block_heavy_requests(route))
+    return route.outcome
+
+def test_heavy_and_third_party_requests_are_blocked():
+    assert route_outcome('https://img.evbuc.com/photo.jpg', 'image') == 'abort'
+    assert route_outcome('https://www.eventbrite.com/fonts/a.woff2', 'font') == 'abort'
+    assert route_outcome('https://www.googletagmanager.com/gtm.js', 'script') == 'abort'
+    assert route_outcome('https://cdn.evbuc.com/app.js', 'script') == 'continue'
+    assert route_outcome('https://www.eventbrite.com/e/yoga-tickets-1', 'document') == 'continue'
+    assert route_outcome('https://maps.example.com/data', 'xhr') == 'continue'
+
+def test_listing_cards_come_from_one_evaluate():
+    page = FakePage(cards=[{'link': '/e/yoga-tickets-1', 'title': ' Yoga \n'}, {'link': '/e/x-2', 'title': '  '},
+                           {'link': None, 'title': 'No link'}])
+    cards = asyncio.run(collect_listing_cards(page, 'https://www.eventbrite.com/d/pa--pittsburgh/yoga/'))
+    assert cards == [{'title': 'Yoga', 'link': '/e/yoga-tickets-1'}]
+    assert page.calls == [('route', '**/*'), ('goto', 'domcontentloaded'), ('wait', "a[href*='/e/']"), ('evaluate',)]
+
+def test_listing_without_cards_is_empty():
+    page = FakePage(selector_appears=False)
+    assert asyncio.run(collect_listing_cards(page, 'https://www.eventbrite.com/d/x/')) == []
+
+def test_event_page_prefers_the_visible_date():
+    fields = {'title': ' Sunrise Yoga ', 'date_text': ' Saturday, March 9 · 7 - 8am EST ', 'start': '2030-03-09T07:00',
+              'end': '2030-03-09T08:00', 'venue': 'Schenley Park', 'address': {'addressLocality': 'Pittsburgh'}}
+    page = FakePage([fields])
+    record = asyncio.run(scrape_event_page(FakeBrowser(page), 'https://www.eventbrite.com/e/yoga-tickets-1'))
+    assert record == {'title': 'Sunrise Yoga', 'link': 'https://www.eventbrite.com/e/yoga-tickets-1',
+                      'date_time': 'Saturday, March 9 · 7 - 8am EST', 'venue': 'Schenley Park',
+                      'address': {'addressLocality': 'Pittsburgh'}}
+    assert page.calls.count(('evaluate',)) == 1 and page.closed
+
+def test_event_page_falls_back_to_json_ld_after_waiting():
+    empty = {'title': 'Yoga', 'date_text': None, 'start': None}
+    page = FakePage([empty, {**empty, 'start': '2030-03-09T07:00', 'end': '2030-03-09T08:00'}])
+    record = asyncio.run(scrape_event_page(FakeBrowser(page), 'https://www.eventbrite.com/e/yoga-tickets-1'))
+    assert record['date_time'] == '2030-03-09T07:00 → 2030-03-09T08:00'
+    assert page.calls.count(('evaluate',)) == 2
+
+def test_event_page_without_a_date_is_skipped():
+    page = FakePage([{'title': 'Yoga'}], selector_appears=False)
+    assert asyncio.run(scrape_event_page(FakeBrowser(page), 'https://www.eventbrite.com/e/yoga-tickets-1')) is None
+    assert page.closed
+
+def test_event_records_skip_undated_events():
+    from eventbrite_scraper import event_records
+
+    link = 'https://www.eventbrite.com/e/yoga-tickets-1'
+    records = event_records([
+        {'title': 'Yoga', 'link': link, 'date_time': '2030-03-04T07:00:00-05:00 → 2030-03-04T08:00:00-05:00',
+         'venue': 'Schenley Park', 'address': 'Pittsburgh, PA'},
+        {'title': 'Mystery', 'link': link, 'date_time': 'soon'},
+    ])
+    assert len(records) == 1
+    record = records[0]
+    assert (record.title, record.location, record.url, record.source) == (
+        'Yoga', 'Schenley Park- Pittsburgh, PA', link, 'eventbrite')
+    assert record.end - record.start == pd.Timedelta(hours=1)
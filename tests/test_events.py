@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from events import CALENDAR, SCRAPED, EventRecord, is_record_list, records_to_frame, to_utc
+
+START = pd.Timestamp('2030-03-04 15:00', tz='UTC')
+
+def test_to_utc_parses_and_converts():
+    assert to_utc('2030-03-04T10:00:00-05:00') == START
+    assert to_utc('2030-03-04 15:00') == START
+    assert to_utc('not a date') is None
+    assert to_utc(None) is None
+
+def test_end_defaults_to_one_hour():
+    record = EventRecord(START, None, 'Yoga', SCRAPED)
+    assert record.end_or_default() == START + pd.Timedelta(hours=1)
+    assert not hasattr(record, '__dict__')
+
+def test_is_record_list():
+    assert is_record_list([])
+    assert is_record_list([EventRecord(START, None, 'Yoga', SCRAPED)])
+    assert not is_record_list(pd.DataFrame())
+    assert not is_record_list([{'title': 'Yoga'}])
+
+def test_records_to_frame_layout():
+    records = [EventRecord(START, START + pd.Timedelta(minutes=45), 'Yoga', SCRAPED, location='Keeler', url='u'),
+               EventRecord(START, None, 'Spin', SCRAPED)]
+    df = records_to_frame(records)
+    assert df.columns.tolist() == ['start', 'end', 'scraped_event', 'description', 'location', 'url']
+    assert str(df['start'].dtype) == 'datetime64[ns, UTC]'
+    assert df['scraped_event'].tolist() == ['Yoga', 'Spin']
+    assert pd.isna(df['end'].iloc[1])
+
+def test_records_to_frame_uses_the_calendar_column_for_calendar_records():
+    df = records_to_frame([EventRecord(START, None, 'Lecture', CALENDAR)])
+    assert 'calendar_event' in df.columns and 'scraped_event' not in df.columns
+    assert 'scraped_event' in records_to_frame([]).columns
+
+def test_records_to_frame_rejects_mixed_kinds():
+    with pytest.raises(ValueError):
+        records_to_frame([EventRecord(START, None, 'Yoga', SCRAPED), EventRecord(START, None, 'Lecture', CALENDAR)])
@@ -0,0 +1,68 @@
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+def calendar_app():
+    import pandas as pd
+    import streamlit as st
+
+    import google_calendar
+
+    fetches = st.session_state.setdefault("fetches", [])
+
+    def fetch(creds):
+        fetches.append(creds)
+        return pd.DataFrame([{"Summary": f"{creds} event {len(fetches)}"}])
+
+    google_calendar.get_calendar_events = fetch
+    user = st.session_state.get("user", "alice")
+    if st.session_state.get("logout"):
+        google_calendar.logout()
+        st.session_state["logout"] = False
+    df = google_calendar.get_calendar_events_cached(user, ttl=st.session_state.get("ttl", 300))
+    st.write(df["Summary"].iloc[0])
+
+def session(user):
+    at = AppTest.from_function(calendar_app)
+    at.session_state["user"] = user
+    at.run()
+    return at
+
+def shown(at):
+    return at.markdown[0].value
+
+def test_calendar_cache_is_per_session():
+    alice, bob = session("alice"), session("bob")
+    assert shown(alice) == "alice event 1" and shown(bob) == "bob event 1"
+    alice.run()
+    bob.run()
+    # Each session reuses only its own cached events
+    assert shown(alice) == "alice event 1" and shown(bob) == "bob event 1"
+    assert alice.session_state["fetches"] == ["alice"] and bob.session_state["fetches"] == ["bob"]
+
+def test_cache_expires_and_logout_forgets_it():
+    at = session("alice")
+    at.session_state["ttl"] = 0
+    at.run()
+    assert shown(at) == "alice event 2"
+    at.session_state["ttl"] = 300
+    at.session_state["google_token"] = "{}"
+    at.session_state["logout"] = True
+    at.run()
+    assert shown(at) == "alice event 3"
+    assert "google_token" not in at.session_state
+
+def test_calendar_records_skip_all_day_and_floating_events():
+    from google_calendar import calendar_records
+
+    rows = [
+        {'Summary': ' Lecture ', 'Start': '2030-03-04T10:00:00-05:00', 'End': '2030-03-04T11:20:00-05:00',
+         'Location': 'GHC 4401', 'Description': None},
+        {'Summary': 'Holiday', 'Start': '2030-03-05', 'End': '2030-03-06'},
+        {'Summary': 'No zone', 'Start': '2030-03-05T10:00:00', 'End': '2030-03-05T11:00:00'},
+        {'Summary': None, 'Start': '2030-03-06T15:00:00Z', 'End': ''},
+    ]
+    records = calendar_records(rows)
+    assert [(r.title, r.start, r.end) for r in records] == [
+        ('Lecture', pd.Timestamp('2030-03-04 15:00', tz='UTC'), pd.Timestamp('2030-03-04 16:20', tz='UTC')),
+        ('Untitled Event', pd.Timestamp('2030-03-06 15:00', tz='UTC'), None)]
+    assert records[0].is_calendar and records[0].location == 'GHC 4401' and records[0].description == ''
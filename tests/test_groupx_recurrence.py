@@ -0,0 +1,52 @@
+import pandas as pd
+
+from groupx_recurrence import (WeeklyClassRule, iter_class_occurrences, occurrences_frame,
+                               parse_exception_dates, parse_local_time, rules_from_groupx_df)
+
+def groupx(class_name, weekday, start, end, **extra):
+    row = {'term_start_date': '2025-10-20', 'term_end_date': '2025-11-16', 'weekday': weekday,
+           'class_name': class_name, 'start_time_local': start, 'end_time_local': end,
+           'studio': 'Keeler', 'campus_area': 'CUC', 'registration_url': '', 'class_description': ''}
+    row.update(extra)
+    return row
+
+CLASSES = pd.DataFrame([
+    groupx('Spin', 'Wed', '7:00am', '7:45am'),
+    groupx('Yoga', 'Mon', '8:00am', '8:45am', exception_dates='2025-10-27; not a date'),
+    groupx('Broken', 'Someday', '8:00am', '8:45am'),
+])
+
+def local(ts):
+    return ts.tz_convert('US/Eastern').strftime('%a %m-%d %H:%M')
+
+def test_parsers():
+    assert parse_local_time('12:45 pm').strftime('%H:%M') == '12:45'
+    assert parse_local_time(float('nan')) is None
+    assert parse_exception_dates('2025-10-27; not a date') == {pd.Timestamp('2025-10-27').date()}
+
+def test_unparseable_rows_are_skipped():
+    assert len(rules_from_groupx_df(CLASSES)) == 2
+    assert WeeklyClassRule.from_row(CLASSES.iloc[2].to_dict()) is None
+
+def test_occurrences_cover_the_term_in_start_order():
+    occurrences = list(iter_class_occurrences(CLASSES))
+    assert [(o['class_name'], local(o['start'])) for o in occurrences[:3]] == [
+        ('Yoga', 'Mon 10-20 08:00'), ('Spin', 'Wed 10-22 07:00'), ('Spin', 'Wed 10-29 07:00')]
+    # Four weeks of Spin, three of Yoga (one cancelled)
+    assert sum(o['class_name'] == 'Spin' for o in occurrences) == 4
+    assert sum(o['class_name'] == 'Yoga' for o in occurrences) == 3
+    starts = [o['start'] for o in occurrences]
+    assert starts == sorted(starts)
+
+def test_window_is_half_open_and_crosses_dst():
+    # 2 November 2025 is the end of daylight saving time; local start times stay put
+    start = pd.Timestamp('2025-10-29 07:00', tz='US/Eastern')
+    end = pd.Timestamp('2025-11-05 07:00', tz='US/Eastern')
+    frame = occurrences_frame(CLASSES, start, end)
+    assert [local(ts) for ts in frame['start']] == ['Wed 10-29 07:00', 'Mon 11-03 08:00']
+    assert (frame['end'] - frame['start']).dt.total_seconds().tolist() == [45 * 60] * 2
+    assert frame['occurrence_date'].tolist() == ['2025-10-29', '2025-11-03']
+
+def test_empty_window_keeps_the_column_layout():
+    frame = occurrences_frame(CLASSES, '2030-01-01', '2030-01-08')
+    assert frame.empty and {'start', 'end', 'occurrence_date', 'class_name'} <= set(frame.columns)
@@ -0,0 +1,81 @@
+import gzip
+
+import http_cache
+from http_cache import CachedSession, HostRateLimiter, freshness_lifetime, max_stale
+
+BODY = b'<html>schedule</html>'
+
+def session(tmp_path):
+    return CachedSession(cache_dir=str(tmp_path / 'http'), rate_limiter=HostRateLimiter(default_interval=0))
+
+def validating(etag='"v1"', cache_control='no-cache'):
+    """Responder that sends BODY with an ETag and answers 304 to a matching If-None-Match"""
+    def respond(request_headers):
+        if request_headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, {'ETag': etag, 'Cache-Control': cache_control}, BODY
+    return respond
+
+def test_freshness_lifetime_rules():
+    assert freshness_lifetime({'Cache-Control': 'max-age=60'}) == 60
+    assert freshness_lifetime({'Cache-Control': 'no-cache, max-age=60'}) == 0
+    assert freshness_lifetime({'Expires': '0', 'Date': 'Mon, 19 Oct 2026 10:00:00 GMT'}) == 0
+    # Heuristic: 10% of the time since Last-Modified
+    assert freshness_lifetime({'Date': 'Mon, 19 Oct 2026 10:00:00 GMT',
+                               'Last-Modified': 'Mon, 19 Oct 2026 09:00:00 GMT'}) == 360
+
+def test_max_stale_is_refused_by_no_cache_responses():
+    assert max_stale({'Cache-Control': 'max-stale=30'}, {}) == 30
+    assert max_stale({'cache-control': 'max-stale'}, {}) == float('inf')
+    assert max_stale({}, {}) == 0
+    assert max_stale({'Cache-Control': 'max-stale=30'}, {'Cache-Control': 'must-revalidate'}) == 0
+
+def test_fresh_response_is_served_without_a_request(tmp_path, http_server):
+    http_server.respond = lambda headers: (200, {'Cache-Control': 'max-age=600'}, BODY)
+    s = session(tmp_path)
+    assert s.get(http_server.url).content == BODY
+    cached = s.get(http_server.url)
+    assert cached.from_cache and cached.content == BODY
+    assert len(http_server.requests) == 1
+    assert s.stats == {'hits': 1, 'revalidated': 0, 'misses': 1}
+
+def test_stale_response_is_revalidated(tmp_path, http_server):
+    http_server.respond = validating()
+    s = session(tmp_path)
+    s.get(http_server.url)
+    again = s.get(http_server.url)
+    assert again.status_code == 200 and again.revalidated and again.content == BODY
+    assert http_server.requests[1]['If-None-Match'] == '"v1"'
+    assert s.stats['revalidated'] == 1
+
+def test_max_stale_request_reuses_a_stale_copy(tmp_path, http_server):
+    http_server.respond = lambda headers: (200, {'Cache-Control': 'max-age=0', 'ETag': '"v1"'}, BODY)
+    s = session(tmp_path)
+    s.get(http_server.url)
+    assert s.get(http_server.url, headers={'Cache-Control': 'max-stale=600'}).from_cache
+    assert len(http_server.requests) == 1
+
+def test_no_store_is_not_cached(tmp_path, http_server):
+    http_server.respond = lambda headers: (200, {'Cache-Control': 'no-store, max-age=600'}, BODY)
+    s = session(tmp_path)
+    s.get(http_server.url)
+    s.get(http_server.url)
+    assert len(http_server.requests) == 2
+
+def test_decoded_bodies_are_stored_without_encoding_headers(tmp_path, http_server):
+    compressed = gzip.compress(BODY)
+    http_server.respond = lambda headers: (200, {'Content-Encoding': 'gzip', 'ETag': '"v1"',
+                                                 'Cache-Control': 'max-age=600'}, compressed)
+    s = session(tmp_path)
+    first = s.get(http_server.url)
+    assert first.content == BODY
+    stored = s._load(http_server.url)
+    assert stored['content'] == BODY
+    lowered = {k.lower() for k in stored['headers']}
+    assert 'content-encoding' not in lowered and 'content-length' not in lowered
+    # The replayed response describes the decoded body it carries
+    cached = s.get(http_server.url)
+    assert cached.content == BODY and 'Content-Encoding' not in cached.headers
+
+def test_shared_session_is_a_singleton():
+    assert http_cache.get_shared_session() is http_cache.get_shared_session()
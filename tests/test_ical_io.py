@@ -0,0 +1,88 @@
+import io
+
+import pandas as pd
+
+import ical_io
+
+def calendar(*events):
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'X-WR-CALNAME:Classes']
+    for event in events:
+        lines += ['BEGIN:VEVENT'] + event + ['END:VEVENT']
+    lines.append('END:VCALENDAR')
+    return io.StringIO('\r\n'.join(lines) + '\r\n')
+
+def summaries(source, **kwargs):
+    return [row['Summary'] for row in ical_io.iter_ics_events(source, **kwargs)]
+
+LECTURE = ['UID:lecture', 'SUMMARY:Lecture', 'DTSTART;TZID=America/New_York:20300304T100000',
+           'DTEND;TZID=America/New_York:20300304T112000']
+
+def test_single_event_row_shape():
+    rows = list(ical_io.iter_ics_events(calendar(LECTURE + ['LOCATION:GHC 4401\\, 4th floor'])))
+    assert rows == [{'Calendar': 'Classes', 'Summary': 'Lecture', 'Start': '2030-03-04T10:00:00-05:00',
+                     'End': '2030-03-04T11:20:00-05:00', 'Location': 'GHC 4401, 4th floor', 'Description': ''}]
+
+def test_cancelled_event_is_skipped_whatever_the_property_order():
+    status_first = ['UID:a', 'SUMMARY:Status first', 'STATUS:CANCELLED', 'DTSTART:20300304T150000Z']
+    status_last = ['UID:b', 'SUMMARY:Status last', 'DTSTART:20300304T150000Z', 'STATUS:CANCELLED']
+    confirmed = ['UID:c', 'SUMMARY:Confirmed', 'STATUS:CONFIRMED', 'DTSTART:20300304T150000Z']
+    assert summaries(calendar(status_first, status_last, confirmed)) == ['Confirmed']
+
+def test_folded_lines_and_nested_alarms():
+    event = ['UID:x', 'SUMMARY:A very long', ' summary', 'DTSTART:20300304T150000Z',
+             'BEGIN:VALARM', 'DESCRIPTION:Reminder', 'END:VALARM', 'DESCRIPTION:Real']
+    rows = list(ical_io.iter_ics_events(calendar(event)))
+    assert rows[0]['Summary'] == 'A very longsummary'
+    assert rows[0]['Description'] == 'Real'
+
+def test_recurring_event_is_expanded_inside_the_window_with_exdates_and_overrides():
+    weekly = ['UID:yoga', 'SUMMARY:Yoga', 'DTSTART;TZID=America/New_York:20300304T070000', 'DURATION:PT1H',
+              'RRULE:FREQ=WEEKLY', 'EXDATE;TZID=America/New_York:20300311T070000']
+    moved = ['UID:yoga', 'SUMMARY:Yoga (moved)', 'RECURRENCE-ID;TZID=America/New_York:20300318T070000',
+             'DTSTART;TZID=America/New_York:20300318T090000', 'DURATION:PT1H']
+    rows = list(ical_io.iter_ics_events(calendar(weekly, moved), window_start=pd.Timestamp('2030-03-01', tz='UTC'),
+                                        window_end=pd.Timestamp('2030-03-29', tz='UTC')))
+    assert [(row['Summary'], row['Start']) for row in rows] == [
+        ('Yoga', '2030-03-04T07:00:00-05:00'),
+        ('Yoga', '2030-03-25T07:00:00-04:00'),
+        ('Yoga (moved)', '2030-03-18T09:00:00-04:00'),
+    ]
+
+def test_all_day_events_keep_plain_dates():
+    rows = list(ical_io.iter_ics_events(calendar(['UID:d', 'SUMMARY:Break', 'DTSTART;VALUE=DATE:20300304'])))
+    assert (rows[0]['Start'], rows[0]['End']) == ('2030-03-04', '2030-03-05')
+
+def test_read_ics_returns_google_columns():
+    df = ical_io.read_ics(calendar(LECTURE))
+    assert df.columns.tolist() == ical_io.GOOGLE_COLUMNS
+    assert ical_io.read_ics(calendar()).empty
+
+def test_parse_duration():
+    assert ical_io.parse_duration('PT1H30M') == pd.Timedelta(minutes=90)
+    assert ical_io.parse_duration('-P1D') == -pd.Timedelta(days=1)
+    assert ical_io.parse_duration('soon') is None
+
+def test_fold_line_limits_octets():
+    folded = ical_io.fold_line('DESCRIPTION:' + 'é' * 100)
+    assert all(len(part.encode('utf-8')) <= ical_io.MAX_LINE_OCTETS for part in folded.split('\r\n'))
+    assert ical_io.fold_line('SUMMARY:x') == 'SUMMARY:x\r\n'
+
+def test_export_round_trips_the_combined_schedule():
+    combined = pd.DataFrame([
+        {'time_range': '2030-03-04 07:00 - 08:00 ET', 'scraped_event': 'Yoga; Flow', 'calendar_event': None,
+         'description': 'Bring a mat', 'location': 'Keeler, CUC', 'url': 'https://example.com/yoga'},
+        {'time_range': '2030-03-04 10:00 - 11:20 ET', 'scraped_event': None, 'calendar_event': 'Lecture',
+         'description': '', 'location': 'GHC', 'url': ''},
+    ])
+    text = ical_io.schedule_to_ics_bytes(combined).decode('utf-8')
+    rows = list(ical_io.iter_ics_events(io.StringIO(text)))
+    assert [(row['Summary'], row['Start'], row['Location']) for row in rows] == [
+        ('Yoga; Flow', '2030-03-04T12:00:00+00:00', 'Keeler, CUC'),
+        ('Lecture', '2030-03-04T15:00:00+00:00', 'GHC'),
+    ]
+
+def test_parse_time_range_display_inverts_the_combiner_format():
+    start, end = ical_io.parse_time_range_display('2030-03-04 23:30 - 2030-03-05 00:30 ET')
+    assert start == pd.Timestamp('2030-03-05 04:30', tz='UTC')
+    assert end == pd.Timestamp('2030-03-05 05:30', tz='UTC')
+    assert ical_io.parse_time_range_display('whenever') == (None, None)
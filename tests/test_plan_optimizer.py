@@ -0,0 +1,81 @@
+import itertools
+import random
+
+import pandas as pd
+
+import plan_optimizer
+from plan_optimizer import PlanSpec, best_plans, encode_candidates, location_area, search_plans
+from recommend import Preferences
+
+TYPES = ['Yoga', 'Spin', 'HIIT', 'Zumba']
+AREAS = ['Keeler (CUC)', 'Kenner (CUC)', 'Tepper Fitness', 'Skibo Gym']
+
+def random_week(seed, rows=24):
+    rng = random.Random(seed)
+    combined = []
+    for i in range(rows):
+        day = rng.randrange(7)
+        hour = rng.choice([7, 8, 12, 17, 18])
+        start = pd.Timestamp('2030-03-04') + pd.Timedelta(days=day, hours=hour, minutes=rng.choice([0, 30]))
+        end = start + pd.Timedelta(minutes=rng.choice([45, 60]))
+        combined.append({'time_range': f"{start:%Y-%m-%d %H:%M} - {end:%H:%M} ET",
+                         'scraped_event': f"{rng.choice(TYPES)} {i}", 'calendar_event': None,
+                         'description': '', 'location': rng.choice(AREAS), 'url': ''})
+    return pd.DataFrame(combined)
+
+def brute_force_values(candidates, spec, n_plans):
+    required = (1 << len(spec.required_types)) - 1
+    values = []
+    for picks in itertools.combinations(range(len(candidates)), spec.classes_per_week):
+        chosen = [candidates[j] for j in picks]
+        slots = days = covered = 0
+        feasible = True
+        for c in chosen:
+            if c.slots & slots or c.day & days:
+                feasible = False
+                break
+            slots |= c.slots
+            days |= (c.day | c.day << 1 | c.day >> 1) if spec.no_consecutive_days else 0
+            covered |= c.types
+        if not feasible or covered & required != required:
+            continue
+        travel = sum(a.area != b.area for a, b in zip(chosen, chosen[1:])) * spec.travel_weight
+        values.append(sum(c.score for c in chosen) - travel)
+    return sorted(values, reverse=True)[:n_plans]
+
+def test_location_area():
+    assert location_area('Keeler (CUC)') == 'cuc'
+    assert location_area('Tepper Fitness') == 'tepper fitness'
+    assert location_area(None) == ''
+
+def test_branch_and_bound_matches_brute_force():
+    prefs = Preferences(class_types=['yoga'], time_windows=[(7, 9)])
+    for seed in range(5):
+        for spec in (PlanSpec(3, required_types=['yoga', 'spin']),
+                     PlanSpec(2, no_consecutive_days=False, travel_weight=0.5)):
+            candidates, _ = encode_candidates(random_week(seed), spec, prefs)
+            found = search_plans(candidates, spec, n_plans=3, time_budget=30)
+            assert not found.partial
+            expected = brute_force_values(candidates, spec, 3)
+            assert [round(value, 9) for value, _ in found] == [round(value, 9) for value in expected]
+
+def test_best_plans_respect_the_constraints():
+    spec = PlanSpec(3, required_types=['yoga'])
+    plans = best_plans(random_week(1), spec, Preferences(class_types=['spin']), n_plans=2)
+    assert len(plans) == 2 and plans[0]['value'] >= plans[1]['value']
+    for plan in plans:
+        classes = plan['classes']
+        days = sorted(pd.to_datetime(classes['time_range'].str.slice(0, 10)).dt.dayofweek)
+        assert len(classes) == 3 and all(b - a > 1 for a, b in zip(days, days[1:]))
+        assert classes['scraped_event'].str.contains('Yoga').any()
+
+def test_time_budget_returns_partial_plans(monkeypatch):
+    monkeypatch.setattr(plan_optimizer, 'DEADLINE_CHECK_EVERY', 1)
+    spec = PlanSpec(4, no_consecutive_days=False, travel_weight=0)
+    candidates, _ = encode_candidates(random_week(2), spec)
+    found = search_plans(candidates, spec, time_budget=0)
+    assert found.partial and 'time budget' in found.reason
+
+def test_no_candidates():
+    empty = pd.DataFrame(columns=['time_range', 'scraped_event', 'calendar_event', 'description', 'location', 'url'])
+    assert list(best_plans(empty, PlanSpec())) == []
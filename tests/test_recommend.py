@@ -0,0 +1,52 @@
+import random
+
+import pandas as pd
+
+from recommend import (Preferences, gap_minutes, keyword_score, parse_time_ranges, recommend, score_candidates,
+                       time_of_day_score, top_k)
+
+def row(time_range, scraped=None, calendar=None, location=''):
+    return {'time_range': time_range, 'scraped_event': scraped, 'calendar_event': calendar,
+            'description': '', 'location': location, 'url': ''}
+
+COMBINED = pd.DataFrame([
+    row('2030-03-04 07:00 - 07:45 ET', 'Sunrise Yoga', location='Keeler (CUC)'),
+    row('2030-03-04 09:00 - 10:00 ET', calendar='15-213 Lecture'),
+    row('2030-03-04 12:00 - 12:45 ET', 'Lunch HIIT', location='Kenner (CUC)'),
+    row('2030-03-04 18:00 - 19:00 ET', 'Evening Yoga', location='Tepper Fitness'),
+    row('2030-03-04 23:30 - 2030-03-05 00:30 ET', 'Late Spin', location='Cycle Hub'),
+])
+
+def test_parse_time_ranges():
+    start, end = parse_time_ranges(COMBINED['time_range'])
+    assert start.iloc[4] == pd.Timestamp('2030-03-04 23:30') and end.iloc[4] == pd.Timestamp('2030-03-05 00:30')
+    start, end = parse_time_ranges(pd.Series(['2030-03-04 08:00 ET', 'garbage']))
+    assert end.iloc[0] == pd.Timestamp('2030-03-04 09:00') and pd.isna(start.iloc[1])
+
+def test_components():
+    assert keyword_score(pd.Series(['Sunrise YOGA', 'Spin', None]), ['yoga']).tolist() == [1, 0, 0]
+    assert keyword_score(pd.Series(['Spin']), []).tolist() == [1]
+    starts = pd.Series(pd.to_datetime(['2030-03-04 07:30', '2030-03-04 10:00', '2030-03-04 13:00']))
+    assert time_of_day_score(starts, [(6, 9)]).tolist() == [1.0, 0.5, 0.0]
+    ends = pd.Series(pd.to_datetime(['2030-03-04 07:45', '2030-03-04 19:00']))
+    assert gap_minutes(ends, pd.Series(pd.to_datetime(['2030-03-04 09:00']))).tolist() == [75, 24 * 60]
+
+def test_scores_only_scraped_rows():
+    prefs = Preferences(class_types=['yoga'], locations=['CUC'], time_windows=[(6, 9)], min_gap_minutes=60)
+    scored = score_candidates(COMBINED, prefs)
+    assert scored['scraped_event'].tolist() == ['Sunrise Yoga', 'Lunch HIIT', 'Evening Yoga', 'Late Spin']
+    sunrise = scored.iloc[0]
+    # Every component is satisfied: 3 + 2 + 2 + 1
+    assert sunrise['score'] == 8.0
+    assert recommend(COMBINED, prefs, k=2)['scraped_event'].tolist() == ['Sunrise Yoga', 'Evening Yoga']
+
+def test_top_k_matches_a_full_stable_sort():
+    rng = random.Random(3)
+    scored = pd.DataFrame({'score': [rng.choice([0.0, 1.0, 2.5, 4.0]) for _ in range(500)]})
+    expected = scored.sort_values('score', ascending=False, kind='stable').head(25)
+    assert top_k(scored, 25).index.tolist() == expected.index.tolist()
+    assert top_k(scored, 0).empty
+
+def test_recommend_handles_empty_input():
+    assert recommend(pd.DataFrame(columns=COMBINED.columns), Preferences()).empty
+    assert 'score' in recommend(None, Preferences()).columns
@@ -0,0 +1,81 @@
+import pytest
+
+import refresher
+import snapshots
+from deadlines import PartialResult
+
+GROUPX = [{'class_name': 'Spin', 'weekday': 'Mon', 'start_time_local': '7:00am', 'end_time_local': '7:45am',
+           'studio': 'Kenner', 'term_start_date': '2025-10-20', 'term_end_date': '2025-11-16'}]
+EVENTBRITE = [{'title': 'Sunrise Yoga', 'link': 'https://www.eventbrite.com/e/sunrise-yoga-tickets-1',
+               'date_time': '2030-03-04T07:00:00-05:00 → 2030-03-04T08:00:00-05:00', 'venue': 'Schenley Park'}]
+
+class StopScheduler(Exception):
+    pass
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Fake scrapers (set jobs[source] to a list, PartialResult or exception) and a recorded archive"""
+    results = {'groupx': GROUPX, 'eventbrite': EVENTBRITE}
+    archived = []
+
+    def job(source):
+        def run():
+            result = results[source]
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return run
+
+    monkeypatch.setattr(refresher, 'JOBS', {source: job(source) for source in results})
+    monkeypatch.setattr(refresher.schedule_warehouse, 'archive_scrape',
+                        lambda source, records: archived.append((source, len(records))))
+    results['archived'] = archived
+    return results
+
+def test_once_publishes_and_archives_every_source(tmp_path, jobs, monkeypatch):
+    monkeypatch.setattr(refresher.time, 'sleep', lambda seconds: pytest.fail("--once must not sleep"))
+    refresher.main(['--once', '--snapshot-dir', str(tmp_path)])
+    manifest = snapshots.read_manifest(str(tmp_path))
+    assert {source: entry['rows'] for source, entry in manifest.items()} == {'groupx': 1, 'eventbrite': 1}
+    assert jobs['archived'] == [('groupx', 1), ('eventbrite', 1)]
+
+def test_partial_results_are_published_as_partial(tmp_path, jobs):
+    jobs['eventbrite'] = PartialResult(EVENTBRITE, partial=True, reason='deadline')
+    entry = refresher.refresh('eventbrite', str(tmp_path))
+    assert entry['partial'] and entry['reason'] == 'deadline'
+
+def test_failed_or_empty_scrapes_keep_the_previous_snapshot(tmp_path, jobs):
+    root = str(tmp_path)
+    previous = refresher.refresh('groupx', root)
+    jobs['groupx'] = RuntimeError('chrome crashed')
+    assert refresher.refresh('groupx', root) is None
+    jobs['groupx'] = []
+    assert refresher.refresh('groupx', root) is None
+    assert snapshots.latest('groupx', root) == previous
+    assert jobs['archived'] == [('groupx', 1)]
+
+def test_scheduler_staggers_sources_and_skips_fresh_snapshots(tmp_path, jobs, monkeypatch):
+    root = str(tmp_path)
+    refresher.refresh('groupx', root)
+    clock = [snapshots.latest('groupx', root)['published_at']]
+    runs = []
+    monkeypatch.setattr(refresher.time, 'time', lambda: clock[0])
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    def refresh(source, root):
+        runs.append((source, clock[0]))
+        clock[0] += 60          # every scrape takes a minute
+        if len(runs) == 4:
+            raise StopScheduler
+
+    monkeypatch.setattr(refresher.time, 'sleep', sleep)
+    monkeypatch.setattr(refresher, 'refresh', refresh)
+    start = clock[0]
+    with pytest.raises(StopScheduler):
+        refresher.run_forever({'groupx': 900, 'eventbrite': 600}, stagger=300, root=root)
+    # GroupX was just published, so Eventbrite goes first and GroupX waits out its interval;
+    # after that, each run pushes the other source at least `stagger` past its end
+    assert [(source, round(at - start)) for source, at in runs] == [
+        ('eventbrite', 300), ('groupx', 900), ('eventbrite', 1260), ('groupx', 1860)]
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from schedule_warehouse import ScheduleWarehouse, archive_scrape
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def groupx(class_name, weekday, start, end, studio, term='Fall Mini 1 2025'):
+    return {'term_name': term, 'term_start_date': '2025-08-25', 'term_end_date': '2025-10-11',
+            'registration_url': 'https://cmu.dserec.com/online/cr', 'campus_area': 'CUC', 'weekday': weekday,
+            'class_name': class_name, 'time_range_text': f"{start} - {end}", 'start_time_local': start,
+            'end_time_local': end, 'studio': studio, 'class_description': ''}
+
+def eventbrite(title, start, end, venue):
+    return {'title': title, 'link': f"https://www.eventbrite.com/e/{title.lower().replace(' ', '-')}-tickets-1",
+            'date_time': f"{start} → {end}", 'venue': venue}
+
+CLASSES = [
+    groupx('Spin Express', 'Mon', '7:00am', '7:45am', 'Kenner Studio'),
+    groupx('Spin', 'Wed', '7:00am', '7:45am', 'Kenner Studio'),
+    groupx('Yoga', 'Mon', '8:00am', '8:45am', 'Keeler Studio'),
+]
+
+def test_archive_and_query_by_class_and_location():
+    with ScheduleWarehouse(':memory:') as warehouse:
+        warehouse.archive('groupx', CLASSES, scraped_at=1000)
+        spin = warehouse.occurrences_between('2025-09-01', '2025-09-08', class_name='spin')
+        assert [(row['class_name'], row['start_local']) for row in spin] == [('Spin Express', '07:00'),
+                                                                             ('Spin', '07:00')]
+        keeler = warehouse.occurrences_between('2025-08-25', '2025-10-12', location='Keeler')
+        # Seven Mondays in the term
+        assert len(keeler) == 7 and {row['class_name'] for row in keeler} == {'Yoga'}
+        assert warehouse.popular_times('spin', limit=1)[0]['weekday'] in ('Monday', 'Wednesday')
+        assert warehouse.busiest_studios(limit=1)[0]['location'] == 'Kenner Studio'
+        assert warehouse.offerings_by_term()[0]['term_name'] == 'Fall Mini 1 2025'
+
+def test_rescrapes_keep_history():
+    with ScheduleWarehouse(':memory:') as warehouse:
+        first = warehouse.archive('groupx', CLASSES, scraped_at=1000)
+        second = warehouse.archive('groupx', CLASSES[:1], scraped_at=2000)
+        # The dropped classes are still there, and each scrape can be replayed
+        assert len(warehouse.occurrences_between('2025-08-25', '2025-10-12')) == 21
+        assert len(warehouse.scrape_occurrences(first)) == 21
+        assert {row['class_name'] for row in warehouse.scrape_occurrences(second)} == {'Spin Express'}
+        assert [s['scrape_id'] for s in warehouse.scrapes('groupx')] == [second, first]
+
+def test_eventbrite_rows_skip_unparseable_dates():
+    records = [eventbrite('Sunrise Yoga', '2030-03-04T07:00:00-05:00', '2030-03-04T08:00:00-05:00', 'Schenley Park'),
+               eventbrite('Mystery', 'soon', '', 'Somewhere')]
+    with ScheduleWarehouse(':memory:') as warehouse:
+        warehouse.archive('eventbrite', records)
+        rows = warehouse.occurrences_between(pd.Timestamp('2030-03-04'), pd.Timestamp('2030-03-05'))
+        assert [(row['class_name'], row['start_local']) for row in rows] == [('Sunrise Yoga', '07:00')]
+
+def test_archive_scrape_never_raises(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    assert archive_scrape('groupx', CLASSES, path=path) == 1
+    assert archive_scrape('nowhere', CLASSES, path=path) is None
+
+def test_default_path_follows_the_environment(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    env = dict(os.environ, SCHEDULE_HISTORY_DB=path, SCHEDULE_SNAPSHOT_DIR=str(tmp_path / 'snapshots'))
+    code = 'import schedule_warehouse, snapshots; print(schedule_warehouse.WAREHOUSE_PATH); print(snapshots.SNAPSHOT_DIR)'
+    out = subprocess.run([sys.executable, '-c', code], cwd=REPO, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == [path, str(tmp_path / 'snapshots')]
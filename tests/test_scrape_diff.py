@@ -0,0 +1,58 @@
+import pandas as pd
+
+import combiner
+from scrape_diff import diff_records, record_fingerprint, record_identity
+
+def groupx(class_name, weekday, start, end, studio):
+    return {'term_name': 'Spring Mini 3 2030', 'term_start_date': '2030-01-14', 'term_end_date': '2030-03-01',
+            'registration_url': '', 'campus_area': 'CUC', 'weekday': weekday, 'class_name': class_name,
+            'start_time_local': start, 'end_time_local': end, 'studio': studio, 'class_description': ''}
+
+OLD = pd.DataFrame([
+    groupx('Spin', 'Mon', '7:00am', '7:45am', 'Kenner'),
+    groupx('Yoga', 'Tue', '8:00am', '8:45am', 'Keeler'),
+    groupx('Zumba', 'Wed', '6:00pm', '7:00pm', 'Keeler'),
+])
+NEW = pd.DataFrame([
+    groupx('Spin', 'Mon', '7:00am', '7:45am', 'Kenner'),
+    # Moved to another studio and time
+    groupx('Yoga', 'Tue', '9:00am', '9:45am', 'Kenner'),
+    groupx('Pilates', 'Thu', '12:00pm', '12:45pm', 'Keeler'),
+])
+
+def test_identity_and_fingerprint():
+    spin = OLD.iloc[0].to_dict()
+    assert record_identity(spin, 'groupx') == record_identity({**spin, 'studio': 'Keeler'}, 'groupx')
+    assert record_fingerprint(spin, 'groupx') != record_fingerprint({**spin, 'studio': 'Keeler'}, 'groupx')
+    # Cosmetic whitespace/case changes are not changes
+    assert record_fingerprint(spin, 'groupx') == record_fingerprint({**spin, 'class_name': ' SPIN '}, 'groupx')
+    link = 'https://www.eventbrite.com/e/yoga-tickets-1234567'
+    assert record_identity({'link': link + '?aff=x'}, 'eventbrite') == record_identity({'link': link}, 'eventbrite')
+
+def test_diff_classifies_changes():
+    diff = diff_records(OLD, NEW, 'groupx')
+    assert diff.counts() == {'added': 1, 'removed': 1, 'modified': 1, 'unchanged': 1}
+    assert [r['class_name'] for r in diff.added] == ['Pilates']
+    assert [r['class_name'] for r in diff.removed] == ['Zumba']
+    old, new, fields = diff.modified[0]
+    assert fields == ['start_time_local', 'end_time_local', 'studio']
+    frame = diff.to_frame()
+    assert frame['change'].tolist() == ['added', 'modified', 'removed']
+    assert frame['previous'].iloc[1].startswith('start_time_local: 8:00am')
+
+def test_first_scrape_and_no_change():
+    assert diff_records(None, NEW, 'groupx').counts()['added'] == 3
+    same = diff_records(NEW, NEW.copy(), 'groupx')
+    assert same.empty and same.to_frame().columns.tolist() == ['change', 'changed_fields', 'previous']
+
+def test_apply_diff_matches_a_fresh_combine():
+    window_end = pd.Timestamp('2030-03-02', tz='UTC')
+    schedule = combiner.IncrementalSchedule(window_end=window_end)
+    schedule.add_groupx_records(OLD.to_dict('records'))
+    added, removed = schedule.apply_diff(diff_records(OLD, NEW, 'groupx'))
+    # Seven weeks each of the moved Yoga and the new Pilates in, old Yoga and Zumba out
+    assert (added, removed) == (14, 14)
+
+    fresh = combiner.IncrementalSchedule(window_end=window_end)
+    fresh.add_groupx_records(NEW.to_dict('records'))
+    assert schedule.to_frame().values.tolist() == fresh.to_frame().values.tolist()
@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+import snapshots
+
+def eventbrite(n, title='Yoga'):
+    return {'title': f"{title} {n}", 'link': f"https://www.eventbrite.com/e/x-tickets-10000{n}",
+            'date_time': f"2030-03-0{n}T07:00:00-05:00", 'venue': 'Studio', 'address': 'Pittsburgh, PA'}
+
+def test_publish_and_load_latest(tmp_path):
+    root = str(tmp_path)
+    assert snapshots.latest('eventbrite', root) is None
+    first = snapshots.publish('eventbrite', pd.DataFrame([eventbrite(1), eventbrite(2)]), root=root)
+    second = snapshots.publish('eventbrite', pd.DataFrame([eventbrite(2), eventbrite(3)]),
+                               partial=True, reason='deadline', root=root)
+
+    df, entry = snapshots.load_latest('eventbrite', root)
+    assert entry == second and entry['version'] > first['version']
+    assert df['title'].tolist() == ['Yoga 2', 'Yoga 3']
+    assert entry['partial'] and entry['reason'] == 'deadline'
+    assert entry['base_version'] == first['version']
+    assert entry['changes']['added'] == 1 and entry['changes']['removed'] == 1
+    assert sorted(snapshots.load_diff(entry, root)['change']) == ['added', 'removed']
+
+def test_unknown_source_is_rejected(tmp_path):
+    try:
+        snapshots.publish('meetup', pd.DataFrame(), root=str(tmp_path))
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+def test_old_versions_are_pruned(tmp_path):
+    root = str(tmp_path)
+    for n in range(snapshots.KEEP_VERSIONS + 2):
+        entry = snapshots.publish('eventbrite', pd.DataFrame([eventbrite(1, title=str(n))]), root=root)
+    versions = [name for name in os.listdir(tmp_path / 'eventbrite') if name.endswith('Z.csv')]
+    assert len(versions) == snapshots.KEEP_VERSIONS
+    assert os.path.basename(entry['path']) in versions
+
+def test_concurrent_publishers_keep_each_others_entries(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    errors = []
+    read_manifest = snapshots.read_manifest
+
+    def slow_read_manifest(*args, **kwargs):
+        # Widen the read-modify-write window so a missing lock shows up
+        manifest = read_manifest(*args, **kwargs)
+        time.sleep(0.01)
+        return manifest
+
+    monkeypatch.setattr(snapshots, 'read_manifest', slow_read_manifest)
+
+    published = {}
+
+    def publish_many(source):
+        try:
+            for n in range(10):
+                published[source] = snapshots.publish(source, pd.DataFrame([eventbrite(1, title=str(n))]), root=root)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=publish_many, args=(source,)) for source in snapshots.SOURCES]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    manifest = snapshots.read_manifest(root)
+    assert manifest == published
+    assert all(snapshots.load(entry, root) is not None for entry in manifest.values())
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
@@ -0,0 +1,63 @@
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import table_view
+
+def paged_app():
+    import pandas as pd
+    import streamlit as st
+
+    import table_view
+
+    rows = st.session_state.get("rows", 120)
+    # Keep one frame object per size so the Arrow cache is reused across reruns
+    frames = st.session_state.setdefault("frames", {})
+    df = frames.setdefault(rows, pd.DataFrame({"n": range(rows), "name": [f"row {i}" for i in range(rows)]}))
+    table_view.paged_table(df, "t")
+
+def run_app():
+    at = AppTest.from_function(paged_app)
+    at.run()
+    return at
+
+def visible_rows(at):
+    return at.dataframe[0].value['n'].tolist()
+
+def test_pages_and_server_side_sort():
+    at = run_app()
+    assert visible_rows(at) == list(range(50))
+    at.number_input(key="t_page").set_value(3).run()
+    assert visible_rows(at) == list(range(100, 120))
+    at.selectbox(key="t_order").set_value("Descending").run()
+    at.selectbox(key="t_sort").set_value("n").run()
+    assert visible_rows(at) == list(range(19, -1, -1))
+    assert not at.exception
+
+def assert_valid_page(at, rows, size=50):
+    assert not at.exception
+    page = at.number_input(key="t_page").value
+    assert 1 <= page <= max((rows + size - 1) // size, 1)
+    assert visible_rows(at) == list(range((page - 1) * size, min(page * size, rows)))
+
+def test_remembered_page_past_the_end_is_clamped():
+    at = run_app()
+    at.session_state["t_page"] = 9
+    at.run()
+    assert_valid_page(at, 120)
+
+def test_page_stays_valid_when_the_data_shrinks():
+    at = run_app()
+    at.number_input(key="t_page").set_value(3).run()
+    at.session_state["rows"] = 60
+    at.run()
+    assert_valid_page(at, 60)
+
+def test_page_stays_valid_when_the_page_size_grows():
+    at = run_app()
+    at.number_input(key="t_page").set_value(3).run()
+    at.selectbox(key="t_size").set_value(100).run()
+    assert_valid_page(at, 120, size=100)
+
+def test_to_arrow_falls_back_to_text_for_mixed_columns():
+    table = table_view.to_arrow(pd.DataFrame({'address': [{'city': 'Pittsburgh'}, 'GHC']}))
+    assert table.column('address').to_pylist() == ["{'city': 'Pittsburgh'}", 'GHC']